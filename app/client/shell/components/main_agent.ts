@@ -545,6 +545,9 @@ export class DynamicModule extends LitElement {
         this.#addStatusWithDuration(failureMessage, "error");
       } else {
         if (!isFinal) {
+          for (const coalescedMessage of normalized?.coalescedUpdates || []) {
+            this.#addStatusWithDuration(coalescedMessage, event.kind);
+          }
           this.#addStatusWithDuration(serverMessage, event.kind);
         }
       }
@@ -129,7 +129,9 @@ export class ChatModule extends LitElement {
       console.log("server message", normalized?.textParts || []);
       const messageSources = isFinal ? (normalized?.sources || []) : [];
 
-      this.#resetStatusIfNewTurnFromStream(serverMessage, isFinal);
+      const coalescedMessages: string[] = normalized?.coalescedUpdates || [];
+
+      this.#resetStatusIfNewTurnFromStream(coalescedMessages[0] || serverMessage, isFinal);
 
       if (isFinal && normalized?.tokenCount) {
         this.tokenCount = normalized.tokenCount;
@@ -148,6 +150,9 @@ export class ChatModule extends LitElement {
 
       // Skip final echo; only incremental updates are useful in the log.
       if (!isFinal) {
+        for (const coalescedMessage of coalescedMessages) {
+          this.#addStatusWithDuration(coalescedMessage, event.kind);
+        }
         this.#addStatusWithDuration(serverMessage, event.kind);
       }
 
@@ -15,6 +15,7 @@ type RawStreamingEvent = {
     state?: string;
     message?: {
       parts?: StreamPart[];
+      metadata?: Record<string, unknown>;
     };
   };
   artifact?: {
@@ -27,6 +28,8 @@ export interface NormalizedStreamingEvent {
   isFinal: boolean;
   state: string | null;
   textParts: string[];
+  // Status texts the server merged into this event, oldest first (shown before statusText).
+  coalescedUpdates: string[];
   uiMessages: v0_8.Types.ServerToClientMessage[];
   statusText: string;
   responseText: string;
@@ -244,6 +247,16 @@ function extractPartsFromEvent(event: RawStreamingEvent): StreamPart[] {
   return [...statusParts, ...artifactParts];
 }
 
+function extractCoalescedUpdates(event: RawStreamingEvent): string[] {
+  const coalesced = event.status?.message?.metadata?.coalesced_updates;
+  if (!Array.isArray(coalesced)) {
+    return [];
+  }
+  return coalesced
+    .map((text: unknown) => String(text ?? "").trim())
+    .filter((text: string) => text.length > 0);
+}
+
 function pickMetadataFromFinalTextParts(textParts: string[]) {
   let tokenCount = "";
   let suggestionsRaw = "";
@@ -371,6 +384,7 @@ export function normalizeStreamingEvent(raw: unknown): NormalizedStreamingEvent
     isFinal,
     state,
     textParts,
+    coalescedUpdates: extractCoalescedUpdates(event),
     uiMessages,
     statusText,
     responseText,
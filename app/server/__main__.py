@@ -6,7 +6,7 @@ from pathlib import Path
 import click
 from a2a.server.apps import A2AStarletteApplication
 from a2a.server.request_handlers import DefaultRequestHandler
-from a2a.server.tasks import InMemoryTaskStore, BasePushNotificationSender, InMemoryPushNotificationConfigStore
+from a2a.server.tasks import BasePushNotificationSender, InMemoryPushNotificationConfigStore
 from a2a.types import AgentCard
 from starlette.applications import Starlette
 from starlette.middleware.cors import CORSMiddleware
@@ -26,17 +26,19 @@ from core.dynamic_app.a2a_config_provider import (
     get_widget_catalog,
     get_widget_schema
 )
-from traditional_app.data_provider import (
-    get_traditional_outage_messages,
-    get_traditional_energy_messages,
-    get_traditional_energy_trends_messages,
-    get_traditional_timeline_messages,
-    get_traditional_industry_messages
-)
+from traditional_app.paging import OUTAGE_ROWS, TIMELINE_ROWS, TRADITIONAL_PAGING
+from traditional_app.response_cache import TRADITIONAL_RESPONSES
 from database.semantic_cache import (
     GraphSemanticCache,
     get_nl2graph_semantic_cache_summary,
 )
+from database.speculative_cache import get_speculation_summary
+from core.admission import AdmissionController, AdmissionMiddleware
+from core.llm_rate_limit import get_llm_rate_limit_summary
+from core.trace_sampling import get_tracing_summary
+from core.langfuse_tracing import register_langfuse_client, shutdown_langfuse_clients
+from core.task_store import build_task_store, push_config_evictor
+from core.dynamic_app.widget_cache import get_widget_output_cache
 from database.connections import RAGDBConnection
 
 from dotenv import load_dotenv
@@ -60,12 +62,14 @@ def normalize_public_base_url(value: str | None) -> str | None:
 @click.option("--port", default=int(os.getenv("SERVER_BIND_PORT", "10002")))
 def main(host, port):
     try:
-        langfuse_client = Langfuse(
-            public_key=os.getenv("LANGFUSE_PUBLIC_KEY"),
-            secret_key=os.getenv("LANGFUSE_SECRET_KEY"),
-            host=os.getenv("LANGFUSE_HOST"),
-            timeout=60,
-            tracer_provider=TracerProvider(),
+        langfuse_client = register_langfuse_client(
+            Langfuse(
+                public_key=os.getenv("LANGFUSE_PUBLIC_KEY"),
+                secret_key=os.getenv("LANGFUSE_SECRET_KEY"),
+                host=os.getenv("LANGFUSE_HOST"),
+                timeout=60,
+                tracer_provider=TracerProvider(),
+            )
         )
 
         internal_base_url = f"http://{host}:{port}"
@@ -97,9 +101,10 @@ def main(host, port):
             config_store=agent_push_config_store
         )
         
+        agent_task_store = build_task_store("agent", on_evict=push_config_evictor(agent_push_config_store))
         agent_request_handler = DefaultRequestHandler(
             agent_executor=agent_executor,
-            task_store=InMemoryTaskStore(),
+            task_store=agent_task_store,
             push_config_store=agent_push_config_store,
             push_sender=agent_push_sender
         )
@@ -131,9 +136,10 @@ def main(host, port):
         llm_push_config_store = InMemoryPushNotificationConfigStore()
         llm_push_sender = BasePushNotificationSender(httpx_client=httpx_client,
                         config_store=llm_push_config_store)
+        llm_task_store = build_task_store("llm", on_evict=push_config_evictor(llm_push_config_store))
         llm_request_handler = DefaultRequestHandler(
             agent_executor=llm_executor,
-            task_store=InMemoryTaskStore(),
+            task_store=llm_task_store,
             push_config_store=llm_push_config_store,
             push_sender=llm_push_sender
         )
@@ -145,6 +151,7 @@ def main(host, port):
 
         # region Main app setup
         main_app = Starlette()
+        admission = AdmissionController()
 
         main_app.add_middleware(
             CORSMiddleware,
@@ -152,6 +159,7 @@ def main(host, port):
             allow_credentials=True,
             allow_methods=["*"],
             allow_headers=["*"],
+            expose_headers=["ETag", "X-Next-Cursor", "X-Total-Count"],
         )
 
         # region Agent semantic cache endpoints
@@ -160,7 +168,15 @@ def main(host, port):
                 limit_raw = request.query_params.get("limit", "25")
                 limit = max(1, min(int(limit_raw), 100))
                 summary = get_nl2graph_semantic_cache_summary(limit=limit)
-                return JSONResponse({"status": "success", "cache": summary})
+                widget_cache = get_widget_output_cache()
+                return JSONResponse(
+                    {
+                        "status": "success",
+                        "cache": summary,
+                        "speculation": get_speculation_summary(),
+                        "widget_outputs": widget_cache.snapshot() if widget_cache else None,
+                    }
+                )
             except Exception as e:
                 logger.error(f"Error getting agent semantic cache info: {e}")
                 return JSONResponse({"status": "error", "message": "Failed to retrieve semantic cache info"}, status_code=500)
@@ -181,64 +197,107 @@ def main(host, port):
                 return JSONResponse({"status": "error", "message": "Failed to clear semantic cache"}, status_code=500)
         # endregion
 
+        # region Task cancellation stats endpoint
+        async def get_task_cancellation_stats(request: Request):
+            return JSONResponse(
+                {
+                    "status": "success",
+                    "agent": agent_executor.running_tasks.snapshot(),
+                    "llm": llm_executor.running_tasks.snapshot(),
+                }
+            )
+        # endregion
+
+        # region Task store stats endpoint
+        async def get_task_store_stats(request: Request):
+            return JSONResponse(
+                {
+                    "status": "success",
+                    "agent": await agent_task_store.snapshot(),
+                    "llm": await llm_task_store.snapshot(),
+                }
+            )
+        # endregion
+
+        # region Admission and tracing stats endpoints
+        async def get_admission_stats(request: Request):
+            return JSONResponse(
+                {
+                    "status": "success",
+                    "admission": admission.snapshot(),
+                    "llm_rate_limits": get_llm_rate_limit_summary(),
+                }
+            )
+
+        async def get_tracing_stats(request: Request):
+            return JSONResponse({"status": "success", "tracing": get_tracing_summary()})
+        # endregion
+
         # region Traditional endpoints
         async def get_traditional_outage(request: Request):
             try:
-                messages = await get_traditional_outage_messages()
-                return JSONResponse(messages)
+                if TRADITIONAL_PAGING.wants_paging(request):
+                    return await TRADITIONAL_PAGING.respond(request, OUTAGE_ROWS)
+                return await TRADITIONAL_RESPONSES.respond(request, "outage")
             except Exception as e:
                 logger.error(f"Error getting traditional outage data: {e}")
                 return JSONResponse({"error": "Failed to retrieve outage data"}, status_code=500)
 
         async def get_traditional_energy(request: Request):
             try:
-                messages = await get_traditional_energy_messages()
-                return JSONResponse(messages)
+                return await TRADITIONAL_RESPONSES.respond(request, "energy")
             except Exception as e:
                 logger.error(f"Error getting traditional energy data: {e}")
                 return JSONResponse({"error": "Failed to retrieve energy data"}, status_code=500)
 
         async def get_traditional_industry(request: Request):
             try:
-                messages = await get_traditional_industry_messages()
-                return JSONResponse(messages)
+                return await TRADITIONAL_RESPONSES.respond(request, "industry")
             except Exception as e:
                 logger.error(f"Error getting traditional industry data: {e}")
                 return JSONResponse({"error": "Failed to retrieve industry data"}, status_code=500)
 
         async def get_traditional_energy_trends(request: Request):
             try:
-                messages = await get_traditional_energy_trends_messages()
-                return JSONResponse(messages)
+                return await TRADITIONAL_RESPONSES.respond(request, "trends")
             except Exception as e:
                 logger.error(f"Error getting traditional energy trends data: {e}")
                 return JSONResponse({"error": "Failed to retrieve energy trends data"}, status_code=500)
 
         async def get_traditional_timeline(request: Request):
             try:
-                messages = await get_traditional_timeline_messages()
-                return JSONResponse(messages)
+                if TRADITIONAL_PAGING.wants_paging(request):
+                    return await TRADITIONAL_PAGING.respond(request, TIMELINE_ROWS)
+                return await TRADITIONAL_RESPONSES.respond(request, "timeline")
             except Exception as e:
                 logger.error(f"Error getting traditional timeline data: {e}")
                 return JSONResponse({"error": "Failed to retrieve timeline data"}, status_code=500)
+
+        async def get_traditional_cache_stats(request: Request):
+            return JSONResponse({"status": "success", "cache": TRADITIONAL_RESPONSES.snapshot()})
         # endregion
 
         # region Route registration and app mount
         main_app.add_route("/agent/cache/semantic", get_agent_semantic_cache, methods=["GET"])
         main_app.add_route("/agent/cache/semantic", clear_agent_semantic_cache, methods=["DELETE"])
+        main_app.add_route("/agent/tasks/cancellation", get_task_cancellation_stats, methods=["GET"])
+        main_app.add_route("/agent/tasks/store", get_task_store_stats, methods=["GET"])
+        main_app.add_route("/agent/admission", get_admission_stats, methods=["GET"])
+        main_app.add_route("/agent/tracing", get_tracing_stats, methods=["GET"])
         main_app.add_route("/traditional", get_traditional_outage, methods=["GET"])
         main_app.add_route("/traditional/energy", get_traditional_energy, methods=["GET"])
         main_app.add_route("/traditional/trends", get_traditional_energy_trends, methods=["GET"])
         main_app.add_route("/traditional/timeline", get_traditional_timeline, methods=["GET"])
         main_app.add_route("/traditional/industry", get_traditional_industry, methods=["GET"])
+        main_app.add_route("/traditional/cache", get_traditional_cache_stats, methods=["GET"])
 
         # Serve RAG source documents so clients can open source links.
         rag_docs_dir = Path(__file__).resolve().parent / "core" / "rag_docs"
         if rag_docs_dir.exists():
             main_app.mount("/rag_docs", StaticFiles(directory=str(rag_docs_dir)), name="rag_docs")
 
-        main_app.mount("/agent", agent_app)
-        main_app.mount("/llm", llm_app)
+        main_app.mount("/agent", AdmissionMiddleware(agent_app, admission, "agent"))
+        main_app.mount("/llm", AdmissionMiddleware(llm_app, admission, "llm"))
         # endregion
         # endregion
 
@@ -250,7 +309,11 @@ def main(host, port):
             logger.warning(f"Database warm-up skipped due to error: {warmup_exc}")
 
         import uvicorn
-        uvicorn.run(main_app, host=host, port=port)
+        try:
+            uvicorn.run(main_app, host=host, port=port)
+        finally:
+            # Send buffered traces before the process exits.
+            shutdown_langfuse_clients()
     except Exception as e:
         logger.error(f"An error occurred during server startup: {e}")
         exit(1)
@@ -1,5 +1,6 @@
 import logging
 import json
+from contextlib import aclosing
 from typing import Any
 
 from langfuse import Langfuse
@@ -12,14 +13,15 @@ from a2a.types import (
     Task,
     TaskState,
     TextPart,
-    UnsupportedOperationError,
 )
 from a2a.utils import (
     new_agent_parts_message,
     new_task,
 )
-from a2a.utils.errors import ServerError
-from a2ui.a2a import create_a2ui_part
+from core import json_codec
+from core.a2ui_parts import A2UIPartDeduper
+from core.status_batching import StatusUpdateBatcher
+from core.task_cancellation import RunningTaskRegistry
 from chat_app.main_llm import OCIOutageEnergyLLM
 
 logger = logging.getLogger(__name__)
@@ -37,11 +39,12 @@ def _extract_a2ui_messages_from_content(content: str) -> list[dict[str, Any]]:
     if cleaned.endswith("```"):
         cleaned = cleaned[:-3].strip()
 
-    if not cleaned:
+    # Streamed content is re-read on every update; skip parsing until the block can be complete.
+    if not cleaned or cleaned[-1] not in "]}":
         return []
 
     try:
-        parsed = json.loads(cleaned)
+        parsed = json_codec.loads(cleaned)
     except json.JSONDecodeError:
         logger.debug("Skipping non-JSON A2UI fragment in LLM update.")
         return []
@@ -54,14 +57,9 @@ def _extract_a2ui_messages_from_content(content: str) -> list[dict[str, Any]]:
 
 
 def _append_unique_a2ui_parts(
-    target_parts: list[Part], content: str, seen_hashes: set[str]
+    target_parts: list[Part], content: str, deduper: A2UIPartDeduper
 ) -> None:
-    for message in _extract_a2ui_messages_from_content(content):
-        serialized = json.dumps(message, sort_keys=True, ensure_ascii=False)
-        if serialized in seen_hashes:
-            continue
-        seen_hashes.add(serialized)
-        target_parts.append(create_a2ui_part(message))
+    deduper.extend_parts(target_parts, _extract_a2ui_messages_from_content(content))
 
 
 #region Executor
@@ -72,6 +70,7 @@ class OutageEnergyLLMExecutor(AgentExecutor):
     def __init__(self, langfuse_client: Langfuse):
         self.oci_ui_agent = OCIOutageEnergyLLM(langfuse_client)
         self.oci_text_agent = OCIOutageEnergyLLM(langfuse_client)
+        self.running_tasks = RunningTaskRegistry("outage_energy_llm")
     #endregion
 
     #region Main Execution
@@ -81,7 +80,7 @@ class OutageEnergyLLMExecutor(AgentExecutor):
         event_queue: EventQueue,
     ) -> None:
         query = ""
-        emitted_a2ui_hashes: set[str] = set()
+        a2ui_deduper = A2UIPartDeduper()
 
         logger.info(
             f"--- Client requested extensions: {context.requested_extensions} ---"
@@ -134,65 +133,93 @@ class OutageEnergyLLMExecutor(AgentExecutor):
         memory_id = session_id if session_id else task.context_id
         logger.info(f"--- AGENT_EXECUTOR: Using memory ID: {memory_id} ---")
 
-        async for item in agent.oci_stream(query, memory_id):
-            is_task_complete = item["is_task_complete"]
-            if not is_task_complete:
-                update_parts = [Part(root=TextPart(text=item["updates"]))]
-                _append_unique_a2ui_parts(update_parts, item.get("content", ""), emitted_a2ui_hashes)
-                await updater.update_status(
-                    TaskState.working,
-                    new_agent_parts_message(update_parts, task.context_id, task.id),
-                )
-                continue
+        completed = await self.running_tasks.run(
+            task.id,
+            self._stream_response(agent, query, memory_id, task, updater, a2ui_deduper),
+        )
+        if not completed:
+            logger.info(f"--- AGENT_EXECUTOR: Task {task.id} cancelled ---")
+
+    async def _stream_response(
+        self,
+        agent: OCIOutageEnergyLLM,
+        query: str,
+        memory_id: str,
+        task: Task,
+        updater: TaskUpdater,
+        a2ui_deduper: A2UIPartDeduper,
+    ) -> None:
+        batcher = StatusUpdateBatcher(updater, task.context_id, task.id)
+        try:
+            async with aclosing(agent.oci_stream(query, memory_id)) as response_stream:
+                async for item in response_stream:
+                    is_task_complete = item["is_task_complete"]
+                    if not is_task_complete:
+                        ui_parts: list[Part] = []
+                        _append_unique_a2ui_parts(ui_parts, item.get("content", ""), a2ui_deduper)
+                        await batcher.add([Part(root=TextPart(text=item["updates"]))], ui_parts)
+                        continue
             
-            content = item["content"]
-            final_parts = []
-            if "---a2ui_JSON---" in content:
-                text_content, _ = content.split("---a2ui_JSON---", 1)
-                if text_content.strip():
-                    final_parts.append(Part(root=TextPart(text=text_content.strip())))
-            else:
-                final_parts.append(Part(root=TextPart(text=content.strip())))
-
-            _append_unique_a2ui_parts(final_parts, content, emitted_a2ui_hashes)
-
-            final_state = item['final_state']
-            final_parts.append(Part(root=TextPart(text=final_state.strip())))
-
-            final_token_count = item['token_count']
-            final_parts.append(Part(root=TextPart(text=final_token_count.strip())))
-
-            suggestions = item['suggestions']
-            final_parts.append(Part(root=TextPart(text=suggestions.strip())))
-
-            sources = item.get('sources', '[]')
-            final_parts.append(Part(root=TextPart(text=sources.strip())))
-
-            # Keep a stable payload order for clients:
-            # answer, model state, token count, suggestions, sources.
-            logger.info("--- FINAL PARTS TO BE SENT ---")
-            for i, part in enumerate(final_parts):
-                logger.info(f"  - Part {i}: Type = {type(part.root)}")
-                if isinstance(part.root, TextPart):
-                    logger.info(f"    - Text: {part.root.text[:200]}...")
-                elif isinstance(part.root, DataPart):
-                    logger.info(f"    - Data: {str(part.root.data)[:200]}...")
-            logger.info("-----------------------------")
-
-            final_state = TaskState.completed
-
-            await updater.update_status(
-                final_state,
-                new_agent_parts_message(final_parts, task.context_id, task.id),
-                final=True,
+                    await batcher.flush()
+                    content = item["content"]
+                    final_parts = []
+                    if "---a2ui_JSON---" in content:
+                        text_content, _ = content.split("---a2ui_JSON---", 1)
+                        if text_content.strip():
+                            final_parts.append(Part(root=TextPart(text=text_content.strip())))
+                    else:
+                        final_parts.append(Part(root=TextPart(text=content.strip())))
+
+                    _append_unique_a2ui_parts(final_parts, content, a2ui_deduper)
+
+                    final_state = item['final_state']
+                    final_parts.append(Part(root=TextPart(text=final_state.strip())))
+
+                    final_token_count = item['token_count']
+                    final_parts.append(Part(root=TextPart(text=final_token_count.strip())))
+
+                    suggestions = item['suggestions']
+                    final_parts.append(Part(root=TextPart(text=suggestions.strip())))
+
+                    sources = item.get('sources', '[]')
+                    final_parts.append(Part(root=TextPart(text=sources.strip())))
+
+                    # Keep a stable payload order for clients:
+                    # answer, model state, token count, suggestions, sources.
+                    logger.info("--- FINAL PARTS TO BE SENT ---")
+                    for i, part in enumerate(final_parts):
+                        logger.info(f"  - Part {i}: Type = {type(part.root)}")
+                        if isinstance(part.root, TextPart):
+                            logger.info(f"    - Text: {part.root.text[:200]}...")
+                        elif isinstance(part.root, DataPart):
+                            logger.info(f"    - Data: {str(part.root.data)[:200]}...")
+                    logger.info("-----------------------------")
+
+                    final_state = TaskState.completed
+
+                    await updater.update_status(
+                        final_state,
+                        new_agent_parts_message(final_parts, task.context_id, task.id),
+                        final=True,
+                    )
+                    break
+        finally:
+            await batcher.aclose()
+            logger.info(
+                f"--- AGENT_EXECUTOR: Status updates sent: {batcher.items} items in {batcher.events} events ---"
             )
-            break
     #endregion
 
     #region Cancellation
     async def cancel(
         self, request: RequestContext, event_queue: EventQueue
     ) -> Task | None:
-        raise ServerError(error=UnsupportedOperationError())
+        """Stop the running agent stream for this task and mark it canceled."""
+        task_id = request.task_id or (request.current_task.id if request.current_task else "")
+        context_id = request.context_id or (request.current_task.context_id if request.current_task else "")
+        if not await self.running_tasks.cancel(task_id):
+            logger.info(f"--- AGENT_EXECUTOR: Cancel requested for task {task_id}, which is not running ---")
+        await TaskUpdater(event_queue, task_id, context_id).cancel()
+        return None
     #endregion
 #endregion
@@ -1,6 +1,5 @@
 import os
 import re
-import json
 import uuid
 from collections.abc import AsyncIterable
 from typing import Any
@@ -11,6 +10,7 @@ from langchain_core.runnables import RunnableConfig
 from langgraph.checkpoint.memory import InMemorySaver
 from langfuse import Langfuse, propagate_attributes
 
+from core import json_codec
 from core.chat_app.prompts import MAIN_LLM_INSTRUCTIONS
 from core.langfuse_tracing import (
     LangfuseTracingProvider,
@@ -106,7 +106,8 @@ class OCIOutageEnergyLLM:
         processed_messages = 0
         intermediate_updates: list[dict[str, Any]] = []
 
-        with self.langfuse_client.start_as_current_observation(
+        with self.langfuse_tracing_provider.request_observation(
+            self.langfuse_client,
             as_type="span",
             name="OutageEnergyLLM -> Agent Stream",
             input={"query": query},
@@ -232,7 +233,7 @@ class OCIOutageEnergyLLM:
             "final_state": f"{str(final_response_content)[:100]}\n{final_model_state}",
             "token_count": str(model_token_count),
             "suggestions": suggestions.model_dump_json(),
-            "sources": json.dumps(source_documents)
+            "sources": json_codec.dumps_text(source_documents)
         }
     #endregion
 #endregion
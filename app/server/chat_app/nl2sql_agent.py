@@ -1,5 +1,8 @@
+import asyncio
 import logging
+import time
 import uuid
+from typing import Any
 
 from langchain_core.messages import HumanMessage
 from langchain_core.runnables import RunnableConfig
@@ -7,11 +10,15 @@ from langchain.tools import tool
 from langfuse import propagate_attributes
 
 from database.connections import RAGDBConnection
+from database.query_guard import QueryGuard
+from database.query_results import QueryResultFormatter, QueryRowStream, build_tabular_result
 from database.semantic_cache import SQLSemanticCache
+from database.speculative_cache import NL2SQL_SPECULATION
 from core.langfuse_tracing import (
     LangfuseTracingProvider,
     extract_total_tokens_from_response,
 )
+from core.admission import stage_limit
 from core.base_agent import BaseAgent
 from core.chat_app.prompts.sql_agent import SQL_SCHEMA_DESCRIPTION, SQL_FEW_SHOT_EXAMPLES
 
@@ -31,7 +38,10 @@ class NL2SQLAgent(BaseAgent):
         )
         self.agent = self.build_agent()
         self.langfuse_tracing_provider = LangfuseTracingProvider()
+        self.query_guard = QueryGuard()
+        self.result_formatter = QueryResultFormatter()
         self.semantic_cache = SQLSemanticCache()
+        self.speculation = NL2SQL_SPECULATION
 
     @staticmethod
     def _strip_code_fences(query_text: str) -> str:
@@ -40,17 +50,43 @@ class NL2SQLAgent(BaseAgent):
         lines = query_text.split("\n")
         return "\n".join(lines[1:-1] if lines and lines[-1] == "```" else lines[1:])
 
-    @staticmethod
-    def _format_query_rows(cols, rows) -> str:
-        if not rows:
-            return "Query executed successfully but returned no results."
+    def _execute_and_format(
+        self, db_conn: RAGDBConnection, query: str
+    ) -> tuple[str, QueryRowStream, dict[str, Any]]:
+        """Guard the query, then stream its result into bounded prompt text plus a columnar result."""
+        result_rows: list[list[Any]] = []
+        with db_conn.get_connection() as conn, db_conn.call_timeout(conn):
+            guarded_query = self.query_guard.check(conn, query, db_conn.query_max_rows)
+            with db_conn.stream_query(conn, guarded_query) as row_stream:
+                formatted_output = self.result_formatter.format(
+                    "Query Results:", row_stream, rows_sink=result_rows
+                )
+        result = build_tabular_result(
+            "call_SQL_DB", query, row_stream.columns, result_rows, truncated=row_stream.truncated
+        )
+        return formatted_output, row_stream, result
+
+    async def _run_query(
+        self, db_conn: RAGDBConnection, query: str
+    ) -> tuple[str, QueryRowStream, dict[str, Any]]:
+        """``_execute_and_format`` in a worker thread under the shared DB concurrency limit."""
+        async with stage_limit("db"):
+            return await asyncio.to_thread(self._execute_and_format, db_conn, query)
 
-        result_lines = []
-        for row in rows:
-            row_data = ", ".join(f"{col}: {val}" for col, val in zip(cols, row))
-            result_lines.append(row_data)
+    async def _generate_sql(self, question: str, session_id: str, trace_context) -> dict:
+        """Run one LLM generation for the given question."""
+        messages = [HumanMessage(content=question)]
+        agent_input = {'messages': messages}
+        config:RunnableConfig = self.langfuse_tracing_provider.build_runnable_config(
+            run_id=uuid.uuid4().hex,
+            session_id=session_id,
+            thread_id=session_id,
+            tags=["nl2sql"],
+            trace_context=trace_context,
+        )
 
-        return "Query Results:\n" + "\n".join(result_lines)
+        with propagate_attributes(session_id=session_id, tags=["nl2sql"]):
+            return await self.agent.ainvoke(agent_input, config)
 
     async def call_nl2sql_agent(self, input: dict) -> dict:
         """Process the input question by generating SQL and executing it."""
@@ -71,166 +107,190 @@ class NL2SQLAgent(BaseAgent):
         last_error = None
         db_conn = RAGDBConnection()
         cache_status = "miss"
+        speculate = self.speculation.should_speculate()
+        speculative_task: asyncio.Task | None = None
 
-        with langfuse_client.start_as_current_observation(
-            as_type="span",
-            name="OutageEnergyLLM -> NL2SQL Agent",
-            input={"question": question},
-            metadata=self.langfuse_tracing_provider.build_observation_metadata(
-                session_id=session_id,
-                tags=["nl2sql"],
-                extra={
-                    "max_attempts": max_attempts,
-                    "cache_top_k": cache_top_k,
-                    "cache_max_distance": cache_max_distance,
-                },
-            ),
-        ) as root_observation:
-            try:
-                with langfuse_client.start_as_current_observation(
-                    as_type="span",
-                    name="NL2SQL Semantic Cache Lookup",
-                    input={"question": original_question},
-                    metadata=self.langfuse_tracing_provider.build_observation_metadata(
-                        session_id=session_id,
-                        tags=["nl2sql", "cache_lookup"],
-                        extra={"top_k": cache_top_k, "max_distance": cache_max_distance},
-                    ),
-                ) as cache_observation:
-                    cached_matches = self.semantic_cache.search_similar_questions(
-                        question=original_question,
-                        top_k=cache_top_k,
-                        max_distance=cache_max_distance,
+        try:
+            with self.langfuse_tracing_provider.observation(
+                langfuse_client,
+                as_type="span",
+                name="OutageEnergyLLM -> NL2SQL Agent",
+                input={"question": question},
+                metadata=self.langfuse_tracing_provider.build_observation_metadata(
+                    session_id=session_id,
+                    tags=["nl2sql"],
+                    extra={
+                        "max_attempts": max_attempts,
+                        "cache_top_k": cache_top_k,
+                        "cache_max_distance": cache_max_distance,
+                        "speculative": speculate,
+                    },
+                ),
+            ) as root_observation:
+                if speculate:
+                    # Start the first generation now; it is cancelled on a confident cache hit.
+                    speculative_task = asyncio.create_task(
+                        self._generate_sql(original_question, session_id, trace_context)
                     )
-                    cache_candidates = [
-                        {"id": row["id"], "distance": row["distance"]}
-                        for row in cached_matches
-                    ]
-
-                    if cached_matches:
-                        cache_status = "hit"
-                        best_match = cached_matches[0]
-                        cached_sql = best_match["sql_query"]
-                        with db_conn.get_connection() as conn:
-                            cols, rows = db_conn.execute_query(conn, cached_sql)
-
-                        formatted_output = self._format_query_rows(cols, rows)
-                        cache_observation.update(
-                            output={
-                                "cache_status": cache_status,
-                                "best_match_id": best_match["id"],
-                                "best_distance": best_match["distance"],
-                                "matched_candidates": cache_candidates,
-                                "rows_returned": len(rows),
-                            }
-                        )
-                        root_observation.update(
-                            output={
-                                "cache_status": cache_status,
-                                "cache_best_distance": best_match["distance"],
-                                "generated_sql": cached_sql,
-                                "rows_returned": len(rows),
-                            }
-                        )
-                        logger.info(
-                            "NL2SQL semantic cache HIT: id=%s distance=%.4f",
-                            best_match["id"],
-                            best_match["distance"],
-                        )
-                        return {"output": formatted_output}
-
-                    cache_observation.update(
-                        output={
-                            "cache_status": cache_status,
-                            "matched_candidates": [],
-                        }
-                    )
-                    logger.info("NL2SQL semantic cache MISS")
-            except Exception as cache_exc:
-                cache_status = "error"
-                logger.info("NL2SQL semantic cache lookup failed, falling back to LLM generation: %s", cache_exc)
-
-            for attempt in range(max_attempts):
+                lookup_ms = 0.0
                 try:
-                    with langfuse_client.start_as_current_observation(
-                        as_type="generation",
-                        name="NL2SQL Generate + Execute",
-                        input={"question": question, "attempt": attempt + 1, "cache_status": cache_status},
+                    with self.langfuse_tracing_provider.observation(
+                        langfuse_client,
+                        as_type="span",
+                        name="NL2SQL Semantic Cache Lookup",
+                        input={"question": original_question},
                         metadata=self.langfuse_tracing_provider.build_observation_metadata(
                             session_id=session_id,
-                            tags=["nl2sql", "generation"],
-                            extra={"max_attempts": max_attempts},
+                            tags=["nl2sql", "cache_lookup"],
+                            extra={"top_k": cache_top_k, "max_distance": cache_max_distance},
                         ),
-                    ) as observation:
-                        messages = [HumanMessage(content=question)]
-                        agent_input = {'messages': messages}
-                        config:RunnableConfig = self.langfuse_tracing_provider.build_runnable_config(
-                            run_id=uuid.uuid4().hex,
-                            session_id=session_id,
-                            thread_id=session_id,
-                            tags=["nl2sql"],
-                            trace_context=trace_context,
-                        )
-
-                        with propagate_attributes(session_id=session_id, tags=["nl2sql"]):
-                            response = await self.agent.ainvoke(agent_input, config)
-                        generated_sql = response['messages'][-1].content
-
-                        logger.info(f"GENERATED SQL (attempt {attempt + 1}): {generated_sql}")
-                        generated_sql = self._strip_code_fences(generated_sql)
-
-                        with db_conn.get_connection() as conn:
-                            cols, rows = db_conn.execute_query(conn, generated_sql)
-
-                        formatted_output = self._format_query_rows(cols, rows)
-                        rows_returned = len(rows)
-
-                        # Successful generation/execution gets cached for future semantic reuse.
-                        try:
-                            self.semantic_cache.upsert_successful_query(
+                    ) as cache_observation:
+                        lookup_started_at = time.perf_counter()
+                        async with stage_limit("embedding"):
+                            cached_matches = await asyncio.to_thread(
+                                self.semantic_cache.search_similar_questions,
                                 question=original_question,
-                                sql_query=generated_sql,
-                                answer_preview=formatted_output,
+                                top_k=cache_top_k,
+                                max_distance=cache_max_distance,
+                            )
+                        lookup_ms = (time.perf_counter() - lookup_started_at) * 1000.0
+                        self.speculation.record_lookup(bool(cached_matches), speculative_task is not None)
+                        cache_candidates = [
+                            {"id": row["id"], "distance": row["distance"]}
+                            for row in cached_matches
+                        ]
+
+                        if cached_matches:
+                            cache_status = "hit"
+                            best_match = cached_matches[0]
+                            if (
+                                speculative_task is not None
+                                and self.speculation.is_confident_hit(best_match["distance"])
+                            ):
+                                speculative_task.cancel()
+                                speculative_task = None
+                                self.speculation.record_outcome("loss")
+                            cached_sql = best_match["sql_query"]
+                            formatted_output, row_stream, result = await self._run_query(db_conn, cached_sql)
+                            if speculative_task is not None:
+                                speculative_task.cancel()
+                                speculative_task = None
+                                self.speculation.record_outcome("loss")
+                            cache_observation.update(
+                                output={
+                                    "cache_status": cache_status,
+                                    "best_match_id": best_match["id"],
+                                    "best_distance": best_match["distance"],
+                                    "matched_candidates": cache_candidates,
+                                    "rows_returned": row_stream.rows_read,
+                                }
                             )
-                        except Exception as cache_store_exc:
-                            logger.info("Could not store NL2SQL semantic cache entry: %s", cache_store_exc)
+                            root_observation.update(
+                                output={
+                                    "cache_status": cache_status,
+                                    "cache_best_distance": best_match["distance"],
+                                    "generated_sql": cached_sql,
+                                    "rows_returned": row_stream.rows_read,
+                                }
+                            )
+                            logger.info(
+                                "NL2SQL semantic cache HIT: id=%s distance=%.4f",
+                                best_match["id"],
+                                best_match["distance"],
+                            )
+                            return {"output": formatted_output, "result": result}
 
-                        observation.update(
+                        cache_observation.update(
                             output={
-                                "generated_sql": generated_sql,
-                                "rows_returned": rows_returned,
-                                "columns": cols if rows_returned > 0 else [],
-                                "token_count": extract_total_tokens_from_response(response),
                                 "cache_status": cache_status,
+                                "matched_candidates": [],
                             }
                         )
-                        root_observation.update(
-                            output={
-                                "generated_sql": generated_sql,
-                                "rows_returned": rows_returned,
-                                "cache_status": cache_status,
-                                "attempts_used": attempt + 1,
-                            }
+                        if speculative_task is not None:
+                            self.speculation.record_outcome("win", lookup_ms)
+                        logger.info("NL2SQL semantic cache MISS")
+                except Exception as cache_exc:
+                    if cache_status == "hit" and speculative_task is not None:
+                        self.speculation.record_outcome("rescue", lookup_ms)
+                    cache_status = "error"
+                    logger.info("NL2SQL semantic cache lookup failed, falling back to LLM generation: %s", cache_exc)
+
+                for attempt in range(max_attempts):
+                    try:
+                        with self.langfuse_tracing_provider.observation(
+                            langfuse_client,
+                            as_type="generation",
+                            name="NL2SQL Generate + Execute",
+                            input={"question": question, "attempt": attempt + 1, "cache_status": cache_status},
+                            metadata=self.langfuse_tracing_provider.build_observation_metadata(
+                                session_id=session_id,
+                                tags=["nl2sql", "generation"],
+                                extra={"max_attempts": max_attempts},
+                            ),
+                        ) as observation:
+                            if speculative_task is not None:
+                                pending_task, speculative_task = speculative_task, None
+                                response = await pending_task
+                            else:
+                                response = await self._generate_sql(question, session_id, trace_context)
+                            generated_sql = response['messages'][-1].content
+
+                            logger.info(f"GENERATED SQL (attempt {attempt + 1}): {generated_sql}")
+                            generated_sql = self._strip_code_fences(generated_sql)
+
+                            formatted_output, row_stream, result = await self._run_query(db_conn, generated_sql)
+                            rows_returned = row_stream.rows_read
+
+                            # Successful generation/execution gets cached for future semantic reuse.
+                            try:
+                                self.semantic_cache.upsert_successful_query(
+                                    question=original_question,
+                                    sql_query=generated_sql,
+                                    answer_preview=formatted_output,
+                                )
+                            except Exception as cache_store_exc:
+                                logger.info("Could not store NL2SQL semantic cache entry: %s", cache_store_exc)
+
+                            observation.update(
+                                output={
+                                    "generated_sql": generated_sql,
+                                    "rows_returned": rows_returned,
+                                    "columns": row_stream.columns if rows_returned > 0 else [],
+                                    "truncated": row_stream.truncated,
+                                    "token_count": extract_total_tokens_from_response(response),
+                                    "cache_status": cache_status,
+                                }
+                            )
+                            root_observation.update(
+                                output={
+                                    "generated_sql": generated_sql,
+                                    "rows_returned": rows_returned,
+                                    "cache_status": cache_status,
+                                    "attempts_used": attempt + 1,
+                                }
+                            )
+                            return {"output": formatted_output, "result": result}
+                    except Exception as e:
+                        last_error = e
+                        logger.exception(
+                            "NL2SQL attempt %s failed for session_id=%s",
+                            attempt + 1,
+                            session_id,
                         )
-                        return {"output": formatted_output}
-                except Exception as e:
-                    last_error = e
-                    logger.exception(
-                        "NL2SQL attempt %s failed for session_id=%s",
-                        attempt + 1,
-                        session_id,
-                    )
-                    if attempt < max_attempts - 1:
-                        question = f"Original question: {original_question}\n\nYour previous query:\n{generated_sql}\n\nhad a mistake that resulted in an error: {e}. Fix the mistakes and consider the examples provided to solve the user question."
-                        logger.warning(f"Retrying due to error: {e}")
-
-            root_observation.update(
-                output={
-                    "cache_status": cache_status,
-                    "error": str(last_error) if last_error else "unknown",
-                }
-            )
-            return {"output": f"Error executing NL2SQL after {max_attempts} attempts: {str(last_error)}"}
+                        if attempt < max_attempts - 1:
+                            question = f"Original question: {original_question}\n\nYour previous query:\n{generated_sql}\n\nhad a mistake that resulted in an error: {e}. Fix the mistakes and consider the examples provided to solve the user question."
+                            logger.warning(f"Retrying due to error: {e}")
+
+                root_observation.update(
+                    output={
+                        "cache_status": cache_status,
+                        "error": str(last_error) if last_error else "unknown",
+                    }
+                )
+                return {"output": f"Error executing NL2SQL after {max_attempts} attempts: {str(last_error)}"}
+        finally:
+            if speculative_task is not None:
+                speculative_task.cancel()
 
 #endregion
 
@@ -240,8 +300,8 @@ def create_nl2sql_agent():
     """Build an NL2SQL agent instance."""
     return NL2SQLAgent()
 
-@tool()
-async def call_SQL_DB(query: str) -> str:
+@tool(response_format="content_and_artifact")
+async def call_SQL_DB(query: str) -> tuple[str, dict[str, Any] | None]:
     """Query the SQL DB for outage, grid, voltage, and customer information."""
     NL2SQL_agent_tool = create_nl2sql_agent()
     tracing_provider = LangfuseTracingProvider()
@@ -249,7 +309,8 @@ async def call_SQL_DB(query: str) -> str:
 
     try:
         result = await NL2SQL_agent_tool.call_nl2sql_agent({"input": query, "session_id": session_id})
-        return result['output']
+        # The columnar result becomes ToolMessage.artifact and is published as state["tool_results"].
+        return result['output'], result.get('result')
     except Exception as e:
-        return f"There was an error with the SQL DB tool: {e}"
+        return f"There was an error with the SQL DB tool: {e}", None
 #endregion
@@ -1,6 +1,8 @@
 import array
+import asyncio
 from langchain.tools import tool
 
+from core.admission import stage_limit
 from core.gen_ai_provider import GenAIEmbedProvider
 from database.connections import RAGDBConnection
 
@@ -18,6 +20,23 @@ def build_context_snippet(results: list[dict]) -> str:
         snippet = r["text"].replace("\n", " ")
         context_parts.append(f"[{i}] (Source: {r['source']}) {snippet}")
     return "\n\n".join(context_parts)
+
+
+def _search_embeddings(db_conn: RAGDBConnection, query_vec: array.array, top_k: int) -> list[dict]:
+    """Nearest chunks to ``query_vec`` by cosine distance (blocking; run in a worker thread)."""
+    with db_conn.get_connection() as connection:
+        cursor = connection.cursor()
+
+        cursor.execute(f"""
+            SELECT text, vector_distance(vec, :1, COSINE) AS distance, source
+            FROM {db_conn.table_prefix}_embedding
+            ORDER BY distance
+            FETCH FIRST {top_k} ROWS ONLY
+        """, [query_vec])
+
+        rows = cursor.fetchall()
+        cursor.close()
+    return [{"text": r[0], "distance": r[1], "source": r[2]} for r in rows]
 #endregion
 
 
@@ -32,22 +51,12 @@ async def semantic_search(query: str, top_k: int = 3) -> str:
     db_conn = RAGDBConnection()
     
     try:
-        query_response = embed_provider.embed_client.embed_query(query)
+        async with stage_limit("embedding"):
+            query_response = await asyncio.to_thread(embed_provider.embed_client.embed_query, query)
         query_vec = array.array("f", query_response)
-        
-        with db_conn.get_connection() as connection:
-            cursor = connection.cursor()
-
-            cursor.execute(f"""
-                SELECT text, vector_distance(vec, :1, COSINE) AS distance, source
-                FROM {db_conn.table_prefix}_embedding
-                ORDER BY distance
-                FETCH FIRST {top_k} ROWS ONLY
-            """, [query_vec])
-            
-            rows = cursor.fetchall()
-            results = [{"text": r[0], "distance": r[1], "source": r[2]} for r in rows]
-            cursor.close()
+
+        async with stage_limit("db"):
+            results = await asyncio.to_thread(_search_embeddings, db_conn, query_vec, top_k)
         
         return build_context_snippet(results)
     except Exception as e:
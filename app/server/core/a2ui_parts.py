@@ -0,0 +1,57 @@
+"""Helpers to build deduplicated A2UI parts for A2A status updates."""
+
+# region Imports
+import hashlib
+from typing import Any
+
+from a2a.types import Part
+from a2ui.a2a import create_a2ui_part
+
+from core import json_codec
+# endregion Imports
+
+# region Constants
+A2UI_DIGEST_SIZE = 16
+# endregion Constants
+
+
+# region Helpers
+def canonical_a2ui_bytes(message: dict[str, Any]) -> bytes:
+    """Encode an A2UI message once in a stable, key-sorted form."""
+    return json_codec.dumps(message, sort_keys=True)
+
+
+def a2ui_digest(canonical: bytes) -> bytes:
+    return hashlib.blake2b(canonical, digest_size=A2UI_DIGEST_SIZE).digest()
+# endregion Helpers
+
+
+# region Deduper
+class A2UIPartDeduper:
+    """Track emitted A2UI messages by fixed-size digest for the life of one request.
+
+    The message dict is handed to the DataPart unchanged, so the canonical
+    encoding used for the digest is the only serialization done before the
+    A2A SDK writes the event.
+    """
+
+    def __init__(self):
+        self._seen_digests: set[bytes] = set()
+
+    def __len__(self) -> int:
+        return len(self._seen_digests)
+
+    def build_part(self, message: dict[str, Any]) -> Part | None:
+        """Return a new A2UI part, or None if the same message was already emitted."""
+        digest = a2ui_digest(canonical_a2ui_bytes(message))
+        if digest in self._seen_digests:
+            return None
+        self._seen_digests.add(digest)
+        return create_a2ui_part(message)
+
+    def extend_parts(self, target_parts: list[Part], messages: list[dict[str, Any]]) -> None:
+        for message in messages:
+            part = self.build_part(message)
+            if part is not None:
+                target_parts.append(part)
+# endregion Deduper
@@ -0,0 +1,344 @@
+"""Admission control for the A2A apps and concurrency limits for LLM, embedding and DB calls."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+# JSON-RPC methods that start agent work; everything else (tasks/get, tasks/cancel,
+# agent card) is never queued.
+ADMITTED_METHODS = ("message/send", "message/stream")
+
+
+#region Stage Limits
+class StageLimitTimeout(Exception):
+    """Raised when a call waits longer than its stage allows for a free slot."""
+
+
+# (stage name, owning task) pairs; child tasks inherit the context but not the slot.
+_held_stages: ContextVar[frozenset[tuple[str, Any]]] = ContextVar("held_stages", default=frozenset())
+
+
+class StageLimiter:
+    """Async concurrency limit for one kind of downstream call, with queue-depth stats.
+
+    Re-entrant per task: a nested acquire of the same stage (for example
+    ``_agenerate`` delegating to ``_astream``) does not take a second slot.
+    """
+
+    def __init__(self, name: str, limit: int, timeout_s: float):
+        self.name = name
+        self.limit = max(1, limit)
+        self.timeout_s = timeout_s
+        self._semaphore = asyncio.Semaphore(self.limit)
+        self.active = 0
+        self.waiting = 0
+        self._stats = {"acquired": 0, "timeouts": 0, "peak_waiting": 0, "wait_ms_total": 0.0}
+
+    @asynccontextmanager
+    async def __call__(self) -> AsyncIterator[None]:
+        held = _held_stages.get()
+        key = (self.name, asyncio.current_task())
+        if key in held:
+            yield
+            return
+        started_at = time.perf_counter()
+        self.waiting += 1
+        self._stats["peak_waiting"] = max(self._stats["peak_waiting"], self.waiting)
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.timeout_s)
+        except TimeoutError:
+            self._stats["timeouts"] += 1
+            raise StageLimitTimeout(
+                f"No free {self.name} slot after {self.timeout_s:.0f}s ({self.limit} in use)."
+            ) from None
+        finally:
+            self.waiting -= 1
+        self.active += 1
+        self._stats["acquired"] += 1
+        self._stats["wait_ms_total"] += (time.perf_counter() - started_at) * 1000.0
+        _held_stages.set(held | {key})
+        try:
+            yield
+        finally:
+            # set, not reset: an abandoned ``_astream`` may be closed from another context.
+            _held_stages.set(held)
+            self.active -= 1
+            self._semaphore.release()
+
+    def snapshot(self) -> dict[str, Any]:
+        acquired = self._stats["acquired"]
+        return {
+            "limit": self.limit,
+            "active": self.active,
+            "waiting": self.waiting,
+            "acquired": acquired,
+            "timeouts": self._stats["timeouts"],
+            "peak_waiting": self._stats["peak_waiting"],
+            "avg_wait_ms": round(self._stats["wait_ms_total"] / acquired, 1) if acquired else 0.0,
+        }
+
+
+_STAGE_TIMEOUT_S = float(os.getenv("STAGE_WAIT_TIMEOUT_SECONDS", "60"))
+STAGE_LIMITS: dict[str, StageLimiter] = {
+    "llm": StageLimiter("llm", int(os.getenv("STAGE_LLM_MAX_CONCURRENT", "16")), _STAGE_TIMEOUT_S),
+    "embedding": StageLimiter("embedding", int(os.getenv("STAGE_EMBEDDING_MAX_CONCURRENT", "4")), _STAGE_TIMEOUT_S),
+    "db": StageLimiter("db", int(os.getenv("STAGE_DB_MAX_CONCURRENT", "4")), _STAGE_TIMEOUT_S),
+}
+
+
+def stage_limit(name: str):
+    """``async with stage_limit("llm"):`` holds one slot of the named stage."""
+    return STAGE_LIMITS[name]()
+#endregion
+
+
+#region Admission
+class AdmissionRejected(Exception):
+    def __init__(self, reason: str, route: str, queue_depth: int, retry_after_s: int):
+        super().__init__(f"{route} request rejected: {reason}")
+        self.reason = reason
+        self.route = route
+        self.queue_depth = queue_depth
+        self.retry_after_s = retry_after_s
+
+
+class AdmissionController:
+    """Global and per-route limits on running agent tasks with one bounded wait queue.
+
+    A request takes a route slot, then a global slot. While both are busy it
+    waits in the queue for up to ``queue_timeout_s``; when the queue already
+    holds ``max_queue`` requests it is rejected immediately. A queued request
+    whose ``disconnected`` awaitable finishes first leaves the queue at once.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int | None = None,
+        max_queue: int | None = None,
+        queue_timeout_s: float | None = None,
+    ):
+        self.max_concurrent = max_concurrent or int(os.getenv("ADMISSION_MAX_CONCURRENT", "16"))
+        self.max_queue = max_queue if max_queue is not None else int(os.getenv("ADMISSION_MAX_QUEUE", "32"))
+        self.queue_timeout_s = (
+            queue_timeout_s if queue_timeout_s is not None
+            else float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", "30"))
+        )
+        self._global = asyncio.Semaphore(self.max_concurrent)
+        self._routes: dict[str, asyncio.Semaphore] = {}
+        self._route_limits: dict[str, int] = {}
+        self._active: dict[str, int] = {}
+        self.queued = 0
+        self._stats = {"admitted": 0, "queued_total": 0, "rejected_queue_full": 0, "rejected_timeout": 0, "abandoned": 0}
+
+    def add_route(self, route: str, limit: int | None = None) -> None:
+        route_limit = limit or int(os.getenv(f"ADMISSION_{route.upper()}_MAX_CONCURRENT", str(self.max_concurrent)))
+        self._route_limits[route] = route_limit
+        self._routes[route] = asyncio.Semaphore(route_limit)
+        self._active[route] = 0
+
+    def _retry_after_s(self) -> int:
+        return max(1, int(self.queue_timeout_s // 2))
+
+    async def _acquire(
+        self, semaphores: tuple[asyncio.Semaphore, ...], deadline: float, acquired: list[asyncio.Semaphore]
+    ) -> None:
+        for semaphore in semaphores:
+            remaining = max(0.0, deadline - time.perf_counter())
+            await asyncio.wait_for(semaphore.acquire(), timeout=remaining)
+            acquired.append(semaphore)
+
+    async def _acquire_unless_disconnected(
+        self, acquire: Awaitable[None], disconnected: Callable[[], Awaitable[Any]]
+    ) -> bool:
+        """Wait for ``acquire``; return False instead if ``disconnected`` finishes first."""
+        acquire_task = asyncio.ensure_future(acquire)
+        watch_task = asyncio.ensure_future(disconnected())
+        try:
+            await asyncio.wait((acquire_task, watch_task), return_when=asyncio.FIRST_COMPLETED)
+            if watch_task.done() and not watch_task.cancelled() and watch_task.exception() is None:
+                return False
+            await acquire_task
+            return True
+        finally:
+            for task in (acquire_task, watch_task):
+                task.cancel()
+            await asyncio.gather(acquire_task, watch_task, return_exceptions=True)
+
+    @asynccontextmanager
+    async def admit(
+        self, route: str, disconnected: Callable[[], Awaitable[Any]] | None = None
+    ) -> AsyncIterator[float]:
+        """Hold a route and global slot for the request; yields the queue wait in ms.
+
+        ``disconnected`` is awaited only while the request is queued; when it
+        finishes first the request is dropped with reason ``client_disconnected``.
+        """
+        route_semaphore = self._routes[route]
+        started_at = time.perf_counter()
+        must_wait = route_semaphore.locked() or self._global.locked()
+        if must_wait:
+            if self.queued >= self.max_queue:
+                self._stats["rejected_queue_full"] += 1
+                raise AdmissionRejected("queue_full", route, self.queued, self._retry_after_s())
+            self.queued += 1
+            self._stats["queued_total"] += 1
+        acquired: list[asyncio.Semaphore] = []
+        try:
+            acquire = self._acquire((route_semaphore, self._global), started_at + self.queue_timeout_s, acquired)
+            if not must_wait or disconnected is None:
+                await acquire
+            elif not await self._acquire_unless_disconnected(acquire, disconnected):
+                self._stats["abandoned"] += 1
+                raise AdmissionRejected("client_disconnected", route, self.queued, self._retry_after_s())
+        except BaseException as exc:
+            for semaphore in acquired:
+                semaphore.release()
+            if isinstance(exc, TimeoutError):
+                self._stats["rejected_timeout"] += 1
+                raise AdmissionRejected("queue_timeout", route, self.queued, self._retry_after_s()) from None
+            raise
+        finally:
+            if must_wait:
+                self.queued -= 1
+
+        self._active[route] += 1
+        self._stats["admitted"] += 1
+        try:
+            yield (time.perf_counter() - started_at) * 1000.0
+        finally:
+            self._active[route] -= 1
+            for semaphore in acquired:
+                semaphore.release()
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "active": sum(self._active.values()),
+            "queued": self.queued,
+            "max_queue": self.max_queue,
+            "queue_timeout_s": self.queue_timeout_s,
+            "routes": {
+                route: {"limit": self._route_limits[route], "active": self._active[route]}
+                for route in self._routes
+            },
+            "stages": {name: limiter.snapshot() for name, limiter in STAGE_LIMITS.items()},
+            **self._stats,
+        }
+
+
+class AdmissionMiddleware:
+    """ASGI wrapper that admits ``message/send``/``message/stream`` calls to a mounted A2A app.
+
+    Admitted responses carry ``X-Admission-Queue-Ms``; rejected calls get HTTP 429
+    with ``Retry-After`` and a JSON-RPC error whose ``data`` describes the queue.
+    A queued call whose client disconnects leaves the queue without a response.
+    """
+
+    def __init__(self, app: Any, controller: AdmissionController, route: str):
+        self.app = app
+        self.controller = controller
+        self.route = route
+        controller.add_route(route)
+
+    async def __call__(self, scope: dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or scope.get("method") != "POST":
+            await self.app(scope, receive, send)
+            return
+
+        body = b""
+        more_body = True
+        while more_body:
+            message = await receive()
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+        request_id = None
+        method = ""
+        try:
+            payload = json.loads(body or b"{}")
+            if isinstance(payload, dict):
+                request_id = payload.get("id")
+                method = str(payload.get("method") or "")
+        except ValueError:
+            pass
+
+        replayed = False
+
+        async def replay_receive() -> dict[str, Any]:
+            nonlocal replayed
+            if not replayed:
+                replayed = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        if method not in ADMITTED_METHODS:
+            await self.app(scope, replay_receive, send)
+            return
+
+        async def client_disconnected() -> None:
+            # The body is fully read, so the next message can only be the disconnect.
+            while (await receive())["type"] != "http.disconnect":
+                pass
+
+        try:
+            async with self.controller.admit(self.route, client_disconnected) as queue_ms:
+
+                async def send_with_queue_header(message: dict[str, Any]) -> None:
+                    if message["type"] == "http.response.start":
+                        headers = list(message.get("headers") or [])
+                        headers.append((b"x-admission-queue-ms", f"{queue_ms:.0f}".encode()))
+                        message = {**message, "headers": headers}
+                    await send(message)
+
+                await self.app(scope, replay_receive, send_with_queue_header)
+        except AdmissionRejected as rejection:
+            if rejection.reason == "client_disconnected":
+                logger.info("Admission abandoned | route=%s client disconnected while queued", rejection.route)
+                return
+            logger.warning(
+                "Admission rejected | route=%s reason=%s queued=%s",
+                rejection.route,
+                rejection.reason,
+                rejection.queue_depth,
+            )
+            await self._send_rejection(send, request_id, rejection)
+
+    async def _send_rejection(self, send: Any, request_id: Any, rejection: AdmissionRejected) -> None:
+        body = json.dumps(
+            {
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "error": {
+                    "code": -32000,
+                    "message": "Server is busy, retry later.",
+                    "data": {
+                        "status": "rejected",
+                        "reason": rejection.reason,
+                        "queue_depth": rejection.queue_depth,
+                        "retry_after_s": rejection.retry_after_s,
+                    },
+                },
+            }
+        ).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"retry-after", str(rejection.retry_after_s).encode()),
+                    (b"content-length", str(len(body)).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+#endregion
@@ -1,14 +1,26 @@
 """ File to store the common pydantic classes or struct configs """
 
 # region Imports
-from typing import Any
+from typing import Any, Literal, TypedDict
 from langgraph.graph import MessagesState
 # endregion Imports
 
 # region Types
+class StructuredToolResult(TypedDict, total=False):
+    """ Columnar tool output published next to the prose ToolMessage content """
+    tool: str
+    kind: Literal["table", "documents"]
+    query: str
+    columns: list[str]
+    rows: list[list[Any]]
+    row_count: int
+    truncated: bool
+
+
 class DynamicGraphState(MessagesState, total=False):
     """ Class that holds the dynamic graph state """
     suggestions: str
+    tool_results: list[StructuredToolResult]
     parallel_data_context: str
     parallel_widget_plan: dict[str, Any]
     parallel_execution_tasks: list[dict[str, Any]]
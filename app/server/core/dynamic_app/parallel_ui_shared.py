@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
-import json
+import copy
+import hashlib
 import logging
 import re
 from typing import Any, get_args, get_origin
 
+from core import json_codec
 from core.dynamic_app.schemas.structured_outputs import (
     BarGraphWidgetOutput,
     CardWidgetOutput,
@@ -179,7 +181,7 @@ def parse_json_loose(raw: Any) -> dict[str, Any] | None:
         if candidate.lower().startswith("json"):
             candidate = candidate[4:].strip()
     try:
-        loaded = json.loads(candidate)
+        loaded = json_codec.loads(candidate)
         if isinstance(loaded, dict):
             return loaded
     except Exception:
@@ -189,7 +191,7 @@ def parse_json_loose(raw: Any) -> dict[str, Any] | None:
     if not object_slice:
         return None
     try:
-        loaded = json.loads(object_slice)
+        loaded = json_codec.loads(object_slice)
         if isinstance(loaded, dict):
             return loaded
     except Exception:
@@ -197,77 +199,178 @@ def parse_json_loose(raw: Any) -> dict[str, Any] | None:
     return None
 
 
-def _coerce_for_annotation(value: Any, annotation: Any) -> Any:
-    origin = get_origin(annotation)
-    args = get_args(annotation)
-    if origin in (list, list[Any]):
-        if value is None:
-            return []
-        if isinstance(value, list):
-            return value
-        if isinstance(value, tuple):
-            return list(value)
-        return [value]
-    if origin in (dict, dict[Any, Any]):
-        return value if isinstance(value, dict) else {}
-    if origin is None and annotation in (list, dict):
-        if annotation is list:
-            return value if isinstance(value, list) else []
-        return value if isinstance(value, dict) else {}
-    if origin is None and annotation is str:
-        return "" if value is None else str(value)
-    if origin is None and annotation in (int, float):
+_NUMBER_PATTERN = re.compile(r"-?\d+(?:\.\d+)?")
+_MISSING = object()
+
+
+# region Compiled Coercion
+def _coerce_list(value: Any) -> Any:
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return value
+    if isinstance(value, tuple):
+        return list(value)
+    return [value]
+
+
+def _coerce_dict(value: Any) -> Any:
+    return value if isinstance(value, dict) else {}
+
+
+def _coerce_bare_list(value: Any) -> Any:
+    return value if isinstance(value, list) else []
+
+
+def _coerce_str(value: Any) -> Any:
+    return "" if value is None else str(value)
+
+
+def _coerce_bool(value: Any) -> Any:
+    return bool(value)
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _number_coercer(as_float: bool):
+    def coerce(value: Any) -> Any:
         if isinstance(value, (int, float)) and not isinstance(value, bool):
             return value
         if isinstance(value, str):
-            match = re.search(r"-?\d+(?:\.\d+)?", value)
+            match = _NUMBER_PATTERN.search(value)
             if match:
-                try:
-                    parsed = float(match.group(0))
-                    return parsed if annotation is float else int(parsed)
-                except Exception:
-                    return 0
+                parsed = float(match.group(0))
+                return parsed if as_float else int(parsed)
         return 0
-    if origin is None and annotation is bool:
-        return bool(value)
-    if origin is None and annotation is Any:
-        return value
-    if origin is None and hasattr(annotation, "model_fields"):
+
+    return coerce
+
+
+def _model_coercer(model_cls: Any):
+    def coerce(value: Any) -> Any:
         if isinstance(value, dict):
-            return coerce_payload_generic(annotation, value)
+            return coerce_payload_generic(model_cls, value)
         return {}
-    if origin is not None and type(None) in args:
-        inner_types = [arg for arg in args if arg is not type(None)]
+
+    return coerce
+
+
+def _optional_coercer(inner_coercers: tuple[Any, ...]):
+    def coerce(value: Any) -> Any:
         if value is None:
             return None
-        for inner in inner_types:
-            coerced = _coerce_for_annotation(value, inner)
+        for inner in inner_coercers:
+            coerced = inner(value)
             if coerced is not None:
                 return coerced
         return value
-    return value
 
+    return coerce
 
-def coerce_payload_generic(model_cls: Any, payload: dict[str, Any]) -> dict[str, Any]:
-    if not isinstance(payload, dict):
-        payload = {}
-    normalized: dict[str, Any] = {}
-    for field_name, field_info in model_cls.model_fields.items():
-        if field_name in payload:
-            normalized[field_name] = _coerce_for_annotation(
-                payload.get(field_name), field_info.annotation
+
+def compile_coercer(annotation: Any):
+    """Resolve an annotation once into a single-argument coercion function.
+
+    Mirrors the reflective reference in ``tests/widget_coercion_payloads.py``
+    branch for branch, so typing introspection happens at compile time
+    instead of once per payload value.
+    """
+    origin = get_origin(annotation)
+    args = get_args(annotation)
+    if origin in (list, list[Any]):
+        return _coerce_list
+    if origin in (dict, dict[Any, Any]):
+        return _coerce_dict
+    if origin is None:
+        if annotation is list:
+            return _coerce_bare_list
+        if annotation is dict:
+            return _coerce_dict
+        if annotation is str:
+            return _coerce_str
+        if annotation in (int, float):
+            return _number_coercer(annotation is float)
+        if annotation is bool:
+            return _coerce_bool
+        if annotation is Any:
+            return _identity
+        if hasattr(annotation, "model_fields"):
+            return _model_coercer(annotation)
+        return _identity
+    if type(None) in args:
+        return _optional_coercer(
+            tuple(compile_coercer(arg) for arg in args if arg is not type(None))
+        )
+    return _identity
+
+
+class CompiledWidgetModel:
+    """Per-model artifacts that used to be rebuilt on every widget repair.
+
+    Holds the JSON schema, its top-level keys and digest, the default seed
+    payload and a flat ``(field, coercer, default_factory, default)`` plan that
+    ``coerce_payload_generic`` walks without touching ``model_fields``.
+    """
+
+    __slots__ = ("model_cls", "json_schema", "schema_keys", "schema_digest", "field_plan", "_seed_payload")
+
+    def __init__(self, model_cls: Any):
+        self.model_cls = model_cls
+        self.json_schema = model_cls.model_json_schema() if hasattr(model_cls, "model_json_schema") else {}
+        self.schema_keys: tuple[str, ...] = tuple((self.json_schema or {}).get("properties", {}).keys())
+        self.schema_digest = hashlib.blake2b(
+            json_codec.dumps(self.json_schema, sort_keys=True), digest_size=16
+        ).hexdigest()
+        self.field_plan = tuple(
+            (
+                field_name,
+                compile_coercer(field_info.annotation),
+                field_info.default_factory,
+                field_info.default,
             )
-            continue
-        if field_info.default_factory is not None:
-            try:
-                normalized[field_name] = field_info.default_factory()
-            except Exception:
-                normalized[field_name] = None
-            continue
-        if field_info.default is not None:
-            normalized[field_name] = field_info.default
-            continue
-    return normalized
+            for field_name, field_info in model_cls.model_fields.items()
+        )
+        self._seed_payload = default_from_json_schema(self.json_schema)
+
+    def seed_payload(self) -> Any:
+        """Fresh copy of the schema-derived default payload."""
+        return copy.deepcopy(self._seed_payload)
+
+    def coerce(self, payload: dict[str, Any]) -> dict[str, Any]:
+        if not isinstance(payload, dict):
+            payload = {}
+        normalized: dict[str, Any] = {}
+        for field_name, coercer, default_factory, default in self.field_plan:
+            value = payload.get(field_name, _MISSING)
+            if value is not _MISSING:
+                normalized[field_name] = coercer(value)
+                continue
+            if default_factory is not None:
+                try:
+                    normalized[field_name] = default_factory()
+                except Exception:
+                    normalized[field_name] = None
+                continue
+            if default is not None:
+                normalized[field_name] = default
+        return normalized
+
+
+_COMPILED_MODELS: dict[Any, CompiledWidgetModel] = {}
+
+
+def get_compiled_model(model_cls: Any) -> CompiledWidgetModel:
+    compiled = _COMPILED_MODELS.get(model_cls)
+    if compiled is None:
+        compiled = _COMPILED_MODELS[model_cls] = CompiledWidgetModel(model_cls)
+    return compiled
+
+
+def coerce_payload_generic(model_cls: Any, payload: dict[str, Any]) -> dict[str, Any]:
+    return get_compiled_model(model_cls).coerce(payload)
+# endregion Compiled Coercion
 
 
 def default_from_json_schema(schema: Any) -> Any:
@@ -332,7 +435,7 @@ def to_a2ui_value_entry(key: str, value: Any) -> dict[str, Any]:
 
 
 def get_widget_model_registry() -> dict[str, Any]:
-    return {
+    registry = {
         "BarGraph": BarGraphWidgetOutput,
         "TimelineComponent": TimelineWidgetOutput,
         "KpiCard": KpiWidgetOutput,
@@ -342,6 +445,10 @@ def get_widget_model_registry() -> dict[str, Any]:
         "Text": TextWidgetOutput,
         "Card": CardWidgetOutput,
     }
+    # Compile schemas and coercion plans up front so widget repair never pays for them.
+    for model_cls in registry.values():
+        get_compiled_model(model_cls)
+    return registry
 
 
 def build_widget_execution_tasks(plan: ParallelWidgetPlan) -> list[dict[str, Any]]:
@@ -2,6 +2,7 @@
 
 from .backend_orchestrator import BACKEND_ORCHESTRATOR_INSTRUCTIONS
 from .ui_structured_parallel import (
+    UI_PARALLEL_EARLY_SHELL_INSTRUCTIONS,
     UI_PARALLEL_ORCHESTRATOR_INSTRUCTIONS,
     UI_PARALLEL_SHELL_INSTRUCTIONS,
     UI_PARALLEL_WIDGET_INSTRUCTIONS,
@@ -10,6 +11,7 @@ from .ui_structured_parallel import (
 
 __all__ = [
     'BACKEND_ORCHESTRATOR_INSTRUCTIONS',
+    'UI_PARALLEL_EARLY_SHELL_INSTRUCTIONS',
     'UI_PARALLEL_ORCHESTRATOR_INSTRUCTIONS',
     'UI_PARALLEL_SHELL_INSTRUCTIONS',
     'UI_PARALLEL_WIDGET_INSTRUCTIONS',
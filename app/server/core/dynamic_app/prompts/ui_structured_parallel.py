@@ -69,6 +69,23 @@ OUTPUT CONTRACT:
 - Use UI-safe wording (short titles, no unsafe content, no policy commentary).
 """
 
+UI_PARALLEL_EARLY_SHELL_INSTRUCTIONS = """
+You are the Early Shell Agent for a streaming A2UI pipeline.
+You run while backend data retrieval is still in progress, so you only see the user query.
+
+Task:
+- Produce a short surface title that frames the user query.
+- Produce a one-sentence intro_text telling the user the data is being gathered.
+- Suggest 1-3 section_titles for the sections the dashboard will most likely contain.
+- Never invent metrics, numbers, names, or findings; no data is available yet.
+- Keep language clean, professional, and UI-safe.
+
+OUTPUT CONTRACT:
+- Return a valid A2UIShellOutput object only.
+- Keep surface_id and root_id at their defaults.
+- No markdown fences, no free text, no extra keys outside schema intent.
+"""
+
 UI_PARALLEL_WIDGET_INSTRUCTIONS = """
 You are the Widget Specialist Agent in a parallel structured UI pipeline.
 You generate one widget payload at a time and MUST return only the schema requested for that widget.
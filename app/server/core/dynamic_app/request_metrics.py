@@ -0,0 +1,55 @@
+"""Per-request timing and counter metrics for the dynamic graph stream."""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class DynamicRequestMetrics:
+    """Collect stage timings (ms since request start) and counters for one request."""
+
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        self._started_at = time.perf_counter()
+        self.stage_timings_ms: dict[str, float] = {}
+        self.counters: dict[str, int | float] = {}
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self._started_at) * 1000.0
+
+    def mark(self, stage: str) -> float:
+        """Record the first time a stage is reached; later marks keep the first value."""
+        if stage not in self.stage_timings_ms:
+            self.stage_timings_ms[stage] = round(self.elapsed_ms(), 1)
+        return self.stage_timings_ms[stage]
+
+    def record_duration(self, stage: str, started_at: float) -> float:
+        """Record a duration measured from a ``time.perf_counter()`` start value."""
+        duration_ms = round((time.perf_counter() - started_at) * 1000.0, 1)
+        self.stage_timings_ms[stage] = duration_ms
+        return duration_ms
+
+    def increment(self, name: str, value: int | float = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "request_id": self.request_id,
+            "total_ms": round(self.elapsed_ms(), 1),
+            "stage_timings_ms": dict(self.stage_timings_ms),
+            "counters": dict(self.counters),
+        }
+
+    def log_summary(self) -> None:
+        summary = self.as_dict()
+        logger.info(
+            "Dynamic request metrics | request_id=%s total_ms=%s stages=%s counters=%s",
+            summary["request_id"],
+            summary["total_ms"],
+            summary["stage_timings_ms"],
+            summary["counters"],
+        )
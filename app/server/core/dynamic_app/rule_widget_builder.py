@@ -0,0 +1,208 @@
+"""Deterministic widget builders for structured (tabular) query results."""
+
+from __future__ import annotations
+
+import logging
+import re
+from typing import Any
+
+from core.dynamic_app.schemas.structured_outputs import (
+    BarGraphWidgetOutput,
+    KpiWidgetOutput,
+    LineGraphWidgetOutput,
+    TableWidgetOutput,
+)
+
+logger = logging.getLogger(__name__)
+
+MAX_TABLE_ROWS = 50
+MAX_BAR_POINTS = 15
+MAX_LINE_SERIES = 3
+MAX_KPI_ITEMS = 4
+SERIES_COLORS = ("#00D4FF", "#FF8A00", "#7CFC00")
+
+_TEMPORAL_VALUE = re.compile(r"^\d{4}(-\d{2}){0,2}( \d{2}:\d{2}(:\d{2})?)?$")
+_TEMPORAL_COLUMN_WORDS = ("date", "time", "day", "week", "month", "year", "quarter", "period", "hour")
+
+
+# region Column Helpers
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _numeric_columns(table: dict[str, Any]) -> list[int]:
+    indexes = []
+    for column_index in range(len(table["columns"])):
+        values = [row[column_index] for row in table["rows"] if row[column_index] is not None]
+        if values and all(_is_number(value) for value in values):
+            indexes.append(column_index)
+    return indexes
+
+
+def _label_column(table: dict[str, Any], numeric: list[int]) -> int | None:
+    for column_index in range(len(table["columns"])):
+        if column_index not in numeric:
+            return column_index
+    return None
+
+
+def _temporal_column(table: dict[str, Any]) -> int | None:
+    for column_index, column in enumerate(table["columns"]):
+        values = [row[column_index] for row in table["rows"] if row[column_index] is not None]
+        if not values:
+            continue
+        if all(isinstance(value, str) and _TEMPORAL_VALUE.match(value) for value in values):
+            return column_index
+        if set(column.lower().split("_")) & set(_TEMPORAL_COLUMN_WORDS):
+            return column_index
+    return None
+
+
+def _humanize(column: str) -> str:
+    return column.replace("_", " ").strip().title() or column
+
+
+def _row_details(table: dict[str, Any], row: list[Any]) -> dict[str, Any]:
+    return {column: value for column, value in zip(table["columns"], row) if value is not None}
+
+
+def _relevance(table: dict[str, Any], slot_label: str) -> int:
+    words = {word for word in re.split(r"[^a-z0-9]+", slot_label.lower()) if len(word) > 2}
+    columns = " ".join(table["columns"]).lower()
+    return sum(1 for word in words if word in columns)
+# endregion Column Helpers
+
+
+# region Builders
+def _build_table(table: dict[str, Any], title: str) -> TableWidgetOutput | None:
+    numeric = set(_numeric_columns(table))
+    columns = [
+        {"header": _humanize(column), "field": column, "type": "number" if index in numeric else "string"}
+        for index, column in enumerate(table["columns"])
+    ]
+    rows = [
+        {
+            "id": str(row_index + 1),
+            "values": dict(zip(table["columns"], row)),
+            "details": _row_details(table, row),
+        }
+        for row_index, row in enumerate(table["rows"][:MAX_TABLE_ROWS])
+    ]
+    return TableWidgetOutput.model_validate({"title": title, "columns": columns, "rows": rows})
+
+
+def _build_bar_graph(table: dict[str, Any], title: str) -> BarGraphWidgetOutput | None:
+    numeric = _numeric_columns(table)
+    label_index = _label_column(table, numeric)
+    if label_index is None or not numeric:
+        return None
+    value_index = numeric[0]
+    points = [
+        {
+            "label": str(row[label_index]),
+            "value": row[value_index],
+            "details": _row_details(table, row),
+        }
+        for row in table["rows"][:MAX_BAR_POINTS]
+        if row[label_index] is not None and row[value_index] is not None
+    ]
+    if not points:
+        return None
+    orientation = "horizontal" if len(points) > 8 else "vertical"
+    return BarGraphWidgetOutput.model_validate({"title": title, "orientation": orientation, "data": points})
+
+
+def _build_line_graph(table: dict[str, Any], title: str) -> LineGraphWidgetOutput | None:
+    time_index = _temporal_column(table)
+    numeric = [index for index in _numeric_columns(table) if index != time_index]
+    if time_index is None or not numeric or len(table["rows"]) < 2:
+        return None
+    rows = sorted(
+        (row for row in table["rows"] if row[time_index] is not None),
+        key=lambda row: (0, row[time_index], "") if _is_number(row[time_index]) else (1, 0, str(row[time_index])),
+    )
+    series = [
+        {
+            "name": _humanize(table["columns"][value_index]),
+            "color": SERIES_COLORS[position % len(SERIES_COLORS)],
+            "values": [float(row[value_index] or 0) for row in rows],
+        }
+        for position, value_index in enumerate(numeric[:MAX_LINE_SERIES])
+    ]
+    return LineGraphWidgetOutput.model_validate(
+        {
+            "title": title,
+            "labels": [str(row[time_index]) for row in rows],
+            "series": series,
+            "details": [_row_details(table, row) for row in rows],
+        }
+    )
+
+
+def _build_kpi(table: dict[str, Any], title: str) -> KpiWidgetOutput | None:
+    numeric = _numeric_columns(table)
+    if not numeric:
+        return None
+    rows = table["rows"]
+    items: list[dict[str, Any]] = []
+    if len(rows) == 1:
+        for value_index in numeric[:MAX_KPI_ITEMS]:
+            value = rows[0][value_index]
+            if value is None:
+                continue
+            column = table["columns"][value_index]
+            items.append({"key": column.lower(), "label": _humanize(column), "value": value})
+    else:
+        label_index = _label_column(table, numeric)
+        if label_index is None or len(rows) > MAX_KPI_ITEMS:
+            return None
+        value_index = numeric[0]
+        for row_index, row in enumerate(rows):
+            if row[value_index] is None:
+                continue
+            items.append(
+                {
+                    "key": f"kpi-{row_index + 1}",
+                    "label": str(row[label_index]),
+                    "value": row[value_index],
+                    "details": _row_details(table, row),
+                }
+            )
+    if not items:
+        return None
+    return KpiWidgetOutput.model_validate({"title": title, "data": items})
+
+
+_BUILDERS = {
+    "Table": _build_table,
+    "BarGraph": _build_bar_graph,
+    "LineGraph": _build_line_graph,
+    "KpiCard": _build_kpi,
+}
+
+
+def supports_rule_based_widget(widget_name: str) -> bool:
+    return widget_name in _BUILDERS
+
+
+def build_rule_based_widget(
+    widget_name: str,
+    tables: list[dict[str, Any]],
+    slot_label: str = "",
+) -> Any | None:
+    """Map structured rows straight to a widget output; None means use the LLM path."""
+    builder = _BUILDERS.get(widget_name)
+    if builder is None or not tables:
+        return None
+    title = slot_label or widget_name
+    ranked = sorted(tables, key=lambda table: _relevance(table, slot_label), reverse=True)
+    for table in ranked:
+        try:
+            widget_output = builder(table, title)
+        except Exception as exc:
+            logger.debug("Rule-based %s build failed for %s: %s", widget_name, table.get("tool"), exc)
+            continue
+        if widget_output is not None:
+            return widget_output
+    return None
+# endregion Builders
@@ -0,0 +1,45 @@
+"""Decide when a dynamic graph stream has everything the client needs."""
+
+from __future__ import annotations
+
+from typing import Any
+
+# off: wait for the graph to end; drain: complete early and let the graph finish
+# in the background; cancel: complete early and stop the remaining graph steps.
+EARLY_COMPLETION_MODES = ("off", "drain", "cancel")
+
+
+class StreamCompletionTracker:
+    """Track planned widget slots, skeleton and suggestions for one request.
+
+    The request is complete once the skeleton is out, every planned widget
+    slot has been emitted to the client and suggestions are available; the
+    remaining graph steps (aggregator/END) add nothing the client sees.
+    """
+
+    def __init__(self):
+        self.planned_slots: set[int] | None = None
+        self.emitted_slots: set[int] = set()
+        self.skeleton_emitted = False
+        self.suggestions_ready = False
+
+    def plan(self, tasks: list[dict[str, Any]]) -> None:
+        self.planned_slots = {int(task.get("index", 0)) for task in tasks if isinstance(task, dict)}
+
+    def mark_slot_emitted(self, slot_index: int) -> None:
+        self.emitted_slots.add(slot_index)
+
+    def mark_skeleton_emitted(self) -> None:
+        self.skeleton_emitted = True
+
+    def mark_suggestions_ready(self) -> None:
+        self.suggestions_ready = True
+
+    @property
+    def is_complete(self) -> bool:
+        return (
+            self.planned_slots is not None
+            and self.skeleton_emitted
+            and self.suggestions_ready
+            and self.planned_slots <= self.emitted_slots
+        )
@@ -0,0 +1,141 @@
+"""Track streamed A2UI surface state and build full or delta update messages."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from core import json_codec
+
+logger = logging.getLogger(__name__)
+
+
+def _encoded_size(value: Any) -> int:
+    return len(json_codec.dumps(value))
+
+
+class SurfaceUpdateTracker:
+    """Keep the component/data state of one surface and emit updates for new fragments.
+
+    In delta mode only new or changed components are sent in ``surfaceUpdate``
+    (the client upserts components by id) and each new or changed data key is
+    sent as its own ``dataModelUpdate`` at ``/<key>``, because an update at
+    ``/`` replaces the whole data model on the client.
+    """
+
+    def __init__(self, surface_id: str = "dashboard", delta_mode: bool = True):
+        self.surface_id = surface_id
+        self.delta_mode = delta_mode
+        # Dict keys act as an ordered set of component ids.
+        self._components: dict[str, dict[str, Any]] = {}
+        self._component_sizes: dict[str, int] = {}
+        self._data_state: dict[str, dict[str, Any]] = {}
+        self._data_sizes: dict[str, int] = {}
+        self.bytes_full = 0
+        self.bytes_sent = 0
+
+    @property
+    def ordered_component_ids(self) -> list[str]:
+        return list(self._components)
+
+    @property
+    def bytes_saved(self) -> int:
+        return max(0, self.bytes_full - self.bytes_sent)
+
+    def load_skeleton(self, surface_id: str, components: list[dict[str, Any]]) -> None:
+        """Reset tracked components to the skeleton that was just emitted."""
+        self.surface_id = surface_id or self.surface_id
+        self._components = {}
+        self._component_sizes = {}
+        for component in components:
+            if isinstance(component, dict) and component.get("id"):
+                self._store_component(str(component["id"]), component)
+
+    def _store_component(self, component_id: str, component: dict[str, Any]) -> None:
+        self._components[component_id] = component
+        self._component_sizes[component_id] = _encoded_size(component)
+
+    def apply_widget_fragment(self, widget_fragment: dict[str, Any]) -> list[dict[str, Any]]:
+        """Merge a widget fragment and return the A2UI messages to stream for it."""
+        changed_component_ids: list[str] = []
+        for component in list(widget_fragment.get("components") or []):
+            if not isinstance(component, dict):
+                continue
+            component_id = str(component.get("id") or "")
+            if not component_id:
+                continue
+            if self._components.get(component_id) == component:
+                continue
+            self._store_component(component_id, component)
+            changed_component_ids.append(component_id)
+
+        changed_data_keys: list[str] = []
+        for data_entry in list(widget_fragment.get("data_contents") or []):
+            if not (isinstance(data_entry, dict) and data_entry.get("key")):
+                continue
+            data_key = str(data_entry["key"])
+            if self._data_state.get(data_key) == data_entry:
+                continue
+            self._data_state[data_key] = data_entry
+            self._data_sizes[data_key] = _encoded_size(data_entry)
+            changed_data_keys.append(data_key)
+
+        full_bytes = sum(self._component_sizes.values())
+        if changed_data_keys:
+            full_bytes += sum(self._data_sizes.values())
+        self.bytes_full += full_bytes
+
+        if not self.delta_mode:
+            ui_messages = self._build_full_messages(include_data=bool(changed_data_keys))
+            self.bytes_sent += full_bytes
+            return ui_messages
+
+        ui_messages: list[dict[str, Any]] = []
+        if changed_component_ids:
+            ui_messages.append(
+                {
+                    "surfaceUpdate": {
+                        "surfaceId": self.surface_id,
+                        "components": [
+                            self._components[component_id]
+                            for component_id in changed_component_ids
+                        ],
+                    }
+                }
+            )
+            self.bytes_sent += sum(
+                self._component_sizes[component_id] for component_id in changed_component_ids
+            )
+        for data_key in changed_data_keys:
+            ui_messages.append(
+                {
+                    "dataModelUpdate": {
+                        "surfaceId": self.surface_id,
+                        "path": f"/{data_key}",
+                        "contents": [{**self._data_state[data_key], "key": "."}],
+                    }
+                }
+            )
+            self.bytes_sent += self._data_sizes[data_key]
+        return ui_messages
+
+    def _build_full_messages(self, include_data: bool) -> list[dict[str, Any]]:
+        ui_messages: list[dict[str, Any]] = [
+            {
+                "surfaceUpdate": {
+                    "surfaceId": self.surface_id,
+                    "components": list(self._components.values()),
+                }
+            }
+        ]
+        if include_data:
+            ui_messages.append(
+                {
+                    "dataModelUpdate": {
+                        "surfaceId": self.surface_id,
+                        "path": "/",
+                        "contents": list(self._data_state.values()),
+                    }
+                }
+            )
+        return ui_messages
@@ -0,0 +1,101 @@
+"""Collect structured backend tool results for the current dynamic graph turn."""
+
+from __future__ import annotations
+
+import re
+from typing import Any
+
+from langchain_core.messages import HumanMessage, ToolMessage
+
+from core.dynamic_app.dynamic_struct import StructuredToolResult
+
+_TABLE_HEADER = re.compile(r"^(?P<source>.*?Query Results) \((?P<count>\d+) rows, tab-separated\):$")
+_INT_PATTERN = re.compile(r"^-?\d+$")
+_FLOAT_PATTERN = re.compile(r"^-?\d+\.\d+$")
+
+
+# region Turn Messages
+def current_turn_messages(messages: list[Any]) -> list[Any]:
+    """Return the messages produced since the latest user message, oldest first."""
+    turn_messages: list[Any] = []
+    for message in reversed(messages or []):
+        if isinstance(message, HumanMessage):
+            break
+        turn_messages.append(message)
+    turn_messages.reverse()
+    return turn_messages
+
+
+def collect_turn_tool_results(messages: list[Any]) -> list[StructuredToolResult]:
+    """Gather ``content_and_artifact`` tool artifacts (tables, documents) from the current turn."""
+    results: list[StructuredToolResult] = []
+    for message in current_turn_messages(messages):
+        artifact = getattr(message, "artifact", None) if isinstance(message, ToolMessage) else None
+        if isinstance(artifact, dict) and artifact.get("columns"):
+            results.append(artifact)
+    return results
+# endregion Turn Messages
+
+
+# region Text Fallback
+def _parse_cell(text: str) -> Any:
+    if text == "":
+        return None
+    if _INT_PATTERN.match(text):
+        return int(text)
+    if _FLOAT_PATTERN.match(text):
+        return float(text)
+    return text
+
+
+def parse_compact_tables(text: str, tool: str = "") -> list[StructuredToolResult]:
+    """Parse the tab-separated blocks written by ``QueryResultFormatter`` back into columns/rows."""
+    tables: list[StructuredToolResult] = []
+    lines = (text or "").splitlines()
+    index = 0
+    while index < len(lines):
+        match = _TABLE_HEADER.match(lines[index].strip())
+        if not match or index + 1 >= len(lines):
+            index += 1
+            continue
+        columns = lines[index + 1].split("\t")
+        rows: list[list[Any]] = []
+        index += 2
+        while index < len(lines):
+            line = lines[index]
+            if not line or line.startswith("Column stats:") or line.startswith("[Results truncated"):
+                break
+            cells = line.split("\t")
+            if len(cells) != len(columns):
+                break
+            rows.append([_parse_cell(cell) for cell in cells])
+            index += 1
+        if rows:
+            tables.append(
+                {
+                    "tool": tool or match.group("source"),
+                    "kind": "table",
+                    "columns": columns,
+                    "rows": rows,
+                    "row_count": len(rows),
+                }
+            )
+    return tables
+
+
+def extract_turn_tables(messages: list[Any]) -> list[StructuredToolResult]:
+    """Rebuild tables from current-turn ToolMessage text when no artifacts were published."""
+    tables: list[StructuredToolResult] = []
+    for message in current_turn_messages(messages):
+        if isinstance(message, ToolMessage) and isinstance(message.content, str):
+            tables.extend(parse_compact_tables(message.content, tool=str(message.name or "")))
+    return tables
+# endregion Text Fallback
+
+
+def get_turn_tables(state: dict[str, Any]) -> list[StructuredToolResult]:
+    """Tables for this turn: published ``tool_results`` first, parsed tool text otherwise."""
+    tables = [result for result in state.get("tool_results") or [] if result.get("kind") == "table"]
+    if tables:
+        return tables
+    return extract_turn_tables(state.get("messages") or [])
@@ -0,0 +1,179 @@
+"""LRU/TTL cache of validated widget outputs with an optional on-disk tier."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+WIDGET_CACHE_DIGEST_SIZE = 16
+
+
+def widget_digest(*parts: str) -> str:
+    """Stable blake2b hex digest over the given text parts."""
+    hasher = hashlib.blake2b(digest_size=WIDGET_CACHE_DIGEST_SIZE)
+    for part in parts:
+        hasher.update((part or "").encode("utf-8"))
+        # Separator keeps ("ab", "c") and ("a", "bc") distinct.
+        hasher.update(b"\x00")
+    return hasher.hexdigest()
+
+
+def build_widget_cache_key(
+    widget_name: str,
+    slot_label: str,
+    data_context: str,
+    prompt_version: str,
+    planner_summary: str = "",
+) -> str:
+    return widget_digest(
+        widget_name,
+        slot_label,
+        widget_digest(data_context, planner_summary),
+        prompt_version,
+    )
+
+
+class WidgetOutputCache:
+    """Keep validated Pydantic widget outputs keyed by widget/slot/data/prompt digest.
+
+    Memory hits return a deep copy of the stored model, so callers may mutate
+    it freely and no re-validation is needed. Disk entries are JSON and are
+    validated once when promoted back into memory.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl_seconds: float = 900.0,
+        disk_dir: str | None = None,
+    ):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        if self.disk_dir is not None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _is_fresh(self, stored_at: float) -> bool:
+        return self.ttl_seconds <= 0 or (time.time() - stored_at) < self.ttl_seconds
+
+    def get(self, key: str, model_cls: Any) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, widget_output = entry
+                if self._is_fresh(stored_at) and isinstance(widget_output, model_cls):
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return widget_output.model_copy(deep=True)
+                del self._entries[key]
+
+        widget_output = self._load_from_disk(key, model_cls)
+        with self._lock:
+            if widget_output is None:
+                self._stats["misses"] += 1
+                return None
+            self._stats["disk_hits"] += 1
+        return widget_output.model_copy(deep=True)
+
+    def put(self, key: str, widget_output: Any) -> None:
+        stored_at = time.time()
+        with self._lock:
+            self._store_memory(key, stored_at, widget_output.model_copy(deep=True))
+            self._stats["stores"] += 1
+        self._write_to_disk(key, stored_at, widget_output)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        if self.disk_dir is not None:
+            for path in self.disk_dir.glob("*.json"):
+                path.unlink(missing_ok=True)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "disk_tier": str(self.disk_dir) if self.disk_dir else None,
+                **self._stats,
+            }
+
+    def _store_memory(self, key: str, stored_at: float, widget_output: Any) -> None:
+        self._entries[key] = (stored_at, widget_output)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _disk_path(self, key: str) -> Path | None:
+        return self.disk_dir / f"{key}.json" if self.disk_dir is not None else None
+
+    def _load_from_disk(self, key: str, model_cls: Any) -> Any | None:
+        path = self._disk_path(key)
+        if path is None or not path.exists():
+            return None
+        try:
+            record = json.loads(path.read_text(encoding="utf-8"))
+            stored_at = float(record["stored_at"])
+            if not self._is_fresh(stored_at) or record.get("model") != model_cls.__name__:
+                path.unlink(missing_ok=True)
+                return None
+            widget_output = model_cls.model_validate(record["payload"])
+        except Exception as exc:
+            logger.warning("Discarding unreadable widget cache file %s: %s", path.name, exc)
+            path.unlink(missing_ok=True)
+            return None
+        with self._lock:
+            self._store_memory(key, stored_at, widget_output)
+        return widget_output
+
+    def _write_to_disk(self, key: str, stored_at: float, widget_output: Any) -> None:
+        path = self._disk_path(key)
+        if path is None:
+            return
+        record = {
+            "model": type(widget_output).__name__,
+            "stored_at": stored_at,
+            "payload": widget_output.model_dump(mode="json"),
+        }
+        temp_path = path.with_suffix(".tmp")
+        try:
+            temp_path.write_text(json.dumps(record, ensure_ascii=False), encoding="utf-8")
+            temp_path.replace(path)
+        except Exception as exc:
+            logger.warning("Could not write widget cache file %s: %s", path.name, exc)
+
+
+_WIDGET_OUTPUT_CACHE: WidgetOutputCache | None = None
+_WIDGET_OUTPUT_CACHE_LOCK = threading.Lock()
+
+
+def get_widget_output_cache() -> WidgetOutputCache | None:
+    """Process-wide cache configured from env; None when DYNAMIC_WIDGET_CACHE_ENABLED is off."""
+    global _WIDGET_OUTPUT_CACHE
+    if os.getenv("DYNAMIC_WIDGET_CACHE_ENABLED", "true").strip().lower() not in {"1", "true", "yes"}:
+        return None
+    with _WIDGET_OUTPUT_CACHE_LOCK:
+        if _WIDGET_OUTPUT_CACHE is None:
+            _WIDGET_OUTPUT_CACHE = WidgetOutputCache(
+                max_entries=int(os.getenv("DYNAMIC_WIDGET_CACHE_MAX_ENTRIES", "256")),
+                ttl_seconds=float(os.getenv("DYNAMIC_WIDGET_CACHE_TTL_SECONDS", "900")),
+                disk_dir=os.getenv("DYNAMIC_WIDGET_CACHE_DIR") or None,
+            )
+        return _WIDGET_OUTPUT_CACHE
@@ -0,0 +1,146 @@
+"""Latency budget and hedged attempts for widget slot generation."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+# (validated output or None, payload preview, error text)
+AttemptResult = tuple[Any | None, str, str]
+
+
+#region Latency Budget
+class WidgetLatencyBudget:
+    """Per-widget attempt latency history, hedge delay and slot budget.
+
+    The hedge delay is the p95 of recent hedged-attempt latencies for the
+    widget type, measured from the start of the attempt rather than of each
+    duplicate, so hedging does not shrink its own delay
+    (``DYNAMIC_WIDGET_HEDGE_DELAY_MS`` until enough samples exist). A slot
+    never waits longer than ``DYNAMIC_WIDGET_SLOT_BUDGET_MS`` in total.
+    """
+
+    WINDOW = 100
+    MIN_SAMPLES = 20
+    MIN_HEDGE_DELAY_MS = 1000.0
+
+    def __init__(self):
+        self.hedging_enabled = os.getenv("DYNAMIC_WIDGET_HEDGING", "true").strip().lower() in {"1", "true", "yes"}
+        self.slot_budget_ms = float(os.getenv("DYNAMIC_WIDGET_SLOT_BUDGET_MS", "30000"))
+        self.default_hedge_delay_ms = float(os.getenv("DYNAMIC_WIDGET_HEDGE_DELAY_MS", "8000"))
+        self._latencies: dict[str, deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, widget_name: str, latency_ms: float) -> None:
+        with self._lock:
+            history = self._latencies.setdefault(widget_name, deque(maxlen=self.WINDOW))
+            history.append(latency_ms)
+
+    def p95_ms(self, widget_name: str) -> float | None:
+        with self._lock:
+            history = sorted(self._latencies.get(widget_name) or ())
+        if len(history) < self.MIN_SAMPLES:
+            return None
+        return history[math.ceil(0.95 * len(history)) - 1]
+
+    def hedge_delay_ms(self, widget_name: str) -> float | None:
+        """Milliseconds to wait before hedging, or None when hedging is off."""
+        if not self.hedging_enabled:
+            return None
+        p95 = self.p95_ms(widget_name)
+        return max(self.MIN_HEDGE_DELAY_MS, p95 if p95 is not None else self.default_hedge_delay_ms)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            widget_names = list(self._latencies)
+        return {
+            "hedging_enabled": self.hedging_enabled,
+            "slot_budget_ms": self.slot_budget_ms,
+            "p95_ms": {name: self.p95_ms(name) for name in widget_names},
+        }
+#endregion
+
+
+WIDGET_LATENCY = WidgetLatencyBudget()
+
+
+#region Hedged Attempts
+async def run_hedged_attempt(
+    attempt_factory: Callable[[], Awaitable[AttemptResult]],
+    kind: str,
+    deadline: float,
+    hedge_delay_ms: float | None,
+    attempt_log: list[dict[str, Any]],
+    on_latency: Callable[[float], None] | None = None,
+) -> AttemptResult:
+    """Run one attempt and, if it is still pending after the hedge delay, race a duplicate.
+
+    The first valid result wins and the other attempt is cancelled. ``deadline``
+    is a ``time.perf_counter()`` value; when it passes, everything still running
+    is cancelled and the last invalid result (or a budget error) is returned.
+    Each attempt appends ``{kind, latency_ms, outcome}`` to ``attempt_log``.
+
+    ``on_latency`` gets one sample per call, timed from the call's start until
+    it resolves, so a winning hedge counts the delay it waited. When the call
+    ends without an answer (deadline or cancellation) the elapsed time is
+    still recorded, as a lower bound.
+    """
+
+    async def timed(attempt_kind: str) -> AttemptResult:
+        started_at = time.perf_counter()
+        entry: dict[str, Any] = {"kind": attempt_kind, "latency_ms": None, "outcome": "running"}
+        attempt_log.append(entry)
+        try:
+            result = await attempt_factory()
+            entry["outcome"] = "valid" if result[0] is not None else "invalid"
+        except asyncio.CancelledError:
+            entry["outcome"] = "cancelled"
+            raise
+        except Exception as exc:
+            entry["outcome"] = "error"
+            result = (None, "<unavailable due to structured generation exception>", str(exc))
+        finally:
+            entry["latency_ms"] = round((time.perf_counter() - started_at) * 1000.0, 1)
+        return result
+
+    slot_started_at = time.perf_counter()
+    pending = {asyncio.create_task(timed(kind))}
+    last_result: AttemptResult = (None, "<unavailable: latency budget exhausted>", "Latency budget exhausted.")
+    hedged = hedge_delay_ms is None
+    try:
+        while pending:
+            remaining_s = deadline - time.perf_counter()
+            if remaining_s <= 0:
+                break
+            wait_s = remaining_s if hedged else min(remaining_s, hedge_delay_ms / 1000.0)
+            done, pending = await asyncio.wait(pending, timeout=wait_s, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                result = task.result()
+                if result[0] is not None:
+                    return result
+                last_result = result
+            if not done and not hedged:
+                hedged = True
+                logger.info("Widget attempt %s passed its hedge delay (%.0f ms); hedging", kind, hedge_delay_ms)
+                pending.add(asyncio.create_task(timed(f"{kind}_hedge")))
+            elif done:
+                # The original attempt answered (invalid); do not hedge it afterwards.
+                hedged = True
+        return last_result
+    finally:
+        slot_latency_ms = round((time.perf_counter() - slot_started_at) * 1000.0, 1)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        if on_latency is not None:
+            on_latency(slot_latency_ms)
+#endregion
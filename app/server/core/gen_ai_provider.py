@@ -12,6 +12,8 @@ from oci_genai_auth import OciUserPrincipalAuth
 from openai import OpenAI, AsyncOpenAI
 from langchain_openai import ChatOpenAI
 
+from core.admission import stage_limit
+from core.llm_rate_limit import LLM_RATE_LIMIT_ENABLED, estimate_tokens, get_model_rate_limiter
 from database.connections import RAGDBConnection
 
 from dotenv import load_dotenv
@@ -24,6 +26,40 @@ DEFAULT_CHAT_MODEL = "xai.grok-4-fast-non-reasoning"
 # endregion Constants
 
 # region LLM Provider
+class LimitedChatOpenAI(ChatOpenAI):
+    """ChatOpenAI whose async calls go through the model's rate limiter and the shared ``llm`` stage limit.
+
+    Throttled and transient failures are retried by the rate limiter (see
+    ``core.llm_rate_limit``), so the OpenAI SDK's own retries are turned off
+    while it is enabled.
+    """
+
+    async def _agenerate(self, messages: list[Any], *args: Any, **kwargs: Any):
+        generate = super()._agenerate
+
+        async def limited_call():
+            async with stage_limit("llm"):
+                return await generate(messages, *args, **kwargs)
+
+        limiter = get_model_rate_limiter(self.model_name)
+        if limiter is None:
+            return await limited_call()
+        return await limiter.call(limited_call, estimate_tokens(messages))
+
+    async def _astream(self, messages: list[Any], *args: Any, **kwargs: Any):
+        stream = super()._astream
+
+        async def limited_stream():
+            async with stage_limit("llm"):
+                async for chunk in stream(messages, *args, **kwargs):
+                    yield chunk
+
+        limiter = get_model_rate_limiter(self.model_name)
+        chunks = limited_stream() if limiter is None else limiter.stream(limited_stream, estimate_tokens(messages))
+        async for chunk in chunks:
+            yield chunk
+
+
 class GenAIProvider:
     """Singleton provider for OCI GenAI LLM clients."""
     _instance = None
@@ -61,7 +97,7 @@ class GenAIProvider:
         #     **resolved_model_kwargs,
         # )
 
-        client = ChatOpenAI(
+        client = LimitedChatOpenAI(
             model=resolved_model_id,
             openai_api_base="https://inference.generativeai.us-chicago-1.oci.oraclecloud.com/openai/v1",
             openai_api_key="OCI",
@@ -73,6 +109,7 @@ class GenAIProvider:
                 auth=OciUserPrincipalAuth(profile_name=os.getenv("AUTH_PROFILE"))
             ),
             use_responses_api=True,
+            **({"max_retries": 0} if LLM_RATE_LIMIT_ENABLED else {}),
             **resolved_model_kwargs,
         )
 
@@ -0,0 +1,155 @@
+"""Pluggable JSON encoding: orjson or msgspec when installed, stdlib ``json`` otherwise.
+
+``JSON_CODEC`` picks the backend (``auto``, ``orjson``, ``msgspec`` or
+``stdlib``); ``auto`` takes the first one that imports. Every backend writes
+compact UTF-8 without ASCII escaping and raises ``json.JSONDecodeError`` on
+bad input, so callers do not depend on which one is active.
+"""
+
+# region Imports
+import json
+import logging
+import os
+from typing import Any
+
+from starlette.responses import Response
+# endregion Imports
+
+logger = logging.getLogger(__name__)
+
+
+# region Backends
+class _StdlibFragment:
+    """Pre-encoded value for the stdlib backend, which cannot splice raw bytes."""
+
+    __slots__ = ("encoded", "value")
+
+    def __init__(self, encoded: bytes, value: Any):
+        self.encoded = encoded
+        self.value = value
+
+
+def _stdlib_default(value: Any) -> Any:
+    if isinstance(value, _StdlibFragment):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class _StdlibCodec:
+    name = "stdlib"
+
+    def dumps(self, value: Any, sort_keys: bool = False) -> bytes:
+        return json.dumps(
+            value,
+            ensure_ascii=False,
+            separators=(",", ":"),
+            sort_keys=sort_keys,
+            default=_stdlib_default,
+        ).encode("utf-8")
+
+    def loads(self, data: bytes | str) -> Any:
+        return json.loads(data)
+
+    def fragment(self, encoded: bytes, value: Any) -> Any:
+        return _StdlibFragment(encoded, value)
+
+
+class _OrjsonCodec:
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+        self._options = orjson.OPT_NON_STR_KEYS
+        self._sorted_options = orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS
+
+    def dumps(self, value: Any, sort_keys: bool = False) -> bytes:
+        return self._orjson.dumps(value, option=self._sorted_options if sort_keys else self._options)
+
+    def loads(self, data: bytes | str) -> Any:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError.
+        return self._orjson.loads(data)
+
+    def fragment(self, encoded: bytes, value: Any) -> Any:
+        return self._orjson.Fragment(encoded)
+
+
+class _MsgspecCodec:
+    name = "msgspec"
+
+    def __init__(self):
+        import msgspec
+
+        self._msgspec = msgspec
+        self._encoder = msgspec.json.Encoder()
+        self._sorted_encoder = msgspec.json.Encoder(order="sorted")
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, value: Any, sort_keys: bool = False) -> bytes:
+        return (self._sorted_encoder if sort_keys else self._encoder).encode(value)
+
+    def loads(self, data: bytes | str) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except self._msgspec.DecodeError as exc:
+            text = data.decode("utf-8", errors="replace") if isinstance(data, bytes) else data
+            raise json.JSONDecodeError(str(exc), text, 0) from exc
+
+    def fragment(self, encoded: bytes, value: Any) -> Any:
+        return self._msgspec.Raw(encoded)
+
+
+_BACKENDS = {"orjson": _OrjsonCodec, "msgspec": _MsgspecCodec, "stdlib": _StdlibCodec}
+
+
+def _select_codec(requested: str) -> Any:
+    names = ("orjson", "msgspec", "stdlib") if requested == "auto" else (requested, "stdlib")
+    for name in names:
+        backend = _BACKENDS.get(name)
+        if backend is None:
+            logger.warning("Unknown JSON_CODEC=%s; using the stdlib codec", name)
+            continue
+        try:
+            return backend()
+        except ImportError:
+            if requested != "auto":
+                logger.warning("JSON_CODEC=%s is not installed; using the stdlib codec", name)
+    return _StdlibCodec()
+
+
+CODEC = _select_codec(os.getenv("JSON_CODEC", "auto").strip().lower())
+# endregion Backends
+
+
+# region API
+def dumps(value: Any, sort_keys: bool = False) -> bytes:
+    """Compact UTF-8 JSON bytes; values from ``pre_encode`` are spliced in as-is."""
+    return CODEC.dumps(value, sort_keys=sort_keys)
+
+
+def dumps_text(value: Any) -> str:
+    return CODEC.dumps(value).decode("utf-8")
+
+
+def loads(data: bytes | str) -> Any:
+    return CODEC.loads(data)
+
+
+def pre_encode(value: Any) -> Any:
+    """Encode an immutable value once so later ``dumps`` calls embed its bytes directly.
+
+    The result is only meant to be placed inside payloads passed to ``dumps``
+    or ``JSONBytesResponse``; read the original value where it is needed.
+    """
+    return CODEC.fragment(CODEC.dumps(value), value)
+
+
+class JSONBytesResponse(Response):
+    """Starlette JSON response rendered with the active codec."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+# endregion API
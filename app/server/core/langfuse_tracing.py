@@ -1,11 +1,17 @@
 import os
+import functools
 import logging
+import threading
+import time
+from contextlib import contextmanager
 from contextvars import ContextVar, Token
-from typing import Any
+from typing import Any, Iterator
 
 from langfuse import Langfuse
 from langfuse.langchain import CallbackHandler
 
+from core.trace_sampling import TRACE_SAMPLER, TraceRequest, is_trace_sampled, record_tracing_overhead
+
 _LANGFUSE_SESSION_ID: ContextVar[str | None] = ContextVar(
     "langfuse_session_id",
     default=None,
@@ -20,6 +26,54 @@ _LANGFUSE_TRACE_ID: ContextVar[str | None] = ContextVar(
 )
 logger = logging.getLogger(__name__)
 
+# Process-wide client: every provider shares one exporter and its background threads.
+_SHARED_CLIENT: Langfuse | None = None
+_SHARED_CLIENT_LOCK = threading.Lock()
+
+
+#region Client Registry
+def register_langfuse_client(langfuse_client: Langfuse) -> Langfuse:
+    """Make ``langfuse_client`` the one returned by ``get_langfuse_client`` (call once at startup)."""
+    global _SHARED_CLIENT
+    with _SHARED_CLIENT_LOCK:
+        if _SHARED_CLIENT is not None and _SHARED_CLIENT is not langfuse_client:
+            logger.warning("Replacing the registered Langfuse client")
+        _SHARED_CLIENT = langfuse_client
+    return langfuse_client
+
+
+def get_langfuse_client() -> Langfuse:
+    """Shared Langfuse client; built from the LANGFUSE_* settings if none was registered."""
+    global _SHARED_CLIENT
+    client = _SHARED_CLIENT
+    if client is not None:
+        return client
+    with _SHARED_CLIENT_LOCK:
+        if _SHARED_CLIENT is None:
+            _SHARED_CLIENT = Langfuse(
+                public_key=os.getenv("LANGFUSE_PUBLIC_KEY"),
+                secret_key=os.getenv("LANGFUSE_SECRET_KEY"),
+                host=os.getenv("LANGFUSE_HOST"),
+            )
+        return _SHARED_CLIENT
+
+
+def shutdown_langfuse_clients(timeout_s: float = 5.0) -> None:
+    """Export pending tail-sampled summaries, then flush and shut down the shared client."""
+    global _SHARED_CLIENT
+    if not TRACE_SAMPLER.export_queue.drain(timeout_s):
+        logger.warning("Trace export queue not drained within %.1fs; dropping the rest", timeout_s)
+    with _SHARED_CLIENT_LOCK:
+        client, _SHARED_CLIENT = _SHARED_CLIENT, None
+    if client is None:
+        return
+    try:
+        client.flush()
+        client.shutdown()
+    except Exception as exc:
+        logger.warning("Langfuse shutdown failed: %s", exc)
+#endregion
+
 
 def _normalize_usage_payload(value: Any) -> Any:
     """Recursively normalize usage payload values so math ops are always safe."""
@@ -80,8 +134,22 @@ def extract_total_tokens_from_response(response: dict[str, Any]) -> int:
     return extract_total_tokens_from_message(latest_message)
 
 
+def _timed_callback(method):
+    """Count time spent in a handler callback towards the request's tracing overhead."""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        started_at = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            record_tracing_overhead(time.perf_counter() - started_at)
+
+    return wrapper
+
+
 class SafeLangfuseCallbackHandler(CallbackHandler):
-    """Langfuse handler that sanitizes usage payloads before parsing."""
+    """Langfuse handler that sanitizes usage payloads before parsing and times its callbacks."""
 
     def _sanitize_response_usage(self, response: Any) -> None:
         if getattr(response, "llm_output", None):
@@ -126,6 +194,7 @@ class SafeLangfuseCallbackHandler(CallbackHandler):
                     except Exception:
                         pass
 
+    @_timed_callback
     def on_llm_end(self, response, *, run_id, parent_run_id=None, **kwargs):
         self._sanitize_response_usage(response)
         return super().on_llm_end(
@@ -135,14 +204,72 @@ class SafeLangfuseCallbackHandler(CallbackHandler):
             **kwargs,
         )
 
+    @_timed_callback
+    def on_chain_start(self, *args, **kwargs):
+        return super().on_chain_start(*args, **kwargs)
+
+    @_timed_callback
+    def on_chain_end(self, *args, **kwargs):
+        return super().on_chain_end(*args, **kwargs)
+
+    @_timed_callback
+    def on_chain_error(self, *args, **kwargs):
+        return super().on_chain_error(*args, **kwargs)
+
+    @_timed_callback
+    def on_chat_model_start(self, *args, **kwargs):
+        return super().on_chat_model_start(*args, **kwargs)
+
+    @_timed_callback
+    def on_llm_start(self, *args, **kwargs):
+        return super().on_llm_start(*args, **kwargs)
+
+    @_timed_callback
+    def on_llm_new_token(self, *args, **kwargs):
+        return super().on_llm_new_token(*args, **kwargs)
+
+    @_timed_callback
+    def on_llm_error(self, *args, **kwargs):
+        return super().on_llm_error(*args, **kwargs)
+
+    @_timed_callback
+    def on_tool_start(self, *args, **kwargs):
+        return super().on_tool_start(*args, **kwargs)
+
+    @_timed_callback
+    def on_tool_end(self, *args, **kwargs):
+        return super().on_tool_end(*args, **kwargs)
+
+    @_timed_callback
+    def on_tool_error(self, *args, **kwargs):
+        return super().on_tool_error(*args, **kwargs)
+
+    @_timed_callback
+    def on_retriever_start(self, *args, **kwargs):
+        return super().on_retriever_start(*args, **kwargs)
+
+    @_timed_callback
+    def on_retriever_end(self, *args, **kwargs):
+        return super().on_retriever_end(*args, **kwargs)
+
+    @_timed_callback
+    def on_retriever_error(self, *args, **kwargs):
+        return super().on_retriever_error(*args, **kwargs)
+
+
+class _NoopObservation:
+    """Stands in for an observation when the current request is not traced."""
+
+    def update(self, **kwargs: Any) -> "_NoopObservation":
+        return self
+
+
+NOOP_OBSERVATION = _NoopObservation()
+
 
 class LangfuseTracingProvider:
     def __init__(self, langfuse_client: Langfuse | None = None):
-        self.langfuse_instance = langfuse_client or Langfuse(
-            public_key=os.getenv("LANGFUSE_PUBLIC_KEY"),
-            secret_key=os.getenv("LANGFUSE_SECRET_KEY"),
-            host=os.getenv("LANGFUSE_HOST"),
-        )
+        self.langfuse_instance = langfuse_client or get_langfuse_client()
 
     def set_current_session_id(self, session_id: str) -> Token:
         return _LANGFUSE_SESSION_ID.set(session_id)
@@ -203,6 +330,40 @@ class LangfuseTracingProvider:
     def get_current_client(self) -> Langfuse:
         return _LANGFUSE_CLIENT.get() or self.langfuse_instance
 
+    def start_trace_request(
+        self,
+        name: str,
+        langfuse_client: Langfuse | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> TraceRequest | None:
+        """Open the sampling scope of a request (see ``core.trace_sampling``)."""
+        return TRACE_SAMPLER.begin(name, langfuse_client or self.get_current_client(), metadata)
+
+    def finish_trace_request(self, trace_request: TraceRequest | None, error: Exception | None = None) -> None:
+        TRACE_SAMPLER.end(trace_request, error)
+
+    @contextmanager
+    def observation(self, langfuse_client: Langfuse, **kwargs: Any) -> Iterator[Any]:
+        """``start_as_current_observation`` for traced requests, a no-op observation otherwise."""
+        if not is_trace_sampled():
+            yield NOOP_OBSERVATION
+            return
+        started_at = time.perf_counter()
+        with langfuse_client.start_as_current_observation(**kwargs) as observation:
+            record_tracing_overhead(time.perf_counter() - started_at)
+            try:
+                yield observation
+            finally:
+                started_at = time.perf_counter()
+        record_tracing_overhead(time.perf_counter() - started_at)
+
+    @contextmanager
+    def request_observation(self, langfuse_client: Langfuse, **kwargs: Any) -> Iterator[Any]:
+        """Root observation of a request: opens the sampling scope, then the observation."""
+        with TRACE_SAMPLER.request(kwargs.get("name", "request"), langfuse_client, kwargs.get("metadata")):
+            with self.observation(langfuse_client, **kwargs) as observation:
+                yield observation
+
     def get_trace_handler(self, trace_context: dict[str, str] | None = None):
         if trace_context is None:
             return SafeLangfuseCallbackHandler(
@@ -249,9 +410,16 @@ class LangfuseTracingProvider:
         if extra_metadata:
             metadata.update(extra_metadata)
 
+        # Unsampled requests run without the Langfuse handler and its per-event work.
+        callbacks = []
+        if is_trace_sampled():
+            started_at = time.perf_counter()
+            callbacks.append(self.get_trace_handler(trace_context=trace_context))
+            record_tracing_overhead(time.perf_counter() - started_at)
+
         return {
             "run_id": run_id,
             "configurable": {"thread_id": thread_id or session_id},
-            "callbacks": [self.get_trace_handler(trace_context=trace_context)],
+            "callbacks": callbacks,
             "metadata": metadata,
         }
@@ -0,0 +1,305 @@
+"""Client-side rate limiting and adaptive concurrency for OCI GenAI chat calls."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+import openai
+
+logger = logging.getLogger(__name__)
+
+# (model id, owning task) pairs; _agenerate may delegate to _astream on the same client.
+_active_calls: ContextVar[frozenset[tuple[str, Any]]] = ContextVar("llm_rate_limited_calls", default=frozenset())
+
+
+#region Buckets
+class TokenBucket:
+    """Per-minute budget refilled continuously; reservations may overdraw it.
+
+    ``reserve`` takes the amount immediately and returns how long the caller
+    must sleep before using it, so waiters are served in arrival order
+    without a lock or a polling loop.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = max(1.0, float(per_minute))
+        self.rate_per_s = self.capacity / 60.0
+        self.available = self.capacity
+        self._updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.available = min(self.capacity, self.available + (now - self._updated_at) * self.rate_per_s)
+        self._updated_at = now
+
+    def reserve(self, amount: float) -> float:
+        self._refill()
+        self.available -= min(amount, self.capacity)
+        return max(0.0, -self.available / self.rate_per_s)
+
+    def adjust(self, amount: float) -> None:
+        """Charge (positive) or refund (negative) the difference once real usage is known."""
+        self._refill()
+        self.available = min(self.capacity, self.available - amount)
+
+    def pause(self, seconds: float) -> None:
+        """Make the next reservation wait at least ``seconds``."""
+        self._refill()
+        self.available = min(self.available, -seconds * self.rate_per_s)
+
+
+class AdaptiveConcurrency:
+    """AIMD limit on in-flight calls: +1/limit per success, halved on throttling.
+
+    At most one decrease per ``cooldown_s`` so a burst of 429s from calls that
+    were already in flight counts as a single congestion signal.
+    """
+
+    def __init__(self, max_limit: int, cooldown_s: float):
+        self.max_limit = max(1, max_limit)
+        self.limit = float(self.max_limit)
+        self.cooldown_s = cooldown_s
+        self.active = 0
+        self.waiting = 0
+        self._last_decrease = 0.0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        async with self._condition:
+            self.waiting += 1
+            try:
+                await self._condition.wait_for(lambda: self.active < int(self.limit))
+            finally:
+                self.waiting -= 1
+            self.active += 1
+
+    async def release(self) -> None:
+        async with self._condition:
+            self.active -= 1
+            self._condition.notify_all()
+
+    def on_success(self) -> None:
+        self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+
+    def on_throttle(self) -> bool:
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown_s:
+            return False
+        self._last_decrease = now
+        self.limit = max(1.0, self.limit / 2.0)
+        return True
+#endregion
+
+
+#region Model Limiter
+def _retry_kind(exc: BaseException) -> str | None:
+    if isinstance(exc, openai.RateLimitError) or getattr(exc, "status_code", None) == 429:
+        return "throttled"
+    if isinstance(exc, (openai.APIConnectionError, openai.InternalServerError)):
+        return "transient"
+    return None
+
+
+def _retry_after_s(exc: BaseException) -> float | None:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _total_tokens(message: Any) -> int | None:
+    usage = getattr(message, "usage_metadata", None) or {}
+    total = usage.get("total_tokens") if isinstance(usage, dict) else None
+    return int(total) if total else None
+
+
+class ModelRateLimiter:
+    """Requests/min and tokens/min buckets plus AIMD concurrency for one model id.
+
+    Calls reserve one request and an estimate of their tokens, wait for a
+    concurrency slot, and charge the real token usage afterwards. A 429
+    halves the concurrency limit, pauses the request bucket for the
+    provider's Retry-After (or the backoff) and retries the call, so every
+    caller of the model backs off together instead of retrying on its own.
+    """
+
+    def __init__(
+        self,
+        model_id: str,
+        requests_per_min: float,
+        tokens_per_min: float,
+        max_concurrency: int,
+        max_retries: int,
+        backoff_s: float,
+    ):
+        self.model_id = model_id
+        self.requests = TokenBucket(requests_per_min)
+        self.tokens = TokenBucket(tokens_per_min)
+        self.concurrency = AdaptiveConcurrency(max_concurrency, cooldown_s=backoff_s)
+        self.max_retries = max_retries
+        self.backoff_s = backoff_s
+        self._stats = {
+            "calls": 0,
+            "throttled": 0,
+            "transient_errors": 0,
+            "retries": 0,
+            "delayed": 0,
+            "delay_ms_total": 0.0,
+            "tokens_used": 0,
+        }
+
+    def _is_nested(self) -> tuple[bool, Any]:
+        key = (self.model_id, asyncio.current_task())
+        return key in _active_calls.get(), key
+
+    async def _admit(self, estimated_tokens: int) -> None:
+        delay_s = max(self.requests.reserve(1), self.tokens.reserve(estimated_tokens))
+        if delay_s > 0:
+            self._stats["delayed"] += 1
+            self._stats["delay_ms_total"] += delay_s * 1000.0
+            await asyncio.sleep(delay_s)
+        await self.concurrency.acquire()
+
+    def _on_success(self, estimated_tokens: int, used_tokens: int | None) -> None:
+        self._stats["calls"] += 1
+        self.concurrency.on_success()
+        if used_tokens is not None:
+            self._stats["tokens_used"] += used_tokens
+            self.tokens.adjust(used_tokens - estimated_tokens)
+
+    async def _on_retryable(self, kind: str, exc: BaseException, attempt: int) -> None:
+        self._stats["retries"] += 1
+        if kind == "throttled":
+            self._stats["throttled"] += 1
+            pause_s = _retry_after_s(exc) or self.backoff_s * (2 ** attempt)
+            self.requests.pause(pause_s)
+            if self.concurrency.on_throttle():
+                logger.warning(
+                    "LLM throttled | model=%s concurrency_limit=%.1f pause_s=%.1f",
+                    self.model_id,
+                    self.concurrency.limit,
+                    pause_s,
+                )
+        else:
+            self._stats["transient_errors"] += 1
+            await asyncio.sleep(self.backoff_s * (2 ** attempt))
+
+    async def call(self, call_factory: Callable[[], Awaitable[Any]], estimated_tokens: int) -> Any:
+        """Run one rate-limited ``ChatResult`` call, retrying throttled/transient failures."""
+        nested, key = self._is_nested()
+        if nested:
+            return await call_factory()
+        previous = _active_calls.get()
+        _active_calls.set(previous | {key})
+        try:
+            for attempt in range(self.max_retries + 1):
+                await self._admit(estimated_tokens)
+                try:
+                    result = await call_factory()
+                except Exception as exc:
+                    kind = _retry_kind(exc)
+                    if kind is None or attempt == self.max_retries:
+                        raise
+                    await self._on_retryable(kind, exc, attempt)
+                    continue
+                finally:
+                    await self.concurrency.release()
+                generations = getattr(result, "generations", None) or []
+                self._on_success(estimated_tokens, _total_tokens(generations[0].message) if generations else None)
+                return result
+        finally:
+            _active_calls.set(previous)
+
+    async def stream(
+        self, stream_factory: Callable[[], AsyncIterator[Any]], estimated_tokens: int
+    ) -> AsyncIterator[Any]:
+        """Rate-limited chunk stream; retried only while nothing has been yielded yet."""
+        nested, key = self._is_nested()
+        if nested:
+            async for chunk in stream_factory():
+                yield chunk
+            return
+        previous = _active_calls.get()
+        _active_calls.set(previous | {key})
+        try:
+            for attempt in range(self.max_retries + 1):
+                await self._admit(estimated_tokens)
+                yielded = False
+                used_tokens = None
+                try:
+                    async for chunk in stream_factory():
+                        yielded = True
+                        used_tokens = _total_tokens(getattr(chunk, "message", None)) or used_tokens
+                        yield chunk
+                except Exception as exc:
+                    kind = _retry_kind(exc)
+                    if yielded or kind is None or attempt == self.max_retries:
+                        raise
+                    await self._on_retryable(kind, exc, attempt)
+                    continue
+                finally:
+                    await self.concurrency.release()
+                self._on_success(estimated_tokens, used_tokens)
+                return
+        finally:
+            _active_calls.set(previous)
+
+    def snapshot(self) -> dict[str, Any]:
+        stats = dict(self._stats)
+        stats["delay_ms_total"] = round(stats["delay_ms_total"], 1)
+        return {
+            "concurrency_limit": round(self.concurrency.limit, 2),
+            "max_concurrency": self.concurrency.max_limit,
+            "active": self.concurrency.active,
+            "waiting": self.concurrency.waiting,
+            "requests_available": round(self.requests.available, 1),
+            "tokens_available": round(self.tokens.available, 1),
+            **stats,
+        }
+#endregion
+
+
+#region Registry
+LLM_RATE_LIMIT_ENABLED = os.getenv("LLM_RATE_LIMIT_ENABLED", "true").strip().lower() in {"1", "true", "yes"}
+_MODEL_LIMITERS: dict[str, ModelRateLimiter] = {}
+
+
+def estimate_tokens(messages: Any) -> int:
+    """Rough prompt size (4 characters per token) used until the response reports usage."""
+    characters = 0
+    for message in messages or ():
+        content = getattr(message, "content", message)
+        characters += len(content) if isinstance(content, str) else len(str(content))
+    return characters // 4 + 1
+
+
+def get_model_rate_limiter(model_id: str) -> ModelRateLimiter | None:
+    """Shared limiter for ``model_id``, or None when ``LLM_RATE_LIMIT_ENABLED`` is off."""
+    if not LLM_RATE_LIMIT_ENABLED:
+        return None
+    limiter = _MODEL_LIMITERS.get(model_id)
+    if limiter is None:
+        limiter = _MODEL_LIMITERS[model_id] = ModelRateLimiter(
+            model_id,
+            requests_per_min=float(os.getenv("LLM_RATE_LIMIT_RPM", "600")),
+            tokens_per_min=float(os.getenv("LLM_RATE_LIMIT_TPM", "400000")),
+            max_concurrency=int(os.getenv("LLM_RATE_LIMIT_MAX_CONCURRENCY", "16")),
+            max_retries=int(os.getenv("LLM_RATE_LIMIT_MAX_RETRIES", "3")),
+            backoff_s=float(os.getenv("LLM_RATE_LIMIT_BACKOFF_SECONDS", "1.0")),
+        )
+    return limiter
+
+
+def get_llm_rate_limit_summary() -> dict[str, Any]:
+    return {
+        "enabled": LLM_RATE_LIMIT_ENABLED,
+        "models": {model_id: limiter.snapshot() for model_id, limiter in _MODEL_LIMITERS.items()},
+    }
+#endregion
@@ -0,0 +1,113 @@
+"""Coalesce working-state status updates produced within a short window into one A2A event."""
+
+# region Imports
+import asyncio
+import logging
+import os
+from typing import Any
+
+from a2a.server.tasks import TaskUpdater
+from a2a.types import Part, TaskState, TextPart
+from a2a.utils import new_agent_parts_message
+# endregion Imports
+
+logger = logging.getLogger(__name__)
+
+# region Constants
+DEFAULT_FLUSH_WINDOW_MS = 40.0
+# endregion Constants
+
+
+# region Batcher
+class StatusUpdateBatcher:
+    """Buffer text-only ``working`` updates for ``flush_window_ms`` and send them as one event.
+
+    Clients read the text parts by position (status text first), so a merged
+    event carries the newest item's text parts unchanged; the texts of the
+    items it replaced are listed in ``metadata["coalesced_updates"]``, which
+    the client's stream normalizer shows as status entries before it. An
+    item with A2UI parts is sent at once together with anything pending, so
+    UI rendering never waits for the window.
+    """
+
+    def __init__(
+        self,
+        updater: TaskUpdater,
+        context_id: str,
+        task_id: str,
+        flush_window_ms: float | None = None,
+    ):
+        self.updater = updater
+        self.context_id = context_id
+        self.task_id = task_id
+        self.flush_window_s = (
+            flush_window_ms
+            if flush_window_ms is not None
+            else float(os.getenv("A2A_STATUS_FLUSH_MS", str(DEFAULT_FLUSH_WINDOW_MS)))
+        ) / 1000.0
+        self._pending: list[list[Part]] = []
+        self._emit_lock = asyncio.Lock()
+        self._timer: asyncio.Task | None = None
+        self._closed = False
+        self.items = 0
+        self.events = 0
+
+    async def add(self, text_parts: list[Part], ui_parts: list[Part] | None = None) -> None:
+        """Queue one streamed item; items with UI parts (or a zero window) are sent immediately."""
+        if self._closed:
+            return
+        self.items += 1
+        self._pending.append(text_parts)
+        if ui_parts or self.flush_window_s <= 0:
+            await self._emit(list(ui_parts or ()))
+            return
+        if self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later())
+
+    async def flush(self) -> None:
+        """Send anything pending now (call before the final status update)."""
+        await self._emit([])
+
+    async def aclose(self) -> None:
+        """Stop the flush timer without sending what is pending (the task ended or was cancelled).
+
+        A timed flush that is already sending is waited for, and nothing is sent
+        afterwards, so no ``working`` update can follow the final or canceled state.
+        """
+        self._closed = True
+        timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+            await asyncio.gather(timer, return_exceptions=True)
+        async with self._emit_lock:
+            self._pending.clear()
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_window_s)
+        # Cleared before sending so items added meanwhile start a new window.
+        self._timer = None
+        await self._emit([])
+
+    async def _emit(self, ui_parts: list[Part]) -> None:
+        async with self._emit_lock:
+            if self._closed or (not self._pending and not ui_parts):
+                return
+            pending, self._pending = self._pending, []
+            parts = list(pending[-1]) if pending else []
+            parts.extend(ui_parts)
+            message = new_agent_parts_message(parts, self.context_id, self.task_id)
+            if len(pending) > 1:
+                message.metadata = {"coalesced_updates": [_first_text(item) for item in pending[:-1]]}
+            self.events += 1
+            await self.updater.update_status(TaskState.working, message)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {"items": self.items, "events": self.events}
+# endregion Batcher
+
+
+def _first_text(parts: list[Part]) -> str:
+    for part in parts:
+        if isinstance(part.root, TextPart):
+            return part.root.text
+    return ""
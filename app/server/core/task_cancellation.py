@@ -0,0 +1,101 @@
+"""Per-task cancellation for A2A executors."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Coroutine
+
+logger = logging.getLogger(__name__)
+
+
+class RunningTaskRegistry:
+    """Map A2A task ids to the asyncio task that streams their response.
+
+    ``execute`` starts the stream through ``run``; ``cancel`` cancels that
+    asyncio task, which propagates ``CancelledError`` into the graph stream,
+    in-flight LLM calls and widget/speculative sub-tasks. Work saved is
+    estimated from the average duration of runs that completed normally.
+    """
+
+    DURATION_WINDOW = 50
+    CANCEL_GRACE_SECONDS = 5.0
+
+    def __init__(self, name: str):
+        self.name = name
+        self._running: dict[str, tuple[asyncio.Task, float]] = {}
+        self._cancelled_ids: set[str] = set()
+        self._durations_ms: deque[float] = deque(maxlen=self.DURATION_WINDOW)
+        self._stats: dict[str, float] = {
+            "started": 0,
+            "completed": 0,
+            "cancelled": 0,
+            "cancel_not_running": 0,
+            "cancelled_elapsed_ms": 0.0,
+            "saved_ms_estimate": 0.0,
+        }
+
+    async def run(self, task_id: str, coro: Coroutine[Any, Any, Any]) -> bool:
+        """Run ``coro`` as the task's stream; return False if it was cancelled through ``cancel``."""
+        stream_task = asyncio.create_task(coro)
+        started_at = time.perf_counter()
+        self._running[task_id] = (stream_task, started_at)
+        self._stats["started"] += 1
+        try:
+            await stream_task
+        except asyncio.CancelledError:
+            current = asyncio.current_task()
+            if task_id in self._cancelled_ids and not (current and current.cancelling()):
+                return False
+            raise
+        finally:
+            self._running.pop(task_id, None)
+            self._cancelled_ids.discard(task_id)
+        self._stats["completed"] += 1
+        self._durations_ms.append((time.perf_counter() - started_at) * 1000.0)
+        return True
+
+    def is_running(self, task_id: str) -> bool:
+        return task_id in self._running
+
+    async def cancel(self, task_id: str) -> bool:
+        """Cancel the running stream for ``task_id`` and wait briefly for its cleanup."""
+        entry = self._running.get(task_id)
+        if entry is None:
+            self._stats["cancel_not_running"] += 1
+            return False
+        stream_task, started_at = entry
+        self._cancelled_ids.add(task_id)
+        stream_task.cancel()
+        await asyncio.wait({stream_task}, timeout=self.CANCEL_GRACE_SECONDS)
+
+        elapsed_ms = (time.perf_counter() - started_at) * 1000.0
+        saved_ms = max(0.0, self.average_duration_ms() - elapsed_ms) if self._durations_ms else 0.0
+        self._stats["cancelled"] += 1
+        self._stats["cancelled_elapsed_ms"] += elapsed_ms
+        self._stats["saved_ms_estimate"] += saved_ms
+        logger.info(
+            "%s task cancelled | task_id=%s elapsed_ms=%.1f saved_ms_estimate=%.1f",
+            self.name,
+            task_id,
+            elapsed_ms,
+            saved_ms,
+        )
+        return True
+
+    def average_duration_ms(self) -> float:
+        if not self._durations_ms:
+            return 0.0
+        return sum(self._durations_ms) / len(self._durations_ms)
+
+    def snapshot(self) -> dict[str, Any]:
+        stats = dict(self._stats)
+        stats["cancelled_elapsed_ms"] = round(stats["cancelled_elapsed_ms"], 1)
+        stats["saved_ms_estimate"] = round(stats["saved_ms_estimate"], 1)
+        return {
+            "running": len(self._running),
+            "average_duration_ms": round(self.average_duration_ms(), 1),
+            **stats,
+        }
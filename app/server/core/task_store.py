@@ -0,0 +1,329 @@
+"""Bounded A2A task stores: TTL for finished tasks, a max task count and trimmed status history."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+from a2a.server.context import ServerCallContext
+from a2a.server.tasks import PushNotificationConfigStore, TaskStore
+from a2a.types import Message, Part, Role, Task, TaskState, TextPart
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATES = frozenset(
+    {TaskState.completed, TaskState.canceled, TaskState.failed, TaskState.rejected}
+)
+SUMMARY_METADATA_KEY = "history_summary"
+
+EvictCallback = Callable[[str], Awaitable[None]]
+
+
+def push_config_evictor(config_store: PushNotificationConfigStore) -> EvictCallback:
+    """Eviction callback that drops every push notification config of an evicted task."""
+
+    async def evict(task_id: str) -> None:
+        # ``delete_info`` without a config id only removes the config whose id is the task id.
+        for config in list(await config_store.get_info(task_id)):
+            await config_store.delete_info(task_id, config.id)
+
+    return evict
+
+
+#region History Trimming
+def _data_part_count(message: Message) -> int:
+    return sum(1 for part in message.parts if getattr(part.root, "kind", None) == "data")
+
+
+def trim_task_history(task: Task, running_limit: int) -> Task:
+    """Collapse older agent status messages in ``task.history`` into one summary message.
+
+    Finished tasks keep no agent messages besides the summary (the final one
+    stays in ``task.status.message``); running tasks keep the newest
+    ``running_limit``. User messages are never dropped. Returns ``task``
+    itself when nothing needs trimming, otherwise a shallow copy.
+    """
+    history = task.history or []
+    limit = 0 if task.status.state in TERMINAL_STATES else running_limit
+    previous_summary = None
+    agent_messages = []
+    for message in history:
+        if (message.metadata or {}).get(SUMMARY_METADATA_KEY):
+            previous_summary = message
+        elif message.role == Role.agent:
+            agent_messages.append(message)
+    if len(agent_messages) <= limit:
+        return task
+
+    dropped = agent_messages[: len(agent_messages) - limit]
+    dropped_ids = {id(message) for message in dropped}
+    previous_counts = (previous_summary.metadata or {}) if previous_summary else {}
+    trimmed_messages = int(previous_counts.get("trimmed_messages", 0)) + len(dropped)
+    trimmed_data_parts = int(previous_counts.get("trimmed_data_parts", 0)) + sum(
+        _data_part_count(message) for message in dropped
+    )
+    summary = Message(
+        role=Role.agent,
+        message_id=f"{task.id}-history-summary",
+        task_id=task.id,
+        context_id=task.context_id,
+        parts=[
+            Part(
+                root=TextPart(
+                    text=f"{trimmed_messages} earlier status updates trimmed ({trimmed_data_parts} data parts)."
+                )
+            )
+        ],
+        metadata={
+            SUMMARY_METADATA_KEY: True,
+            "trimmed_messages": trimmed_messages,
+            "trimmed_data_parts": trimmed_data_parts,
+        },
+    )
+
+    trimmed_history: list[Message] = []
+    for message in history:
+        if message is previous_summary:
+            continue
+        if id(message) in dropped_ids:
+            if summary is not None:
+                trimmed_history.append(summary)
+                summary = None
+            continue
+        trimmed_history.append(message)
+    return task.model_copy(update={"history": trimmed_history})
+#endregion
+
+
+#region In-Memory Store
+class BoundedTaskStore(TaskStore):
+    """In-memory ``TaskStore`` that forgets finished tasks and trims status history.
+
+    Finished tasks are dropped ``ttl_s`` after their last update; tasks that
+    stopped updating without finishing are dropped after ``stale_s``. Above
+    ``max_tasks`` the least recently updated finished tasks go first.
+    ``on_evict`` lets the caller drop per-task state kept elsewhere (push
+    notification configs).
+    """
+
+    BACKEND = "memory"
+    SWEEP_INTERVAL_S = 30.0
+
+    def __init__(
+        self,
+        name: str,
+        ttl_s: float | None = None,
+        max_tasks: int | None = None,
+        history_limit: int | None = None,
+        stale_s: float | None = None,
+        on_evict: EvictCallback | None = None,
+    ):
+        self.name = name
+        self.ttl_s = ttl_s if ttl_s is not None else float(os.getenv("A2A_TASK_TTL_SECONDS", "3600"))
+        self.max_tasks = max_tasks or int(os.getenv("A2A_TASK_MAX_TASKS", "1000"))
+        self.history_limit = (
+            history_limit if history_limit is not None else int(os.getenv("A2A_TASK_HISTORY_LIMIT", "20"))
+        )
+        self.stale_s = stale_s if stale_s is not None else float(os.getenv("A2A_TASK_STALE_SECONDS", "21600"))
+        self.on_evict = on_evict
+        self._lock = asyncio.Lock()
+        self._last_sweep = 0.0
+        self._stats = {"saved": 0, "evicted_ttl": 0, "evicted_stale": 0, "evicted_capacity": 0}
+        # task id -> (task, finished, updated_at), least recently updated first.
+        self._tasks: OrderedDict[str, tuple[Task, bool, float]] = OrderedDict()
+
+    async def save(self, task: Task, context: ServerCallContext | None = None) -> None:
+        trimmed = trim_task_history(task, self.history_limit)
+        finished = task.status.state in TERMINAL_STATES
+        now = time.time()
+        async with self._lock:
+            await self._write(trimmed, finished, now)
+            self._stats["saved"] += 1
+            evicted = []
+            if now - self._last_sweep >= self.SWEEP_INTERVAL_S:
+                self._last_sweep = now
+                evicted += await self._sweep_expired(now)
+            evicted += await self._enforce_capacity()
+        await self._notify_evicted(evicted)
+
+    async def get(self, task_id: str, context: ServerCallContext | None = None) -> Task | None:
+        async with self._lock:
+            return await self._read(task_id)
+
+    async def delete(self, task_id: str, context: ServerCallContext | None = None) -> None:
+        async with self._lock:
+            await self._remove(task_id)
+
+    async def _notify_evicted(self, evicted: list[tuple[str, str]]) -> None:
+        for task_id, reason in evicted:
+            self._stats[f"evicted_{reason}"] += 1
+            if self.on_evict is not None:
+                try:
+                    await self.on_evict(task_id)
+                except Exception as exc:
+                    logger.debug("Task store %s eviction callback failed for %s: %s", self.name, task_id, exc)
+
+    # Storage primitives; called with ``_lock`` held.
+    async def _write(self, task: Task, finished: bool, now: float) -> None:
+        self._tasks[task.id] = (task, finished, now)
+        self._tasks.move_to_end(task.id)
+
+    async def _read(self, task_id: str) -> Task | None:
+        entry = self._tasks.get(task_id)
+        return entry[0] if entry else None
+
+    async def _remove(self, task_id: str) -> None:
+        self._tasks.pop(task_id, None)
+
+    async def _sweep_expired(self, now: float) -> list[tuple[str, str]]:
+        evicted = []
+        oldest_kept = now - min(self.ttl_s, self.stale_s)
+        for task_id, (_, finished, updated_at) in list(self._tasks.items()):
+            if updated_at > oldest_kept:
+                break
+            if finished and updated_at <= now - self.ttl_s:
+                evicted.append((task_id, "ttl"))
+            elif not finished and updated_at <= now - self.stale_s:
+                evicted.append((task_id, "stale"))
+        for task_id, _ in evicted:
+            del self._tasks[task_id]
+        return evicted
+
+    async def _enforce_capacity(self) -> list[tuple[str, str]]:
+        excess = len(self._tasks) - self.max_tasks
+        if excess <= 0:
+            return []
+        victims = [task_id for task_id, (_, finished, _) in self._tasks.items() if finished][:excess]
+        if len(victims) < excess:
+            chosen = set(victims)
+            running = [task_id for task_id in self._tasks if task_id not in chosen]
+            victims += running[: excess - len(victims)]
+            logger.warning("Task store %s is full of running tasks; evicting the least recently updated", self.name)
+        for task_id in victims:
+            del self._tasks[task_id]
+        return [(task_id, "capacity") for task_id in victims]
+
+    async def _counts(self) -> tuple[int, int]:
+        finished = sum(1 for _, is_finished, _ in self._tasks.values() if is_finished)
+        return len(self._tasks), finished
+
+    async def snapshot(self) -> dict[str, Any]:
+        async with self._lock:
+            total, finished = await self._counts()
+        return {
+            "backend": self.BACKEND,
+            "tasks": total,
+            "finished": finished,
+            "max_tasks": self.max_tasks,
+            "ttl_s": self.ttl_s,
+            "history_limit": self.history_limit,
+            **self._stats,
+        }
+#endregion
+
+
+#region SQLite Store
+class SQLiteTaskStore(BoundedTaskStore):
+    """``BoundedTaskStore`` kept in a SQLite file, so task memory stays flat and survives restarts.
+
+    Several stores can share one file; rows are keyed by store name. Queries
+    run in worker threads behind a lock on the shared connection.
+    """
+
+    BACKEND = "sqlite"
+
+    def __init__(self, name: str, path: str, **kwargs: Any):
+        super().__init__(name, **kwargs)
+        self.path = path
+        self._db_lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS a2a_tasks (
+                store TEXT NOT NULL,
+                task_id TEXT NOT NULL,
+                finished INTEGER NOT NULL,
+                updated_at REAL NOT NULL,
+                payload TEXT NOT NULL,
+                PRIMARY KEY (store, task_id)
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS a2a_tasks_updated ON a2a_tasks (store, updated_at)")
+
+    async def _run(self, query: str, params: tuple[Any, ...] = ()) -> list[tuple[Any, ...]]:
+        def execute() -> list[tuple[Any, ...]]:
+            with self._db_lock:
+                return self._conn.execute(query, params).fetchall()
+
+        return await asyncio.to_thread(execute)
+
+    async def _write(self, task: Task, finished: bool, now: float) -> None:
+        await self._run(
+            "INSERT OR REPLACE INTO a2a_tasks (store, task_id, finished, updated_at, payload) VALUES (?, ?, ?, ?, ?)",
+            (self.name, task.id, int(finished), now, task.model_dump_json(exclude_none=True)),
+        )
+
+    async def _read(self, task_id: str) -> Task | None:
+        rows = await self._run(
+            "SELECT payload FROM a2a_tasks WHERE store = ? AND task_id = ?", (self.name, task_id)
+        )
+        return Task.model_validate_json(rows[0][0]) if rows else None
+
+    async def _remove(self, task_id: str) -> None:
+        await self._run("DELETE FROM a2a_tasks WHERE store = ? AND task_id = ?", (self.name, task_id))
+
+    async def _sweep_expired(self, now: float) -> list[tuple[str, str]]:
+        rows = await self._run(
+            """
+            DELETE FROM a2a_tasks
+            WHERE store = ? AND ((finished = 1 AND updated_at <= ?) OR (finished = 0 AND updated_at <= ?))
+            RETURNING task_id, finished
+            """,
+            (self.name, now - self.ttl_s, now - self.stale_s),
+        )
+        return [(task_id, "ttl" if finished else "stale") for task_id, finished in rows]
+
+    async def _enforce_capacity(self) -> list[tuple[str, str]]:
+        total, _ = await self._counts()
+        excess = total - self.max_tasks
+        if excess <= 0:
+            return []
+        rows = await self._run(
+            """
+            DELETE FROM a2a_tasks WHERE store = ? AND task_id IN (
+                SELECT task_id FROM a2a_tasks WHERE store = ?
+                ORDER BY finished DESC, updated_at ASC LIMIT ?
+            )
+            RETURNING task_id, finished
+            """,
+            (self.name, self.name, excess),
+        )
+        if not all(finished for _, finished in rows):
+            logger.warning("Task store %s is full of running tasks; evicting the least recently updated", self.name)
+        return [(task_id, "capacity") for task_id, _ in rows]
+
+    async def _counts(self) -> tuple[int, int]:
+        rows = await self._run(
+            "SELECT COUNT(*), COALESCE(SUM(finished), 0) FROM a2a_tasks WHERE store = ?", (self.name,)
+        )
+        return int(rows[0][0]), int(rows[0][1])
+#endregion
+
+
+def build_task_store(name: str, on_evict: EvictCallback | None = None) -> BoundedTaskStore:
+    """Task store for one A2A app: in memory, or SQLite when ``A2A_TASK_STORE=sqlite``."""
+    backend = os.getenv("A2A_TASK_STORE", "memory").strip().lower()
+    if backend == "sqlite":
+        path = os.getenv("A2A_TASK_STORE_PATH", "a2a_tasks.sqlite3")
+        return SQLiteTaskStore(name, path, on_evict=on_evict)
+    if backend != "memory":
+        logger.warning("Unknown A2A_TASK_STORE=%s; using the in-memory task store", backend)
+    return BoundedTaskStore(name, on_evict=on_evict)
@@ -0,0 +1,255 @@
+"""Head/tail sampling for Langfuse request traces and tracing-overhead accounting.
+
+Each request gets a head decision (``TRACING_SAMPLE_RATE``). Sampled requests
+are traced in full as before; unsampled ones skip the Langfuse callback
+handler and nested observations. When an unsampled request fails or runs
+longer than ``TRACING_TAIL_SLOW_MS`` it is still reported (tail sampling) as
+one summary observation, created on a background thread from a bounded queue
+that drops entries instead of blocking requests. Time spent in tracing code is
+added up per request so its overhead can be read from ``get_tracing_summary``.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator
+
+logger = logging.getLogger(__name__)
+
+
+#region Request State
+class TraceRequest:
+    """Sampling decision and tracing overhead of one request."""
+
+    def __init__(self, name: str, sampled: bool, client: Any = None, metadata: dict[str, Any] | None = None):
+        self.name = name
+        self.sampled = sampled
+        self.client = client
+        self.metadata = metadata or {}
+        self.started_at = time.perf_counter()
+        self.overhead_s = 0.0
+        # Callback handlers may run in executor threads.
+        self._lock = threading.Lock()
+
+    def add_overhead(self, seconds: float) -> None:
+        with self._lock:
+            self.overhead_s += seconds
+
+    @property
+    def overhead_ms(self) -> float:
+        return round(self.overhead_s * 1000.0, 3)
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started_at) * 1000.0
+
+
+_CURRENT_REQUEST: ContextVar[TraceRequest | None] = ContextVar("trace_request", default=None)
+
+
+def current_trace_request() -> TraceRequest | None:
+    return _CURRENT_REQUEST.get()
+
+
+def is_trace_sampled() -> bool:
+    """Whether full tracing is on for the current request (always true outside a request)."""
+    request = _CURRENT_REQUEST.get()
+    return request is None or request.sampled
+
+
+def record_tracing_overhead(seconds: float) -> None:
+    request = _CURRENT_REQUEST.get()
+    if request is not None:
+        request.add_overhead(seconds)
+#endregion
+
+
+#region Export Queue
+class TraceExportQueue:
+    """Bounded queue drained by one daemon thread; ``submit`` never blocks and drops when full."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._queue: queue.Queue[Callable[[], None]] = queue.Queue(maxsize=max_size)
+        self._thread: threading.Thread | None = None
+        self._thread_lock = threading.Lock()
+        self._stats = {"submitted": 0, "dropped": 0, "exported": 0, "failed": 0}
+
+    def submit(self, export: Callable[[], None]) -> bool:
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(export)
+        except queue.Full:
+            self._stats["dropped"] += 1
+            return False
+        self._stats["submitted"] += 1
+        return True
+
+    def join(self) -> None:
+        """Wait until everything submitted so far has been exported (tests, shutdown)."""
+        self._queue.join()
+
+    def drain(self, timeout_s: float) -> bool:
+        """Like ``join`` but gives up after ``timeout_s``; returns whether the queue emptied."""
+        deadline = time.monotonic() + timeout_s
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def _ensure_worker(self) -> None:
+        if self._thread is not None:
+            return
+        with self._thread_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="trace-export", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            export = self._queue.get()
+            try:
+                export()
+                self._stats["exported"] += 1
+            except Exception as exc:
+                self._stats["failed"] += 1
+                logger.debug("Trace export failed: %s", exc)
+            finally:
+                self._queue.task_done()
+
+    def snapshot(self) -> dict[str, Any]:
+        return {"queued": self._queue.qsize(), "max_size": self.max_size, **self._stats}
+#endregion
+
+
+#region Sampler
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).strip().lower() in {"1", "true", "yes", "on"}
+
+
+class TraceSampler:
+    """Decide which requests are traced and keep per-request overhead statistics."""
+
+    def __init__(
+        self,
+        sample_rate: float | None = None,
+        slow_ms: float | None = None,
+        tail_errors: bool | None = None,
+        queue_size: int | None = None,
+        rng: Callable[[], float] = random.random,
+    ):
+        self.sample_rate = min(
+            1.0, max(0.0, sample_rate if sample_rate is not None else float(os.getenv("TRACING_SAMPLE_RATE", "1.0")))
+        )
+        self.slow_ms = slow_ms if slow_ms is not None else float(os.getenv("TRACING_TAIL_SLOW_MS", "15000"))
+        self.tail_errors = tail_errors if tail_errors is not None else _env_flag("TRACING_TAIL_ERRORS", "true")
+        self.export_queue = TraceExportQueue(queue_size or int(os.getenv("TRACING_EXPORT_QUEUE_SIZE", "256")))
+        self._rng = rng
+        self._stats = {"requests": 0, "head_sampled": 0, "tail_error": 0, "tail_slow": 0, "not_traced": 0}
+        # sampled/unsampled -> [requests, total overhead ms, max overhead ms]
+        self._overhead = {"sampled": [0, 0.0, 0.0], "unsampled": [0, 0.0, 0.0]}
+
+    def begin(self, name: str, client: Any = None, metadata: dict[str, Any] | None = None) -> TraceRequest | None:
+        """Make the sampling decision for a new request.
+
+        Returns ``None`` inside an existing request scope, which keeps the
+        outer decision and is finished by its owner.
+        """
+        if _CURRENT_REQUEST.get() is not None:
+            return None
+        trace_request = TraceRequest(name, self._rng() < self.sample_rate, client, metadata)
+        _CURRENT_REQUEST.set(trace_request)
+        return trace_request
+
+    def end(self, trace_request: TraceRequest | None, error: Exception | None = None) -> str | None:
+        """Close a scope opened by ``begin``; returns the tail-sampling reason, if any."""
+        if trace_request is None:
+            return None
+        # Set rather than reset: async generators may finalize in another context.
+        _CURRENT_REQUEST.set(None)
+        return self._finish(trace_request, error)
+
+    @contextmanager
+    def request(self, name: str, client: Any = None, metadata: dict[str, Any] | None = None) -> Iterator[TraceRequest]:
+        """``begin``/``end`` around a block; exceptions raised in it count as request errors."""
+        trace_request = self.begin(name, client, metadata)
+        error: Exception | None = None
+        try:
+            yield trace_request or _CURRENT_REQUEST.get()
+        except Exception as exc:
+            error = exc
+            raise
+        finally:
+            self.end(trace_request, error)
+
+    def _finish(self, trace_request: TraceRequest, error: Exception | None) -> str | None:
+        duration_ms = trace_request.elapsed_ms()
+        self._stats["requests"] += 1
+        bucket = self._overhead["sampled" if trace_request.sampled else "unsampled"]
+        bucket[0] += 1
+        bucket[1] += trace_request.overhead_ms
+        bucket[2] = max(bucket[2], trace_request.overhead_ms)
+        if trace_request.sampled:
+            self._stats["head_sampled"] += 1
+            return None
+
+        reason = None
+        if error is not None and self.tail_errors:
+            reason = "error"
+        elif duration_ms >= self.slow_ms:
+            reason = "slow"
+        if reason is None or trace_request.client is None:
+            self._stats["not_traced"] += 1
+            return None
+        self._stats[f"tail_{reason}"] += 1
+        self.export_queue.submit(lambda: _export_summary(trace_request, reason, duration_ms, error))
+        return reason
+
+    def snapshot(self) -> dict[str, Any]:
+        overhead = {
+            key: {
+                "requests": count,
+                "avg_ms": round(total / count, 3) if count else 0.0,
+                "max_ms": round(peak, 3),
+            }
+            for key, (count, total, peak) in self._overhead.items()
+        }
+        return {
+            "sample_rate": self.sample_rate,
+            "tail_slow_ms": self.slow_ms,
+            "tail_errors": self.tail_errors,
+            **self._stats,
+            "overhead": overhead,
+            "export_queue": self.export_queue.snapshot(),
+        }
+
+
+def _export_summary(trace_request: TraceRequest, reason: str, duration_ms: float, error: Exception | None) -> None:
+    metadata = {
+        **trace_request.metadata,
+        "tail_sampled": reason,
+        "duration_ms": round(duration_ms, 1),
+        "tracing_overhead_ms": trace_request.overhead_ms,
+    }
+    with trace_request.client.start_as_current_observation(
+        as_type="span", name=trace_request.name, metadata=metadata
+    ) as observation:
+        if error is not None:
+            observation.update(level="ERROR", status_message=f"{type(error).__name__}: {error}")
+#endregion
+
+
+TRACE_SAMPLER = TraceSampler()
+
+
+def get_tracing_summary() -> dict[str, Any]:
+    return TRACE_SAMPLER.snapshot()
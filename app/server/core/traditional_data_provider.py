@@ -1,5 +1,7 @@
 """Data provider for traditional application - contains comprehensive data independently"""
 
+from core import json_codec
+
 # region Static Data
 # Outage data for traditional application
 OUTAGE_DATA = {
@@ -173,20 +175,51 @@ INDUSTRY_DATA = {
 }
 # endregion Static Data
 
+# Encoded once; accessors decode a fresh copy per call. The version changes whenever a
+# dataset is replaced so responses built from the data know when to rebuild.
+_ENCODED_DATA = {
+    "outage": json_codec.dumps(OUTAGE_DATA),
+    "energy": json_codec.dumps(ENERGY_DATA),
+    "industry": json_codec.dumps(INDUSTRY_DATA),
+}
+# Private decoded copy for record-level reads that should not copy a whole dataset.
+_OUTAGE_RECORDS = json_codec.loads(_ENCODED_DATA["outage"])["outages"]
+_data_version = 1
+
 # region Accessors
 async def get_traditional_outage_data():
     """Get traditional outage data - independent from other applications"""
     # Return a copy to prevent external modifications.
-    import json
-    return json.loads(json.dumps(OUTAGE_DATA))
+    return json_codec.loads(_ENCODED_DATA["outage"])
 
 async def get_traditional_energy_data():
     """Get traditional energy data - independent from other applications"""
-    import json
-    return json.loads(json.dumps(ENERGY_DATA))
+    return json_codec.loads(_ENCODED_DATA["energy"])
 
 async def get_traditional_industry_data():
     """Get traditional industry data - independent from other applications"""
-    import json
-    return json.loads(json.dumps(INDUSTRY_DATA))
+    return json_codec.loads(_ENCODED_DATA["industry"])
+
+def get_traditional_outage_records() -> list[dict]:
+    """Current outage records without copying the feed; treat them as read-only.
+
+    Replacing the outage dataset swaps in a new list, so a caller that keeps
+    this reference while paging or streaming sees one consistent version.
+    """
+    return _OUTAGE_RECORDS
+
+def get_traditional_data_version() -> int:
+    """Version of the traditional datasets; bumped by every ``replace_traditional_data`` call"""
+    return _data_version
+
+def replace_traditional_data(name: str, data: dict) -> int:
+    """Replace one dataset (``outage``, ``energy`` or ``industry``) and return the new version"""
+    global _data_version, _OUTAGE_RECORDS
+    if name not in _ENCODED_DATA:
+        raise ValueError(f"Unknown traditional dataset: {name}")
+    _ENCODED_DATA[name] = json_codec.dumps(data)
+    if name == "outage":
+        _OUTAGE_RECORDS = json_codec.loads(_ENCODED_DATA["outage"])["outages"]
+    _data_version += 1
+    return _data_version
 # endregion Accessors
@@ -4,6 +4,8 @@ import threading
 import logging
 import oracledb
 from contextlib import contextmanager
+
+from database.query_results import QueryRowStream
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -38,6 +40,10 @@ class RAGDBConnection:
         self._wallet_password = os.getenv("DB_WALLET_PASSWORD")
         self.table_prefix = "edge_demo"
         self._connection_mode = os.getenv("DB_CONNECTION_MODE", "persistent").strip().lower()
+        # Bounds for LLM-generated queries, which may omit FETCH FIRST.
+        self.query_arraysize = int(os.getenv("DB_QUERY_ARRAYSIZE", "200"))
+        self.query_max_rows = int(os.getenv("DB_QUERY_MAX_ROWS", "500"))
+        self.query_call_timeout_ms = int(os.getenv("DB_QUERY_CALL_TIMEOUT_MS", "15000"))
     #endregion
 
     #region Pool + Connection
@@ -136,11 +142,32 @@ class RAGDBConnection:
     #endregion
 
     #region Query Operations
-    def execute_query(self, conn: oracledb.Connection, sql: str):
-        """Execute SQL query and return column names and rows."""
+    @contextmanager
+    def call_timeout(self, conn: oracledb.Connection, timeout_ms: int | None = None):
+        """Bound every round trip on ``conn`` while the block runs, then restore the old limit."""
+        timeout_ms = self.query_call_timeout_ms if timeout_ms is None else timeout_ms
+        previous_timeout = conn.call_timeout
+        conn.call_timeout = timeout_ms
+        try:
+            yield conn
+        finally:
+            conn.call_timeout = previous_timeout
+
+    @contextmanager
+    def stream_query(self, conn: oracledb.Connection, sql: str, max_rows: int | None = None):
+        """Execute SQL and yield a bounded row stream; the cursor closes on exit."""
+        max_rows = self.query_max_rows if max_rows is None else max_rows
         with conn.cursor() as cur:
+            # One extra row lets the first round trip tell whether the limit is hit.
+            cur.arraysize = max(1, min(self.query_arraysize, max_rows + 1))
+            cur.prefetchrows = cur.arraysize + 1
             cur.execute(sql)
-            return [d[0] for d in cur.description], cur.fetchall()
+            yield QueryRowStream(cur, max_rows)
+
+    def execute_query(self, conn: oracledb.Connection, sql: str, max_rows: int | None = None):
+        """Execute SQL query and return column names and at most ``max_rows`` rows."""
+        with self.stream_query(conn, sql, max_rows=max_rows) as row_stream:
+            return row_stream.columns, list(row_stream)
 
     def create_table(self, conn: oracledb.Connection):
         """Drop and create embedding table."""
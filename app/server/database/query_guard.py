@@ -0,0 +1,180 @@
+import os
+import re
+import uuid
+import logging
+
+import oracledb
+
+logger = logging.getLogger(__name__)
+
+GUARD_MODES = ("off", "static", "explain")
+
+_STRING_OR_COMMENT = re.compile(r"'(?:[^']|'')*'|\"[^\"]*\"|--[^\n]*|/\*.*?\*/", re.DOTALL)
+_LIMIT_CLAUSE = re.compile(r"\bFETCH\s+(FIRST|NEXT)\b|\bROWNUM\b", re.IGNORECASE)
+_FROM_CLAUSE = re.compile(
+    r"\bFROM\b(?P<sources>.*?)(?=\bWHERE\b|\bGROUP\b|\bORDER\b|\bHAVING\b|\bFETCH\b|\bOFFSET\b|\bUNION\b|\bMINUS\b|\bINTERSECT\b|$)",
+    re.IGNORECASE | re.DOTALL,
+)
+# Oracle errors that mean EXPLAIN PLAN itself is unusable here, not that the query is wrong.
+_EXPLAIN_UNAVAILABLE_ERRORS = ("ORA-02402", "ORA-02404", "ORA-01031", "PLAN_TABLE")
+# Shared by every guard: agents build their own QueryGuard per tool call, and
+# once EXPLAIN PLAN has failed for good it should not be retried on each query.
+_explain_available = True
+
+
+class QueryGuardRejection(Exception):
+    """Raised when a generated query is rejected before it reaches the database.
+
+    The message is written for the model: it is passed unchanged into the
+    NL2SQL/NL2Graph retry prompt.
+    """
+
+
+#region Static Analysis
+def _mask_literals(sql: str) -> str:
+    """Blank out string literals, quoted identifiers and comments, keeping offsets."""
+    return _STRING_OR_COMMENT.sub(lambda match: " " * len(match.group(0)), sql)
+
+
+def _top_level_text(masked_sql: str) -> str:
+    """Keep only characters outside parentheses so subqueries do not affect clause checks."""
+    depth = 0
+    chars = []
+    for char in masked_sql:
+        if char == "(":
+            depth += 1
+            chars.append(" ")
+        elif char == ")":
+            depth = max(0, depth - 1)
+            chars.append(" ")
+        else:
+            chars.append(char if depth == 0 else " ")
+    return "".join(chars)
+
+
+def static_query_issues(sql: str) -> list[str]:
+    """Return reasons a query is unsafe to run, from text alone (no database needed)."""
+    masked = _mask_literals(sql).strip().rstrip(";").strip()
+    if not masked:
+        return ["The query is empty."]
+    if ";" in masked:
+        return ["Only a single statement is allowed; remove the extra statements."]
+
+    first_word = masked.split(None, 1)[0].upper()
+    if first_word not in ("SELECT", "WITH"):
+        return [f"Only read-only SELECT queries are allowed, got {first_word}."]
+
+    issues = []
+    top_level = _top_level_text(masked)
+    if re.search(r"\bCROSS\s+JOIN\b", top_level, re.IGNORECASE):
+        issues.append("The query uses CROSS JOIN, which produces a cartesian product; join on a key instead.")
+    from_clause = _FROM_CLAUSE.search(top_level)
+    if (
+        from_clause
+        and "," in from_clause.group("sources")
+        and not re.search(r"\bWHERE\b", top_level, re.IGNORECASE)
+    ):
+        issues.append(
+            "The query lists several tables in FROM without a WHERE clause, which produces a "
+            "cartesian product; add join conditions."
+        )
+    return issues
+
+
+def has_row_limit(sql: str) -> bool:
+    return bool(_LIMIT_CLAUSE.search(_top_level_text(_mask_literals(sql))))
+#endregion
+
+
+#region Guard
+class QueryGuard:
+    """Check generated SQL/PGQL before execution.
+
+    Static checks always run. In ``explain`` mode the query is also planned
+    with EXPLAIN PLAN and rejected when the optimizer's root cost or
+    cardinality is above the configured limits, or when the plan contains a
+    large MERGE JOIN CARTESIAN. Queries without a top-level row limit are
+    rewritten with ``FETCH FIRST`` so the database stops early.
+    """
+
+    CARTESIAN_MAX_ROWS = 10_000
+
+    def __init__(self):
+        self.mode = os.getenv("DB_QUERY_GUARD_MODE", "explain").strip().lower()
+        if self.mode not in GUARD_MODES:
+            logger.warning("Unknown DB_QUERY_GUARD_MODE=%s, using static checks only.", self.mode)
+            self.mode = "static"
+        self.max_cost = float(os.getenv("DB_QUERY_MAX_COST", "1000000"))
+        self.max_cardinality = float(os.getenv("DB_QUERY_MAX_CARDINALITY", "1000000"))
+
+    def check(self, conn: oracledb.Connection | None, sql: str, max_rows: int) -> str:
+        """Return the query to execute, or raise QueryGuardRejection with the reason."""
+        sql = sql.strip().rstrip(";").strip()
+        if self.mode == "off":
+            return sql
+
+        issues = static_query_issues(sql)
+        if issues:
+            raise QueryGuardRejection("Query rejected before execution: " + " ".join(issues))
+
+        if not has_row_limit(sql):
+            # One extra row keeps the row stream's truncation check working.
+            sql = f"{sql}\nFETCH FIRST {max_rows + 1} ROWS ONLY"
+
+        if self.mode == "explain" and conn is not None and _explain_available:
+            self._check_plan(conn, sql)
+        return sql
+
+    def _check_plan(self, conn: oracledb.Connection, sql: str) -> None:
+        global _explain_available
+        statement_id = f"guard_{uuid.uuid4().hex[:20]}"
+        try:
+            with conn.cursor() as cur:
+                cur.execute(f"EXPLAIN PLAN SET STATEMENT_ID = '{statement_id}' FOR {sql}")
+                cur.execute(
+                    "SELECT id, operation, options, cost, cardinality FROM plan_table "
+                    "WHERE statement_id = :statement_id ORDER BY id",
+                    statement_id=statement_id,
+                )
+                plan_rows = cur.fetchall()
+        except oracledb.DatabaseError as exc:
+            if any(code in str(exc) for code in _EXPLAIN_UNAVAILABLE_ERRORS):
+                logger.warning("EXPLAIN PLAN unavailable, falling back to static query checks: %s", exc)
+                _explain_available = False
+                return
+            raise
+        finally:
+            # EXPLAIN PLAN inserts into plan_table; rolling back removes those rows and
+            # leaves no open transaction on the shared connection.
+            try:
+                conn.rollback()
+            except oracledb.DatabaseError as exc:
+                logger.debug("Rollback after EXPLAIN PLAN failed: %s", exc)
+
+        if not plan_rows:
+            return
+        _, _, _, root_cost, root_cardinality = plan_rows[0]
+        reasons = []
+        if root_cost is not None and root_cost > self.max_cost:
+            reasons.append(f"estimated cost {root_cost:,.0f} exceeds the limit of {self.max_cost:,.0f}")
+        if root_cardinality is not None and root_cardinality > self.max_cardinality:
+            reasons.append(
+                f"estimated {root_cardinality:,.0f} rows exceeds the limit of {self.max_cardinality:,.0f}"
+            )
+        for _, operation, options, _, cardinality in plan_rows:
+            if (
+                operation == "MERGE JOIN"
+                and options == "CARTESIAN"
+                and (cardinality or 0) > self.CARTESIAN_MAX_ROWS
+            ):
+                reasons.append(f"the plan has a cartesian join producing about {cardinality:,.0f} rows")
+                break
+
+        if reasons:
+            logger.info("Query guard rejected plan: %s", "; ".join(reasons))
+            raise QueryGuardRejection(
+                "Query rejected before execution: "
+                + "; ".join(reasons)
+                + ". Add selective filters, join conditions or aggregation."
+            )
+#endregion
@@ -0,0 +1,290 @@
+import os
+import logging
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Iterable, Iterator
+
+logger = logging.getLogger(__name__)
+
+NO_RESULTS_MESSAGE = "Query executed successfully but returned no results."
+ROW_CUT_MARKER = " [row cut to fit the output budget]"
+
+
+#region Row Stream
+class QueryRowStream:
+    """Iterate cursor rows in ``fetchmany`` batches and stop at a hard row limit.
+
+    Only one batch is held in memory at a time. ``truncated`` is set when the
+    limit is reached with rows still pending, or when a consumer calls
+    ``stop()`` (for example because a byte budget ran out).
+    """
+
+    def __init__(self, cursor, max_rows: int):
+        self.columns: list[str] = [d[0] for d in cursor.description]
+        self.max_rows = max_rows
+        self.rows_read = 0
+        self.truncated = False
+        self.truncated_reason: str | None = None
+        self._cursor = cursor
+        self._stopped = False
+
+    def stop(self, reason: str) -> None:
+        self._stopped = True
+        self.truncated = True
+        self.truncated_reason = reason
+
+    def push_back(self) -> None:
+        """Record that the last row read was left out of the output, so ``rows_read`` counts only kept rows."""
+        if self.rows_read:
+            self.rows_read -= 1
+
+    def __iter__(self) -> Iterator[tuple]:
+        while not self._stopped:
+            batch = self._cursor.fetchmany()
+            if not batch:
+                return
+            for row in batch:
+                if self._stopped:
+                    return
+                if self.rows_read >= self.max_rows:
+                    self.stop("row_limit")
+                    return
+                self.rows_read += 1
+                yield row
+#endregion
+
+
+#region Formatting
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) used for prompt budgeting."""
+    return (len(text) + 3) // 4
+
+
+def format_row_line(cols: list[str], row: Any) -> str:
+    """Render one row as a ``col: val, ...`` line."""
+    return ", ".join(f"{col}: {val}" for col, val in zip(cols, row))
+
+
+def iter_row_lines(cols: list[str], rows: Iterable[Any]) -> Iterator[str]:
+    """Yield one ``col: val, ...`` line per row without materializing the result."""
+    for row in rows:
+        yield format_row_line(cols, row)
+
+
+def format_compact_value(value: Any, float_digits: int) -> str:
+    """Render one cell for tab-separated output: rounded numbers, short dates, no tabs/newlines."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return str(value)
+    if isinstance(value, (float, Decimal)):
+        if isinstance(value, Decimal) and value == value.to_integral_value():
+            return str(int(value))
+        text = f"{value:.{float_digits}f}".rstrip("0").rstrip(".")
+        return "0" if text in ("", "-0") else text
+    if isinstance(value, datetime):
+        if value.time() == time.min:
+            return value.date().isoformat()
+        return value.isoformat(sep=" ", timespec="seconds")
+    if isinstance(value, date):
+        return value.isoformat()
+    if hasattr(value, "read"):
+        try:
+            value = value.read()
+        except Exception:
+            pass
+    if isinstance(value, bytes):
+        value = value.decode("utf-8", errors="ignore")
+    return str(value).replace("\t", " ").replace("\r", " ").replace("\n", " ")
+
+
+def to_result_value(value: Any, float_digits: int) -> Any:
+    """Normalize one cell for structured results: rounded numbers, text for everything else."""
+    if value is None or isinstance(value, bool):
+        return value
+    if isinstance(value, int):
+        return value
+    if isinstance(value, (float, Decimal)):
+        if isinstance(value, Decimal) and value == value.to_integral_value():
+            return int(value)
+        return round(float(value), float_digits)
+    return format_compact_value(value, float_digits)
+
+
+def build_tabular_result(
+    tool: str,
+    query: str,
+    columns: list[str],
+    rows: list[list[Any]],
+    truncated: bool = False,
+) -> dict[str, Any]:
+    """Columnar result published alongside the prompt text (see ``StructuredToolResult``)."""
+    return {
+        "tool": tool,
+        "kind": "table",
+        "query": query,
+        "columns": list(columns),
+        "rows": rows,
+        "row_count": len(rows),
+        "truncated": truncated,
+    }
+
+
+def format_compact_line(row: Any, float_digits: int = 2) -> str:
+    """Render one row as a tab-separated line of compact values."""
+    return "\t".join(format_compact_value(value, float_digits) for value in row)
+
+
+def iter_compact_lines(cols: list[str], rows: Iterable[Any], float_digits: int = 2) -> Iterator[str]:
+    """Yield a tab-separated header once, then one tab-separated line per row."""
+    yield "\t".join(cols)
+    for row in rows:
+        yield format_compact_line(row, float_digits)
+
+
+def truncation_marker(row_stream: QueryRowStream) -> str:
+    if row_stream.truncated_reason == "output_budget":
+        limit_text = "the output size budget was reached"
+    else:
+        limit_text = f"the {row_stream.max_rows}-row limit was reached"
+    return (
+        f"[Results truncated after {row_stream.rows_read} rows: {limit_text}. "
+        "Aggregate or filter the query to see the rest.]"
+    )
+
+
+class _NumericColumnStats:
+    __slots__ = ("count", "nulls", "minimum", "maximum", "total")
+
+    def __init__(self):
+        self.count = 0
+        self.nulls = 0
+        self.minimum = None
+        self.maximum = None
+        self.total = 0.0
+
+    def add(self, value: Any) -> bool:
+        """Track a value; return False once the column turns out to be non-numeric."""
+        if value is None:
+            self.nulls += 1
+            return True
+        if isinstance(value, bool) or not isinstance(value, (int, float, Decimal)):
+            return False
+        number = float(value)
+        self.count += 1
+        self.total += number
+        self.minimum = number if self.minimum is None else min(self.minimum, number)
+        self.maximum = number if self.maximum is None else max(self.maximum, number)
+        return True
+
+
+class QueryResultFormatter:
+    """Turn a row stream into prompt text under byte and token budgets.
+
+    The ``compact`` format (default) writes the column names once and then
+    tab-separated rows with rounded numbers, followed by an optional
+    min/max/mean summary of numeric columns. The ``rows`` format keeps the
+    original ``col: val, ...`` lines.
+    """
+
+    def __init__(self):
+        self.result_format = os.getenv("DB_QUERY_RESULT_FORMAT", "compact").strip().lower()
+        self.max_bytes = int(os.getenv("DB_QUERY_MAX_BYTES", "32000"))
+        self.max_tokens = int(os.getenv("DB_QUERY_MAX_TOKENS", "6000"))
+        self.float_digits = int(os.getenv("DB_QUERY_FLOAT_DIGITS", "2"))
+        self.column_stats = os.getenv("DB_QUERY_COLUMN_STATS", "true").strip().lower() in ("1", "true", "yes")
+
+    def format(
+        self,
+        header: str,
+        row_stream: QueryRowStream,
+        rows_sink: list[list[Any]] | None = None,
+    ) -> str:
+        """Return prompt text; rows that made it into the text are also appended to ``rows_sink``."""
+        compact = self.result_format != "rows"
+        stats: dict[int, _NumericColumnStats] = {}
+        if compact and self.column_stats:
+            stats = {index: _NumericColumnStats() for index in range(len(row_stream.columns))}
+
+        if compact:
+            # The column header line does not count as a row.
+            body_lines = ["\t".join(row_stream.columns)]
+        else:
+            body_lines = []
+
+        def accept(row: tuple) -> None:
+            # Stats and structured rows only cover rows that made it into the text.
+            for index in list(stats):
+                if not stats[index].add(row[index]):
+                    del stats[index]
+            if rows_sink is not None:
+                rows_sink.append([to_result_value(value, self.float_digits) for value in row])
+
+        used_bytes = len(header.encode("utf-8")) + sum(len(line.encode("utf-8")) + 1 for line in body_lines)
+        used_tokens = estimate_tokens(header) + sum(estimate_tokens(line) + 1 for line in body_lines)
+        row_lines = 0
+        for row in row_stream:
+            if compact:
+                line = format_compact_line(row, self.float_digits)
+            else:
+                line = format_row_line(row_stream.columns, row)
+            line_bytes = len(line.encode("utf-8")) + 1
+            line_tokens = estimate_tokens(line) + 1
+            if used_bytes + line_bytes > self.max_bytes or used_tokens + line_tokens > self.max_tokens:
+                row_stream.stop("output_budget")
+                if row_lines:
+                    row_stream.push_back()
+                    break
+                # A single row wider than the whole budget (e.g. a CLOB): keep what fits of it.
+                body_lines.append(self._cut_line(line, used_bytes, used_tokens))
+                accept(row)
+                row_lines += 1
+                break
+            body_lines.append(line)
+            accept(row)
+            row_lines += 1
+            used_bytes += line_bytes
+            used_tokens += line_tokens
+
+        if not row_lines:
+            return NO_RESULTS_MESSAGE
+
+        if compact:
+            header = f"{header.rstrip(':')} ({row_lines} rows, tab-separated):"
+            stats_line = self._format_stats(row_stream.columns, stats, row_lines)
+            if stats_line:
+                body_lines.append(stats_line)
+        if row_stream.truncated:
+            logger.info(
+                "Query output truncated: rows=%s reason=%s",
+                row_stream.rows_read,
+                row_stream.truncated_reason,
+            )
+            body_lines.append(truncation_marker(row_stream))
+        return header + "\n" + "\n".join(body_lines)
+
+    def _cut_line(self, line: str, used_bytes: int, used_tokens: int) -> str:
+        """Shorten ``line`` to the bytes and tokens left in the budget and mark it as cut."""
+        budget = min(self.max_bytes - used_bytes, (self.max_tokens - used_tokens) * 4) - 1
+        budget -= len(ROW_CUT_MARKER.encode("utf-8"))
+        kept = line.encode("utf-8")[: max(budget, 0)].decode("utf-8", errors="ignore")
+        return kept + ROW_CUT_MARKER
+
+    def _format_stats(self, cols: list[str], stats: dict[int, "_NumericColumnStats"], row_count: int) -> str:
+        if row_count < 2:
+            return ""
+        parts = []
+        for index, column_stats in stats.items():
+            if not column_stats.count:
+                continue
+            digits = self.float_digits
+            part = (
+                f"{cols[index]} min={format_compact_value(column_stats.minimum, digits)}"
+                f" max={format_compact_value(column_stats.maximum, digits)}"
+                f" mean={format_compact_value(column_stats.total / column_stats.count, digits)}"
+            )
+            if column_stats.nulls:
+                part += f" nulls={column_stats.nulls}"
+            parts.append(part)
+        return "Column stats: " + "; ".join(parts) if parts else ""
+#endregion
@@ -0,0 +1,105 @@
+import os
+import logging
+import threading
+from collections import deque
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+SPECULATION_MODES = ("off", "always", "adaptive")
+
+
+#region Speculation Policy
+class SpeculativeCachePolicy:
+    """Cost policy and win/loss stats for running cache lookup and LLM generation together.
+
+    Modes (``<NAME>_SPECULATIVE_MODE``):
+    - ``off``: look up the semantic cache first, generate only on a miss (fewest tokens).
+    - ``always``: start generation alongside every cache lookup (lowest latency).
+    - ``adaptive``: speculate only while the recent cache hit rate is below
+      ``<NAME>_SPECULATIVE_MAX_HIT_RATE``, since hits waste the speculative call.
+
+    A "win" is a miss where generation was already in flight, saving the lookup
+    time. A "loss" is a hit where the speculative generation was cancelled. A
+    "rescue" is a hit whose cached query failed and the in-flight generation
+    was used instead.
+    """
+
+    ADAPTIVE_WINDOW = 50
+    ADAPTIVE_MIN_SAMPLES = 10
+
+    def __init__(self, name: str):
+        prefix = f"{name.upper()}_SPECULATIVE"
+        self.name = name
+        self.mode = os.getenv(f"{prefix}_MODE", "adaptive").strip().lower()
+        if self.mode not in SPECULATION_MODES:
+            logger.warning("Unknown %s_MODE=%s, disabling speculation.", prefix, self.mode)
+            self.mode = "off"
+        self.confident_distance = float(os.getenv(f"{prefix}_CONFIDENT_DISTANCE", "0.15"))
+        self.max_hit_rate = float(os.getenv(f"{prefix}_MAX_HIT_RATE", "0.6"))
+        self._recent_hits: deque[bool] = deque(maxlen=self.ADAPTIVE_WINDOW)
+        self._lock = threading.Lock()
+        self._stats: dict[str, float] = {
+            "lookups": 0,
+            "hits": 0,
+            "speculated": 0,
+            "wins": 0,
+            "losses": 0,
+            "rescues": 0,
+            "saved_ms": 0.0,
+        }
+
+    def recent_hit_rate(self) -> float | None:
+        with self._lock:
+            if len(self._recent_hits) < self.ADAPTIVE_MIN_SAMPLES:
+                return None
+            return sum(self._recent_hits) / len(self._recent_hits)
+
+    def should_speculate(self) -> bool:
+        if self.mode == "off":
+            return False
+        if self.mode == "always":
+            return True
+        hit_rate = self.recent_hit_rate()
+        return hit_rate is None or hit_rate < self.max_hit_rate
+
+    def is_confident_hit(self, distance: float) -> bool:
+        return distance <= self.confident_distance
+
+    def record_lookup(self, hit: bool, speculated: bool) -> None:
+        with self._lock:
+            self._recent_hits.append(hit)
+            self._stats["lookups"] += 1
+            self._stats["hits"] += int(hit)
+            self._stats["speculated"] += int(speculated)
+
+    def record_outcome(self, outcome: str, lookup_ms: float = 0.0) -> None:
+        key = {"win": "wins", "loss": "losses", "rescue": "rescues"}[outcome]
+        with self._lock:
+            self._stats[key] += 1
+            if outcome in ("win", "rescue"):
+                self._stats["saved_ms"] += lookup_ms
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["saved_ms"] = round(stats["saved_ms"], 1)
+        return {
+            "mode": self.mode,
+            "confident_distance": self.confident_distance,
+            "recent_hit_rate": self.recent_hit_rate(),
+            **stats,
+        }
+#endregion
+
+
+NL2SQL_SPECULATION = SpeculativeCachePolicy("nl2sql")
+NL2GRAPH_SPECULATION = SpeculativeCachePolicy("nl2graph")
+
+
+def get_speculation_summary() -> dict[str, Any]:
+    """Read-only view of speculative cache stats for both query agents."""
+    return {
+        "nl2sql": NL2SQL_SPECULATION.snapshot(),
+        "nl2graph": NL2GRAPH_SPECULATION.snapshot(),
+    }
@@ -8,6 +8,7 @@ from dynamic_app.back_agents_graph.nl2graph_agent import call_graphDB
 from chat_app.nl2sql_agent import call_SQL_DB
 from core.gen_ai_provider import GenAIProvider
 from core.dynamic_app.dynamic_struct import DynamicGraphState
+from core.dynamic_app.tool_results import collect_turn_tool_results
 from core.dynamic_app.prompts import BACKEND_ORCHESTRATOR_INSTRUCTIONS
 
 logger = logging.getLogger(__name__)
@@ -26,7 +27,11 @@ class BackendOrchestratorAgent:
 
     async def __call__(self, state: DynamicGraphState):
         """Orchestrate data collection and return consolidated results."""
-        return await self.agent.ainvoke(state)
+        result = await self.agent.ainvoke(state)
+        # Publish this turn's columnar tool artifacts so UI nodes do not re-parse prose.
+        tool_results = collect_turn_tool_results(result.get("messages") or [])
+        logger.info("Backend orchestrator published %s structured tool results", len(tool_results))
+        return {**result, "tool_results": tool_results}
 
     def _build_agent(self):
         """Build the agent with worker tools."""
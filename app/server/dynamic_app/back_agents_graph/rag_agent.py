@@ -1,6 +1,8 @@
 import array
+import asyncio
 from langchain.tools import tool
 
+from core.admission import stage_limit
 from core.gen_ai_provider import GenAIEmbedProvider
 from database.connections import RAGDBConnection
 
@@ -20,11 +22,41 @@ def build_context_snippet(results: list[dict]) -> str:
         snippet = r["text"].replace("\n", " ")
         context_parts.append(f"[{i}] (Source: {r['source']}) {snippet}")
     return "\n\n".join(context_parts)
+
+
+def build_documents_result(query: str, results: list[dict]) -> dict:
+    """Columnar view of retrieved chunks, published as a ``documents`` tool result."""
+    return {
+        "tool": "semantic_search",
+        "kind": "documents",
+        "query": query,
+        "columns": ["source", "distance", "text"],
+        "rows": [[r["source"], round(float(r["distance"]), 4), r["text"]] for r in results],
+        "row_count": len(results),
+        "truncated": False,
+    }
+
+
+def _search_embeddings(db_conn: RAGDBConnection, query_vec: array.array, top_k: int) -> list[dict]:
+    """Nearest chunks to ``query_vec`` by cosine distance (blocking; run in a worker thread)."""
+    with db_conn.get_connection() as connection:
+        cursor = connection.cursor()
+
+        cursor.execute(f"""
+            SELECT text, vector_distance(vec, :1, COSINE) AS distance, source
+            FROM {db_conn.table_prefix}_embedding
+            ORDER BY distance
+            FETCH FIRST {top_k} ROWS ONLY
+        """, [query_vec])
+
+        rows = cursor.fetchall()
+        cursor.close()
+    return [{"text": r[0], "distance": r[1], "source": r[2]} for r in rows]
 # endregion Helpers
 
 # region Tool
-@tool()
-async def semantic_search(query: str, top_k: int = 3) -> str:
+@tool(response_format="content_and_artifact")
+async def semantic_search(query: str, top_k: int = 3) -> tuple[str, dict | None]:
     """Perform cosine-similarity search over available document chunks:
     [epa_actions_for_outages (US), fema_outage_flyer (US), general_disaster_manual (MEX)]
     """
@@ -33,24 +65,14 @@ async def semantic_search(query: str, top_k: int = 3) -> str:
     db_conn = RAGDBConnection()
     
     try:
-        query_response = embed_provider.embed_client.embed_query(query)
+        async with stage_limit("embedding"):
+            query_response = await asyncio.to_thread(embed_provider.embed_client.embed_query, query)
         query_vec = array.array("f", query_response)
+
+        async with stage_limit("db"):
+            results = await asyncio.to_thread(_search_embeddings, db_conn, query_vec, top_k)
         
-        with db_conn.get_connection() as connection:
-            cursor = connection.cursor()
-
-            cursor.execute(f"""
-                SELECT text, vector_distance(vec, :1, COSINE) AS distance, source
-                FROM {db_conn.table_prefix}_embedding
-                ORDER BY distance
-                FETCH FIRST {top_k} ROWS ONLY
-            """, [query_vec])
-            
-            rows = cursor.fetchall()
-            results = [{"text": r[0], "distance": r[1], "source": r[2]} for r in rows]
-            cursor.close()
-        
-        return build_context_snippet(results)
+        return build_context_snippet(results), build_documents_result(query, results)
     except Exception as e:
-        return f"Error performing semantic search: {str(e)}"
+        return f"Error performing semantic search: {str(e)}", None
 # endregion Tool
@@ -1,10 +1,11 @@
+import asyncio
 import logging
 import re
-import json
 import os
+import time
 import uuid
 
-from collections.abc import AsyncIterable
+from collections.abc import AsyncIterable, AsyncIterator
 from typing import Any
 from langgraph.graph import StateGraph, START, END
 from langgraph.checkpoint.memory import InMemorySaver
@@ -14,10 +15,17 @@ from langfuse import Langfuse
 
 from dynamic_app.ui_agents_graph.ui_orchestrator_agent import SuggestionsReponseLLM
 from dynamic_app.ui_agents_graph.ui_layout_planner import UIParallelLayoutPlannerNode
-from dynamic_app.ui_agents_graph.ui_parallel_skeleton_agent import UIParallelSkeletonNode
+from dynamic_app.ui_agents_graph.ui_parallel_skeleton_agent import (
+    UIEarlySkeletonNode,
+    UIParallelSkeletonNode,
+)
 from dynamic_app.ui_agents_graph.ui_parallel_widget_worker_agent import UIParallelWidgetSlotNode
 from dynamic_app.back_agents_graph.backend_orchestrator_agent import BackendOrchestratorAgent
+from core import json_codec
 from core.dynamic_app.dynamic_struct import DynamicGraphState
+from core.dynamic_app.request_metrics import DynamicRequestMetrics
+from core.dynamic_app.stream_completion import EARLY_COMPLETION_MODES, StreamCompletionTracker
+from core.dynamic_app.surface_tracker import SurfaceUpdateTracker
 from core.langfuse_tracing import (
     LangfuseTracingProvider,
     extract_total_tokens_from_message,
@@ -64,6 +72,12 @@ class DynamicGraph:
     SUPPORTED_CONTENT_TYPES = ["text", "text/plain", "text/event-stream", "application/json+a2ui"]
     CONTENT_TRUNCATION_LENGTH = 50
     MAX_PARALLEL_WIDGETS = 4
+    # Paint a provisional skeleton from the query while backend retrieval runs.
+    EARLY_SKELETON_ENABLED = os.getenv("DYNAMIC_EARLY_SKELETON_ENABLED", "true").strip().lower() == "true"
+    # Stream only new/changed components and data keys instead of the full surface.
+    DELTA_SURFACE_UPDATES = os.getenv("DYNAMIC_DELTA_SURFACE_UPDATES", "true").strip().lower() == "true"
+    # Send the final payload once all planned widgets and suggestions are out (off | drain | cancel).
+    EARLY_COMPLETION_MODE = os.getenv("DYNAMIC_EARLY_COMPLETION_MODE", "drain").strip().lower()
 
     def __init__(
         self,
@@ -75,12 +89,18 @@ class DynamicGraph:
         self._backend_orchestrator = BackendOrchestratorAgent()
         self._suggestions_llm = SuggestionsReponseLLM()
         self._parallel_ui_layout_planner = UIParallelLayoutPlannerNode()
-        self._parallel_ui_skeleton = UIParallelSkeletonNode()
+        self._parallel_ui_skeleton = UIParallelSkeletonNode(reuse_early_ids=self.EARLY_SKELETON_ENABLED)
+        self._parallel_ui_early_skeleton = UIEarlySkeletonNode() if self.EARLY_SKELETON_ENABLED else None
         self._parallel_ui_widget_slots = {
             index: UIParallelWidgetSlotNode(index)
             for index in range(1, self.MAX_PARALLEL_WIDGETS + 1)
         }
         self._out_query = SUGGESTION_QUERY
+        self._fallback_suggestions_model = None
+        self._background_tasks: set[asyncio.Task] = set()
+        if self.EARLY_COMPLETION_MODE not in EARLY_COMPLETION_MODES:
+            logger.warning("Unknown DYNAMIC_EARLY_COMPLETION_MODE=%s, using drain.", self.EARLY_COMPLETION_MODE)
+            self.EARLY_COMPLETION_MODE = "drain"
         self.langfuse_tracing_provider = LangfuseTracingProvider(langfuse_client=langfuse_client)
 
     #region Graph Nodes
@@ -138,10 +158,12 @@ class DynamicGraph:
         known_keys = {
             "messages",
             "suggestions",
+            "tool_results",
             "parallel_data_context",
             "parallel_widget_plan",
             "parallel_execution_tasks",
             "parallel_shell_output",
+            "parallel_early_skeleton_fragment",
             "parallel_skeleton_fragment",
             "parallel_widget_fragment_1",
             "parallel_widget_fragment_2",
@@ -232,6 +254,153 @@ class DynamicGraph:
         return timeline_message, model_token_count, detailed_message
     #endregion
 
+    #region Suggestions
+    def _get_fallback_suggestions_model(self):
+        """Build the fallback suggestions model once and reuse it across requests."""
+        if self._fallback_suggestions_model is None:
+            self._fallback_suggestions_model = SuggestionModel().build_suggestion_model()
+        return self._fallback_suggestions_model
+
+    async def _resolve_suggestions(
+        self,
+        graph_suggestions: str,
+        context: str,
+        metrics: DynamicRequestMetrics,
+    ) -> str:
+        """Reuse the graph `suggestions` node output; only call the LLM when it is missing."""
+        if isinstance(graph_suggestions, str) and graph_suggestions.strip():
+            metrics.increment("suggestions_reused")
+            return graph_suggestions
+
+        fallback_started_at = time.perf_counter()
+        raw_suggestions = None
+        try:
+            raw_suggestions = await self._get_fallback_suggestions_model().ainvoke(
+                self._out_query
+                + f"\n\nContext for question generation:\n{context}"
+            )
+        except Exception as exc:
+            logger.warning("Fallback suggestion generation failed: %s", exc)
+        metrics.record_duration("suggestions_fallback", fallback_started_at)
+        metrics.increment("suggestions_fallback_calls")
+        if not raw_suggestions:
+            raw_suggestions = SuggestedQuestions(suggested_questions=["Tell me more details about first data", "Make a summary of data given"])
+        return raw_suggestions.model_dump_json()
+    #endregion
+
+    #region Widget Metrics
+    def _record_widget_slot_metrics(
+        self,
+        metrics: DynamicRequestMetrics,
+        slot_index: int,
+        widget_fragment: dict[str, Any],
+    ) -> None:
+        """Slot latency plus per-attempt LLM latencies, hedges and budget fallbacks."""
+        if widget_fragment.get("latency_ms") is not None:
+            metrics.stage_timings_ms[f"widget_slot_{slot_index}"] = widget_fragment["latency_ms"]
+        for attempt_index, attempt in enumerate(widget_fragment.get("attempts") or [], start=1):
+            metrics.stage_timings_ms[f"widget_slot_{slot_index}_attempt_{attempt_index}"] = attempt.get("latency_ms")
+            metrics.increment("widget_attempts")
+            if str(attempt.get("kind", "")).endswith("_hedge"):
+                metrics.increment("widget_hedges")
+        if widget_fragment.get("generation_note") == "latency_budget_fallback":
+            metrics.increment("widget_budget_fallbacks")
+    #endregion
+
+    #region Early Skeleton
+    async def _merge_early_skeleton(self, graph_stream: Any, query: str) -> AsyncIterator[Any]:
+        """Yield the graph stream chunks plus one chunk carrying the early skeleton fragment.
+
+        The early shell runs as a task beside the graph instead of as a graph
+        node, so it never holds back a superstep. It is cancelled once the
+        data-backed skeleton arrives. The graph stream is consumed by a single
+        pump task so it always runs in one context.
+        """
+        chunks: asyncio.Queue[tuple[str, Any]] = asyncio.Queue()
+
+        async def pump_graph() -> None:
+            try:
+                async for chunk in graph_stream:
+                    chunks.put_nowait(("chunk", chunk))
+            except Exception as exc:
+                chunks.put_nowait(("error", exc))
+            finally:
+                chunks.put_nowait(("end", None))
+
+        async def paint_early_skeleton() -> None:
+            try:
+                fragment = await self._parallel_ui_early_skeleton(query)
+            except Exception as exc:
+                logger.warning("Early skeleton failed: %s", exc)
+                return
+            chunks.put_nowait(("chunk", (("parallel_ui_early_skeleton",), {"parallel_early_skeleton_fragment": fragment})))
+
+        graph_task = asyncio.create_task(pump_graph())
+        early_task = asyncio.create_task(paint_early_skeleton())
+        try:
+            while True:
+                kind, item = await chunks.get()
+                if kind == "end":
+                    return
+                if kind == "error":
+                    raise item
+                if not early_task.done() and "parallel_skeleton_fragment" in self._extract_chunk_state(item):
+                    early_task.cancel()
+                yield item
+        finally:
+            for task in (graph_task, early_task):
+                task.cancel()
+            await asyncio.gather(graph_task, early_task, return_exceptions=True)
+            await graph_stream.aclose()
+
+    def _skeleton_begin_message(
+        self,
+        skeleton_fragment: dict[str, Any],
+        early_begin_message: dict[str, Any] | None,
+    ) -> dict[str, Any] | None:
+        """Return the data-backed skeleton's beginRendering, or None when the early one already matches it.
+
+        The surfaceUpdate that follows reconciles the components, but only a new
+        beginRendering carries the real shell's styles, so it is re-sent whenever
+        they differ from the provisional shell's.
+        """
+        begin_message = skeleton_fragment.get("begin_rendering")
+        if isinstance(early_begin_message, dict) and begin_message == early_begin_message:
+            return None
+        return begin_message
+    #endregion
+
+    #region Leftover Graph Work
+    def _finish_graph_stream(self, graph_stream: Any, request_id: str) -> None:
+        """Drain or close the graph stream after the client already got its final payload.
+
+        Draining keeps the checkpointer state (next-turn memory) identical to a
+        full run; cancelling saves the remaining steps.
+        """
+
+        async def finish() -> None:
+            started_at = time.perf_counter()
+            try:
+                if self.EARLY_COMPLETION_MODE == "cancel":
+                    await graph_stream.aclose()
+                    return
+                async for _ in graph_stream:
+                    pass
+            except Exception as exc:
+                logger.warning("Leftover graph work failed | request_id=%s error=%s", request_id, exc)
+            finally:
+                logger.debug(
+                    "Leftover graph work finished | request_id=%s mode=%s duration_ms=%.1f",
+                    request_id,
+                    self.EARLY_COMPLETION_MODE,
+                    (time.perf_counter() - started_at) * 1000.0,
+                )
+
+        task = asyncio.create_task(finish())
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+    #endregion
+
     #region Execution
     async def call_dynamic_ui_graph(self, query, session_id) -> AsyncIterable[dict[str, Any]]:
         current_message = {"messages":[HumanMessage(query)]}
@@ -247,17 +416,27 @@ class DynamicGraph:
         seen_message_keys: set[str] = set()
         emitted_human_message = False
         skeleton_emitted = False
+        early_skeleton_emitted = False
+        early_begin_message: dict[str, Any] | None = None
         emitted_widget_slots: set[int] = set()
         pending_widget_fragments: list[dict[str, Any]] = []
-        surface_state: dict[str, dict[str, Any]] = {}
-        ordered_component_ids: list[str] = []
-        data_state: dict[str, dict[str, Any]] = {}
         surface_id = "dashboard"
+        surface_tracker = SurfaceUpdateTracker(surface_id, delta_mode=self.DELTA_SURFACE_UPDATES)
         assistant_summary = ""
         final_payload: dict[str, Any] | None = None
+        metrics = DynamicRequestMetrics(request_id)
+        completion = StreamCompletionTracker()
+        completed_early = False
+        graph_stream = None
         langfuse_client = self.langfuse_client or self.langfuse_tracing_provider.get_current_client()
         session_token = self.langfuse_tracing_provider.set_current_session_id(stable_session_id)
         client_token = self.langfuse_tracing_provider.set_current_client(langfuse_client)
+        trace_request = self.langfuse_tracing_provider.start_trace_request(
+            "DynamicGraph -> Stream",
+            langfuse_client,
+            metadata={"session_id": stable_session_id, "request_id": request_id},
+        )
+        trace_error: Exception | None = None
         try:
             config:RunnableConfig = self.langfuse_tracing_provider.build_runnable_config(
                 run_id=request_id,
@@ -267,17 +446,24 @@ class DynamicGraph:
                 tags=["main_dynamic_app"],
                 extra_metadata={"request_id": request_id},
             )
-            async for chunk in self._dynamic_ui_graph.astream(
+            graph_stream = self._dynamic_ui_graph.astream(
                 input=current_message,
                 config=config,
                 stream_mode='updates',
                 subgraphs=True
-            ):
+            )
+            if self._parallel_ui_early_skeleton is not None:
+                graph_stream = self._merge_early_skeleton(graph_stream, query)
+            async for chunk in graph_stream:
                 chunk_state = self._extract_chunk_state(chunk)
                 node_name = self._extract_node_name_from_stream_chunk(chunk)
 
                 if 'suggestions' in chunk_state:
                     suggestions = chunk_state['suggestions']
+                    completion.mark_suggestions_ready()
+                    metrics.mark("suggestions_ready")
+                if isinstance(chunk_state.get("parallel_execution_tasks"), list):
+                    completion.plan(chunk_state["parallel_execution_tasks"])
 
                 messages = chunk_state.get("messages", [])
                 new_messages: list[AnyMessage] = []
@@ -324,18 +510,39 @@ class DynamicGraph:
 
                     yield updates
 
+                early_skeleton_fragment = chunk_state.get("parallel_early_skeleton_fragment")
+                if (
+                    isinstance(early_skeleton_fragment, dict)
+                    and not early_skeleton_emitted
+                    and not skeleton_emitted
+                ):
+                    begin_message = early_skeleton_fragment.get("begin_rendering")
+                    initial_surface_update = early_skeleton_fragment.get("initial_surface_update")
+                    surface_id = str(early_skeleton_fragment.get("surface_id") or surface_id)
+                    ui_messages = [
+                        message
+                        for message in (begin_message, initial_surface_update)
+                        if isinstance(message, dict)
+                    ]
+                    if ui_messages:
+                        early_skeleton_emitted = True
+                        early_begin_message = begin_message if isinstance(begin_message, dict) else None
+                        metrics.mark("first_paint")
+                        yield {
+                            "is_task_complete": False,
+                            "updates": "Preparing layout",
+                            "detailed_updates": "Early skeleton emitted while data is retrieved.",
+                            "content": "",
+                            "ui_messages": ui_messages,
+                        }
+
                 skeleton_fragment = chunk_state.get("parallel_skeleton_fragment")
                 if isinstance(skeleton_fragment, dict) and not skeleton_emitted:
-                    begin_message = skeleton_fragment.get("begin_rendering")
+                    begin_message = self._skeleton_begin_message(skeleton_fragment, early_begin_message)
                     initial_surface_update = skeleton_fragment.get("initial_surface_update")
                     surface_id = str(skeleton_fragment.get("surface_id") or surface_id)
                     assistant_summary = str(skeleton_fragment.get("assistant_text") or "")
-                    ordered_component_ids = list(skeleton_fragment.get("ordered_component_ids") or [])
-                    surface_state = {
-                        str(component.get("id")): component
-                        for component in list(skeleton_fragment.get("components") or [])
-                        if isinstance(component, dict) and component.get("id")
-                    }
+                    metrics.mark("skeleton")
 
                     if isinstance(begin_message, dict):
                         yield {
@@ -354,51 +561,22 @@ class DynamicGraph:
                             "ui_messages": [initial_surface_update],
                         }
                     skeleton_emitted = True
+                    completion.mark_skeleton_emitted()
+                    metrics.mark("first_paint")
+
+                    surface_tracker.load_skeleton(
+                        surface_id, list(skeleton_fragment.get("components") or [])
+                    )
 
                     while pending_widget_fragments:
                         widget_fragment = pending_widget_fragments.pop(0)
-                        widget_components = list(widget_fragment.get("components") or [])
-                        for component in widget_components:
-                            if not isinstance(component, dict):
-                                continue
-                            component_id = str(component.get("id") or "")
-                            if not component_id:
-                                continue
-                            if component_id not in ordered_component_ids:
-                                ordered_component_ids.append(component_id)
-                            surface_state[component_id] = component
-
-                        full_surface_update = {
-                            "surfaceUpdate": {
-                                "surfaceId": surface_id,
-                                "components": [
-                                    surface_state[component_id]
-                                    for component_id in ordered_component_ids
-                                    if component_id in surface_state
-                                ],
-                            }
-                        }
-                        ui_messages: list[dict[str, Any]] = [full_surface_update]
-                        widget_data_contents = list(widget_fragment.get("data_contents") or [])
-                        if widget_data_contents:
-                            for data_entry in widget_data_contents:
-                                if isinstance(data_entry, dict) and data_entry.get("key"):
-                                    data_state[str(data_entry["key"])] = data_entry
-                            ui_messages.append(
-                                {
-                                    "dataModelUpdate": {
-                                        "surfaceId": surface_id,
-                                        "path": "/",
-                                        "contents": list(data_state.values()),
-                                    }
-                                }
-                            )
+                        completion.mark_slot_emitted(int(widget_fragment.get("slot_index", 0)))
                         yield {
                             "is_task_complete": False,
                             "updates": str(widget_fragment.get("status_text") or "Widget ready"),
                             "detailed_updates": "Buffered widget fragment emitted.",
                             "content": "",
-                            "ui_messages": ui_messages,
+                            "ui_messages": surface_tracker.apply_widget_fragment(widget_fragment),
                         }
 
                 for slot_index in range(1, self.MAX_PARALLEL_WIDGETS + 1):
@@ -412,6 +590,7 @@ class DynamicGraph:
 
                     if widget_fragment.get("skipped"):
                         continue
+                    self._record_widget_slot_metrics(metrics, slot_index, widget_fragment)
                     if widget_fragment.get("error"):
                         logger.warning(
                             "Widget slot %s reported error: %s",
@@ -422,50 +601,22 @@ class DynamicGraph:
                         pending_widget_fragments.append(widget_fragment)
                         continue
 
-                    widget_components = list(widget_fragment.get("components") or [])
-                    for component in widget_components:
-                        if not isinstance(component, dict):
-                            continue
-                        component_id = str(component.get("id") or "")
-                        if not component_id:
-                            continue
-                        if component_id not in ordered_component_ids:
-                            ordered_component_ids.append(component_id)
-                        surface_state[component_id] = component
-
-                    full_surface_update = {
-                        "surfaceUpdate": {
-                            "surfaceId": surface_id,
-                            "components": [
-                                surface_state[component_id]
-                                for component_id in ordered_component_ids
-                                if component_id in surface_state
-                            ],
-                        }
-                    }
-                    ui_messages: list[dict[str, Any]] = [full_surface_update]
-                    widget_data_contents = list(widget_fragment.get("data_contents") or [])
-                    if widget_data_contents:
-                        for data_entry in widget_data_contents:
-                            if isinstance(data_entry, dict) and data_entry.get("key"):
-                                data_state[str(data_entry["key"])] = data_entry
-                        ui_messages.append(
-                            {
-                                "dataModelUpdate": {
-                                    "surfaceId": surface_id,
-                                    "path": "/",
-                                    "contents": list(data_state.values()),
-                                }
-                            }
-                        )
+                    completion.mark_slot_emitted(slot_index)
                     yield {
                         "is_task_complete": False,
                         "updates": str(widget_fragment.get("status_text") or "Widget ready"),
                         "detailed_updates": "Widget fragment emitted.",
                         "content": "",
-                        "ui_messages": ui_messages,
+                        "ui_messages": surface_tracker.apply_widget_fragment(widget_fragment),
                     }
 
+                if self.EARLY_COMPLETION_MODE != "off" and completion.is_complete:
+                    completed_early = True
+                    metrics.increment("early_completion")
+                    self._finish_graph_stream(graph_stream, request_id)
+                    break
+
+            metrics.mark("completion_ready" if completed_early else "graph_complete")
             selected_final_response = final_response_content or assistant_summary or "Interface generated successfully."
             logger.debug(
                 "Final response selected | ai_messages=%s selected_len=%s",
@@ -475,26 +626,33 @@ class DynamicGraph:
 
             final_content = selected_final_response or "No response generated"
 
-            # Fallback suggestion generation ensures response consistency.
-            fall_back_suggestions_model = SuggestionModel().build_suggestion_model()
-            raw_suggestions = await fall_back_suggestions_model.ainvoke(
-                self._out_query
-                + f"\n\nContext for question generation:\n{selected_final_response}"
-            )
-            if not raw_suggestions:
-                raw_suggestions = SuggestedQuestions(suggested_questions=["Tell me more details about first data", "Make a summary of data given"])
-            suggestions = raw_suggestions.model_dump_json()
+            suggestions = await self._resolve_suggestions(suggestions, selected_final_response, metrics)
 
+            metrics.mark("final_payload")
+            metrics.counters["surface_bytes_full"] = surface_tracker.bytes_full
+            metrics.counters["surface_bytes_sent"] = surface_tracker.bytes_sent
+            metrics.counters["surface_bytes_saved"] = surface_tracker.bytes_saved
+            if trace_request is not None:
+                metrics.counters["tracing_overhead_ms"] = trace_request.overhead_ms
+            metrics.log_summary()
             final_payload = {
                 "is_task_complete": True,
                 "content": final_content,
                 "detailed_updates": detailed_message,
                 "token_count": str(model_token_count),
                 "suggestions": suggestions,
-                "sources": json.dumps(source_documents),
+                "sources": json_codec.dumps_text(source_documents),
                 "ui_messages": [],
+                "metrics": metrics.as_dict(),
             }
+        except Exception as exc:
+            trace_error = exc
+            raise
         finally:
+            if graph_stream is not None and not completed_early:
+                # Closing on cancellation also cancels the node tasks still running.
+                await graph_stream.aclose()
+            self.langfuse_tracing_provider.finish_trace_request(trace_request, trace_error)
             self.langfuse_tracing_provider.reset_current_client(client_token)
             self.langfuse_tracing_provider.reset_current_session_id(session_token)
 
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
+from contextlib import aclosing
 
 from langfuse import Langfuse
 
@@ -15,11 +15,12 @@ from a2a.types import (
     Task,
     TaskState,
     TextPart,
-    UnsupportedOperationError,
 )
 from a2a.utils import new_agent_parts_message, new_task
-from a2a.utils.errors import ServerError
-from a2ui.a2a import create_a2ui_part, try_activate_a2ui_extension
+from a2ui.a2a import try_activate_a2ui_extension
+from core.a2ui_parts import A2UIPartDeduper
+from core.status_batching import StatusUpdateBatcher
+from core.task_cancellation import RunningTaskRegistry
 from dynamic_app.dynamic_agents_graph import DynamicGraph
 
 logger = logging.getLogger(__name__)
@@ -37,6 +38,7 @@ class DynamicGraphExecutor(AgentExecutor):
         )
         self._graph_ready = False
         self._graph_build_lock = asyncio.Lock()
+        self.running_tasks = RunningTaskRegistry("dynamic_graph")
         logger.info("Dynamic graph executor initialized.")
 
     async def _ensure_graph_ready(self) -> None:
@@ -55,7 +57,7 @@ class DynamicGraphExecutor(AgentExecutor):
         query = ""
         ui_event_part: dict | None = None
         session_id: str | None = None
-        emitted_a2ui_hashes: set[str] = set()
+        a2ui_deduper = A2UIPartDeduper()
 
         use_ui = try_activate_a2ui_extension(context)
         logger.info("Dynamic graph execution started | a2ui_extension=%s", use_ui)
@@ -96,43 +98,69 @@ class DynamicGraphExecutor(AgentExecutor):
         memory_id = session_id or task.context_id
         logger.info("Processing request | memory_id=%s", memory_id)
 
-        async for item in self.dynamic_graph.call_dynamic_ui_graph(query, memory_id):
-            if not item["is_task_complete"]:
-                update_parts: list[Part] = [
-                    Part(root=TextPart(text=str(item.get("updates") or ""))),
-                    Part(root=TextPart(text=str(item.get("detailed_updates") or ""))),
-                ]
-                for ui_message in list(item.get("ui_messages") or []):
-                    serialized = json.dumps(ui_message, sort_keys=True, ensure_ascii=False)
-                    if serialized in emitted_a2ui_hashes:
+        completed = await self.running_tasks.run(
+            task.id,
+            self._stream_response(query, memory_id, task, updater, a2ui_deduper),
+        )
+        if not completed:
+            logger.info("Request cancelled | memory_id=%s task_id=%s", memory_id, task.id)
+
+    async def _stream_response(
+        self,
+        query: str,
+        memory_id: str,
+        task: Task,
+        updater: TaskUpdater,
+        a2ui_deduper: A2UIPartDeduper,
+    ) -> None:
+        batcher = StatusUpdateBatcher(updater, task.context_id, task.id)
+        try:
+            # aclosing() makes cancellation between chunks also close the graph stream.
+            async with aclosing(self.dynamic_graph.call_dynamic_ui_graph(query, memory_id)) as response_stream:
+                async for item in response_stream:
+                    if not item["is_task_complete"]:
+                        text_parts: list[Part] = [
+                            Part(root=TextPart(text=str(item.get("updates") or ""))),
+                            Part(root=TextPart(text=str(item.get("detailed_updates") or ""))),
+                        ]
+                        ui_parts: list[Part] = []
+                        a2ui_deduper.extend_parts(ui_parts, list(item.get("ui_messages") or []))
+                        await batcher.add(text_parts, ui_parts)
                         continue
-                    emitted_a2ui_hashes.add(serialized)
-                    update_parts.append(create_a2ui_part(ui_message))
-
-                await updater.update_status(
-                    TaskState.working,
-                    new_agent_parts_message(update_parts, task.context_id, task.id),
-                )
-                continue
-
-            final_parts: list[Part] = []
-            content = str(item.get("content") or "").strip()
-            if content:
-                final_parts.append(Part(root=TextPart(text=content)))
-
-            final_parts.append(Part(root=TextPart(text=str(item.get("detailed_updates") or ""))))
-            final_parts.append(Part(root=TextPart(text=str(item.get("token_count") or ""))))
-            final_parts.append(Part(root=TextPart(text=str(item.get("suggestions") or ""))))
-            final_parts.append(Part(root=TextPart(text=str(item.get("sources") or ""))))
-
-            await updater.update_status(
-                TaskState.completed,
-                new_agent_parts_message(final_parts, task.context_id, task.id),
-                final=True,
+
+                    await batcher.flush()
+                    final_parts: list[Part] = []
+                    content = str(item.get("content") or "").strip()
+                    if content:
+                        final_parts.append(Part(root=TextPart(text=content)))
+
+                    final_parts.append(Part(root=TextPart(text=str(item.get("detailed_updates") or ""))))
+                    final_parts.append(Part(root=TextPart(text=str(item.get("token_count") or ""))))
+                    final_parts.append(Part(root=TextPart(text=str(item.get("suggestions") or ""))))
+                    final_parts.append(Part(root=TextPart(text=str(item.get("sources") or ""))))
+
+                    await updater.update_status(
+                        TaskState.completed,
+                        new_agent_parts_message(final_parts, task.context_id, task.id),
+                        final=True,
+                    )
+                    logger.info("Request completed | memory_id=%s", memory_id)
+                    break
+        finally:
+            await batcher.aclose()
+            logger.info(
+                "Status updates sent | memory_id=%s items=%d events=%d",
+                memory_id,
+                batcher.items,
+                batcher.events,
             )
-            logger.info("Request completed | memory_id=%s", memory_id)
-            break
 
     async def cancel(self, request: RequestContext, event_queue: EventQueue) -> Task | None:
-        raise ServerError(error=UnsupportedOperationError())
+        """Stop the running graph for this task (LLM calls, widget slots) and mark it canceled."""
+        task_id = request.task_id or (request.current_task.id if request.current_task else "")
+        context_id = request.context_id or (request.current_task.context_id if request.current_task else "")
+        if not await self.running_tasks.cancel(task_id):
+            logger.info("Cancel requested for a task that is not running here | task_id=%s", task_id)
+        await TaskUpdater(event_queue, task_id, context_id).cancel()
+        return None
 
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+from typing import Any
 
 from langchain.messages import HumanMessage
 
@@ -12,15 +13,56 @@ from core.dynamic_app.parallel_ui_shared import (
     extract_structured_result,
     is_no_data_or_out_of_domain,
 )
-from core.dynamic_app.prompts import UI_PARALLEL_SHELL_INSTRUCTIONS
+from core.dynamic_app.prompts import (
+    UI_PARALLEL_EARLY_SHELL_INSTRUCTIONS,
+    UI_PARALLEL_SHELL_INSTRUCTIONS,
+)
 from core.dynamic_app.schemas.structured_outputs import A2UIShellOutput, ParallelWidgetPlan
 from dynamic_app.ui_agents_graph.ui_parallel_fragment_merge_agent import (
     UIParallelFragmentMergeAgent,
 )
 
+EARLY_SKELETON_MAX_SECTIONS = 3
+# Fixed protocol ids shared by the early and data-backed skeletons, so the
+# data-backed surfaceUpdate replaces the placeholders by id.
+EARLY_SKELETON_SURFACE_ID = "dashboard"
+EARLY_SKELETON_ROOT_ID = "root-layout"
 logger = logging.getLogger(__name__)
 
 
+def build_skeleton_fragment(
+    shell_output: A2UIShellOutput,
+    shell_components: list[dict[str, Any]],
+    assistant_text: str,
+) -> dict[str, Any]:
+    """Wrap shell components into the beginRendering + surfaceUpdate fragment shape."""
+    surface_id = shell_output.surface_id or "dashboard"
+    root_id = shell_output.root_id or "root-layout"
+    return {
+        "surface_id": surface_id,
+        "root_id": root_id,
+        "assistant_text": assistant_text or "",
+        "ordered_component_ids": [component["id"] for component in shell_components],
+        "components": shell_components,
+        "begin_rendering": {
+            "beginRendering": {
+                "surfaceId": surface_id,
+                "root": root_id,
+                "styles": {
+                    "font": shell_output.style_font or "Arial",
+                    "primaryColor": shell_output.style_primary_color or "#007bff",
+                },
+            }
+        },
+        "initial_surface_update": {
+            "surfaceUpdate": {
+                "surfaceId": surface_id,
+                "components": shell_components,
+            }
+        },
+    }
+
+
 class UIShellStructuredAgent(BaseAgent):
     """Generate shell metadata from plan and data context."""
 
@@ -63,8 +105,9 @@ class UIShellStructuredAgent(BaseAgent):
 class UIParallelSkeletonNode:
     """Graph node that creates the shell/skeleton response."""
 
-    def __init__(self):
+    def __init__(self, reuse_early_ids: bool = False):
         self.agent_name = "ui_parallel_skeleton"
+        self.reuse_early_ids = reuse_early_ids
         self._shell = UIShellStructuredAgent()
         self._fragment_builder = UIParallelFragmentMergeAgent()
 
@@ -83,6 +126,10 @@ class UIParallelSkeletonNode:
                     "I can help you explore outage, energy, infrastructure, and disaster response data."
                 )
             logger.debug("Skeleton node forced guidance shell settings for no-data/out-of-scope.")
+        if self.reuse_early_ids:
+            # Reuse the early skeleton ids so this update replaces its placeholder sections.
+            shell_output.surface_id = EARLY_SKELETON_SURFACE_ID
+            shell_output.root_id = EARLY_SKELETON_ROOT_ID
         tasks = list(state.get("parallel_execution_tasks") or [])
         if len(shell_output.section_titles) > len(tasks):
             shell_output.section_titles = shell_output.section_titles[: len(tasks)]
@@ -94,34 +141,85 @@ class UIParallelSkeletonNode:
         shell_components, assistant_text = self._fragment_builder._build_shell_components(
             shell_output, tasks
         )
-        surface_id = shell_output.surface_id or "dashboard"
-        root_id = shell_output.root_id or "root-layout"
-
-        fragment = {
-            "surface_id": surface_id,
-            "root_id": root_id,
-            "assistant_text": assistant_text or "",
-            "ordered_component_ids": [component["id"] for component in shell_components],
-            "components": shell_components,
-            "begin_rendering": {
-                "beginRendering": {
-                    "surfaceId": surface_id,
-                    "root": root_id,
-                    "styles": {
-                        "font": shell_output.style_font or "Arial",
-                        "primaryColor": shell_output.style_primary_color or "#007bff",
-                    },
-                }
-            },
-            "initial_surface_update": {
-                "surfaceUpdate": {
-                    "surfaceId": surface_id,
-                    "components": shell_components,
-                }
-            },
-        }
+        fragment = build_skeleton_fragment(shell_output, shell_components, assistant_text)
 
         return {
             "parallel_shell_output": shell_output.model_dump(),
             "parallel_skeleton_fragment": fragment,
         }
+
+
+class UIEarlyShellStructuredAgent(BaseAgent):
+    """Generate provisional shell metadata from the user query alone."""
+
+    def __init__(self):
+        super().__init__()
+        self.model = "xai.grok-4-fast-non-reasoning"
+        self.agent_name = "ui_parallel_early_shell"
+        self.system_prompt = UI_PARALLEL_EARLY_SHELL_INSTRUCTIONS
+        self.response_format = A2UIShellOutput
+        self.agent = self.build_agent()
+
+    async def generate_shell(self, query: str) -> A2UIShellOutput:
+        prompt = (
+            "Native components available for shell: Text, Column, Row, Card.\n"
+            f"User query:\n{query}"
+        )
+        response = await self.agent.ainvoke({"messages": [HumanMessage(content=prompt)]})
+        structured = extract_structured_result(response, A2UIShellOutput)
+        if structured is None:
+            logger.warning("Early shell structured extraction failed. Using default shell output.")
+            return A2UIShellOutput()
+        return structured
+
+
+class UIEarlySkeletonNode:
+    """Paint placeholder sections from the query alone while backend retrieval runs.
+
+    Runs as a task next to the graph stream rather than as a graph node, so
+    graph steps never wait on it.
+    """
+
+    def __init__(self, shell: UIEarlyShellStructuredAgent | None = None):
+        self.agent_name = "ui_parallel_early_skeleton"
+        self._shell = shell or UIEarlyShellStructuredAgent()
+        self._fragment_builder = UIParallelFragmentMergeAgent()
+
+    def _build_placeholder_tasks(self, section_titles: list[str]) -> list[dict[str, Any]]:
+        titles = [title for title in section_titles if title][:EARLY_SKELETON_MAX_SECTIONS]
+        return [
+            {
+                "widget_name": "Text",
+                "slot_label": title,
+                "index": index,
+                "section_id": f"early-section-{index}",
+                "section_title_id": f"early-section-title-{index}",
+                "widget_id": f"early-widget-{index}",
+            }
+            for index, title in enumerate(titles or ["Insights"], start=1)
+        ]
+
+    async def __call__(self, query: str) -> dict[str, Any]:
+        try:
+            shell_output = await self._shell.generate_shell(query)
+        except Exception as exc:
+            logger.warning("Early shell generation failed. Using default shell output: %s", exc)
+            shell_output = A2UIShellOutput()
+
+        # Keep protocol ids fixed so the data-backed skeleton can reconcile by id.
+        shell_output.surface_id = EARLY_SKELETON_SURFACE_ID
+        shell_output.root_id = EARLY_SKELETON_ROOT_ID
+        shell_output.use_card_sections = False
+        if not shell_output.intro_text:
+            shell_output.intro_text = "Gathering data for your request..."
+        tasks = self._build_placeholder_tasks(shell_output.section_titles)
+        shell_output.section_titles = [str(task["slot_label"]) for task in tasks]
+        shell_components, assistant_text = self._fragment_builder._build_shell_components(
+            shell_output, tasks
+        )
+        logger.debug(
+            "Early skeleton built | sections=%s components=%s",
+            len(tasks),
+            len(shell_components),
+        )
+        return build_skeleton_fragment(shell_output, shell_components, assistant_text)
@@ -2,6 +2,9 @@ from __future__ import annotations
 
 import logging
 import math
+import os
+import time
+from dataclasses import dataclass, field
 from typing import Any
 
 from langchain.messages import HumanMessage
@@ -10,13 +13,21 @@ from core.base_agent import BaseAgent
 from core.dynamic_app.dynamic_struct import DynamicGraphState
 from core.dynamic_app.parallel_ui_shared import (
     coerce_payload_generic,
-    default_from_json_schema,
     extract_response_content,
     extract_structured_result,
+    get_compiled_model,
     get_widget_model_registry,
     normalize_widget_name,
     parse_json_loose,
 )
+from core.dynamic_app.rule_widget_builder import build_rule_based_widget, supports_rule_based_widget
+from core.dynamic_app.tool_results import get_turn_tables
+from core.dynamic_app.widget_latency import WIDGET_LATENCY, AttemptResult, run_hedged_attempt
+from core.dynamic_app.widget_cache import (
+    build_widget_cache_key,
+    get_widget_output_cache,
+    widget_digest,
+)
 from core.dynamic_app.prompts import (
     UI_PARALLEL_WIDGET_INSTRUCTIONS,
     build_widget_structured_prompt,
@@ -28,9 +39,36 @@ from dynamic_app.ui_agents_graph.ui_parallel_fragment_merge_agent import (
 MAX_WIDGET_GENERATION_ATTEMPTS = 2
 MAX_RETRY_PAYLOAD_PREVIEW = 1200
 MAX_PARALLEL_WIDGETS = 4
+# Outputs with these notes came from the LLM and validated; the minimal fallback is never cached.
+CACHEABLE_GENERATION_NOTES = (None, "recovered_after_malformed_payload")
+FALLBACK_NOTICES = {
+    "malformed_widget_payload_fallback": (
+        "This section is using a fallback view because the widget "
+        "agent returned malformed data. The request completed normally.",
+        "fallback due to malformed widget payload",
+    ),
+    "latency_budget_fallback": (
+        "This section is using a fallback view because the widget "
+        "took too long to generate. The request completed normally.",
+        "fallback after exceeding the latency budget",
+    ),
+}
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class WidgetGeneration:
+    """Result of one ``generate_widget`` call.
+
+    The agent is shared by concurrent requests, so the generation note and
+    attempt log travel with the output instead of living on the agent.
+    """
+
+    output: Any = None
+    generation_note: str | None = None
+    attempts: list[dict[str, Any]] = field(default_factory=list)
+
+
 class UIWidgetStructuredAgent(BaseAgent):
     """Single reusable widget agent with dynamic structured output binding."""
 
@@ -42,11 +80,17 @@ class UIWidgetStructuredAgent(BaseAgent):
         self._model_registry = get_widget_model_registry()
         self._agent_registry: dict[str, Any] = {}
         self._freeform_agent = self.build_agent()
-        self.last_generation_note: str | None = None
+        self._output_cache = get_widget_output_cache()
+        # Any change to the model or prompt wording invalidates cached outputs;
+        # each widget's cache key also carries its output schema digest.
+        self.prompt_version = widget_digest(
+            self.model,
+            self.system_prompt,
+            build_widget_structured_prompt("", ""),
+        )
 
     def _build_minimal_widget_output(self, widget_name: str, model_cls: Any) -> Any:
-        schema = model_cls.model_json_schema() if hasattr(model_cls, "model_json_schema") else {}
-        seed_payload = default_from_json_schema(schema) or {}
+        seed_payload = get_compiled_model(model_cls).seed_payload() or {}
         if isinstance(seed_payload, dict):
             if "title" in model_cls.model_fields and not seed_payload.get("title"):
                 seed_payload["title"] = f"{widget_name} data"
@@ -107,7 +151,7 @@ class UIWidgetStructuredAgent(BaseAgent):
         slot_label: str = "",
         planner_summary: str = "",
     ) -> tuple[Any | None, str | None]:
-        schema_keys = list((model_cls.model_json_schema() or {}).get("properties", {}).keys())
+        schema_keys = get_compiled_model(model_cls).schema_keys
         section_line = f"Section focus: {slot_label}\n" if slot_label else ""
         summary_line = f"Planner summary: {planner_summary}\n" if planner_summary else ""
         strict_prompt = (
@@ -137,22 +181,75 @@ class UIWidgetStructuredAgent(BaseAgent):
         data_context: str,
         slot_label: str = "",
         planner_summary: str = "",
-    ) -> Any:
-        self.last_generation_note = None
+    ) -> WidgetGeneration:
         canonical_name = normalize_widget_name(widget_name)
         model_cls = self._model_registry.get(canonical_name)
         if model_cls is None:
-            self.last_generation_note = "unsupported_widget"
             logger.warning("Widget skipped: unsupported widget_name=%s", widget_name)
-            return None
+            return WidgetGeneration(generation_note="unsupported_widget")
+        if self._output_cache is None:
+            return await self._generate_widget_uncached(
+                canonical_name, model_cls, data_context, slot_label, planner_summary
+            )
+
+        cache_key = build_widget_cache_key(
+            canonical_name,
+            slot_label,
+            data_context,
+            widget_digest(self.prompt_version, get_compiled_model(model_cls).schema_digest),
+            planner_summary=planner_summary,
+        )
+        cached = self._output_cache.get(cache_key, model_cls)
+        if cached is not None:
+            logger.debug("Widget cache hit | widget=%s key=%s", canonical_name, cache_key)
+            return WidgetGeneration(output=cached)
+        generation = await self._generate_widget_uncached(
+            canonical_name, model_cls, data_context, slot_label, planner_summary
+        )
+        if generation.output is not None and generation.generation_note in CACHEABLE_GENERATION_NOTES:
+            self._output_cache.put(cache_key, generation.output)
+        return generation
+
+    async def _structured_attempt(self, agent: Any, model_cls: Any, prompt: str) -> AttemptResult:
+        response = await agent.ainvoke({"messages": [HumanMessage(content=prompt)]})
+        structured = extract_structured_result(response, model_cls)
+        if structured is not None:
+            return structured, "", ""
+        raw = extract_response_content(response)
+        candidate = parse_json_loose(raw) if isinstance(raw, str) else raw
+        validated, validation_error = self._validate_widget_output(model_cls, candidate)
+        if validated is not None:
+            return validated, "", ""
+        return (
+            None,
+            str(raw)[:MAX_RETRY_PAYLOAD_PREVIEW],
+            validation_error or "Structured extraction failed.",
+        )
+
+    async def _generate_widget_uncached(
+        self,
+        canonical_name: str,
+        model_cls: Any,
+        data_context: str,
+        slot_label: str,
+        planner_summary: str,
+    ) -> WidgetGeneration:
+        generation = WidgetGeneration()
         agent = self._agent_registry.get(canonical_name)
         if agent is None:
             agent = self.build_agent(response_format=model_cls)
             self._agent_registry[canonical_name] = agent
         last_payload_preview = "<empty>"
         last_error = "Unknown validation error."
+        deadline = time.perf_counter() + WIDGET_LATENCY.slot_budget_ms / 1000.0
+        hedge_delay_ms = WIDGET_LATENCY.hedge_delay_ms(canonical_name)
+
+        def record_latency(latency_ms: float) -> None:
+            WIDGET_LATENCY.record(canonical_name, latency_ms)
 
         for attempt in range(1, MAX_WIDGET_GENERATION_ATTEMPTS + 1):
+            if time.perf_counter() >= deadline:
+                break
             if attempt == 1:
                 prompt = build_widget_structured_prompt(
                     canonical_name,
@@ -169,76 +266,83 @@ class UIWidgetStructuredAgent(BaseAgent):
                     slot_label=slot_label,
                     planner_summary=planner_summary,
                 )
-            try:
-                response = await agent.ainvoke({"messages": [HumanMessage(content=prompt)]})
-                structured = extract_structured_result(response, model_cls)
-                if structured is not None:
-                    logger.debug(
-                        "Widget success | widget=%s model=%s attempt=%s",
-                        canonical_name,
-                        model_cls.__name__,
-                        attempt,
-                    )
-                    return self._sanitize_widget_output(canonical_name, structured)
-
-                raw = extract_response_content(response)
-                candidate = parse_json_loose(raw) if isinstance(raw, str) else raw
-                validated, validation_error = self._validate_widget_output(model_cls, candidate)
-                if validated is not None:
-                    logger.debug(
-                        "Widget success after loose parse | widget=%s model=%s attempt=%s",
-                        canonical_name,
-                        model_cls.__name__,
-                        attempt,
-                    )
-                    return self._sanitize_widget_output(canonical_name, validated)
-
-                last_payload_preview = str(raw)[:MAX_RETRY_PAYLOAD_PREVIEW]
-                last_error = validation_error or "Structured extraction failed."
-                logger.warning(
-                    "Widget attempt failed validation | widget=%s model=%s attempt=%s error=%s",
+            validated, payload_preview, attempt_error = await run_hedged_attempt(
+                lambda: self._structured_attempt(agent, model_cls, prompt),
+                f"structured_{attempt}",
+                deadline,
+                hedge_delay_ms,
+                generation.attempts,
+                on_latency=record_latency,
+            )
+            if validated is not None:
+                logger.debug(
+                    "Widget success | widget=%s model=%s attempt=%s",
                     canonical_name,
                     model_cls.__name__,
                     attempt,
-                    last_error,
                 )
-            except Exception as exc:
-                last_error = str(exc)
-                last_payload_preview = "<unavailable due to structured generation exception>"
-                logger.warning(
-                    "Widget structured generation exception | widget=%s model=%s attempt=%s error=%s",
+                generation.output = self._sanitize_widget_output(canonical_name, validated)
+                return generation
+
+            last_payload_preview = payload_preview
+            last_error = attempt_error
+            logger.warning(
+                "Widget attempt failed | widget=%s model=%s attempt=%s error=%s",
+                canonical_name,
+                model_cls.__name__,
+                attempt,
+                last_error,
+            )
+
+        if time.perf_counter() < deadline:
+
+            async def freeform_attempt() -> AttemptResult:
+                recovered, recovery_error = await self._generate_widget_freeform(
+                    canonical_name,
+                    model_cls,
+                    data_context,
+                    previous_payload=last_payload_preview,
+                    previous_error=last_error,
+                    slot_label=slot_label,
+                    planner_summary=planner_summary,
+                )
+                return recovered, "", recovery_error or ""
+
+            recovered, _, _ = await run_hedged_attempt(
+                freeform_attempt,
+                "freeform",
+                deadline,
+                hedge_delay_ms,
+                generation.attempts,
+                on_latency=record_latency,
+            )
+            if recovered is not None:
+                generation.generation_note = "recovered_after_malformed_payload"
+                logger.debug(
+                    "Widget recovered via general post-retry check | widget=%s model=%s",
                     canonical_name,
                     model_cls.__name__,
-                    attempt,
-                    exc,
                 )
+                generation.output = self._sanitize_widget_output(canonical_name, recovered)
+                return generation
 
-        recovered, recovery_error = await self._generate_widget_freeform(
-            canonical_name,
-            model_cls,
-            data_context,
-            previous_payload=last_payload_preview,
-            previous_error=last_error,
-            slot_label=slot_label,
-            planner_summary=planner_summary,
-        )
-        if recovered is not None:
-            self.last_generation_note = "recovered_after_malformed_payload"
-            logger.debug(
-                "Widget recovered via general post-retry check | widget=%s model=%s",
+        if time.perf_counter() >= deadline:
+            logger.error(
+                "Widget latency budget exhausted; returning minimal payload | widget=%s budget_ms=%s",
+                canonical_name,
+                WIDGET_LATENCY.slot_budget_ms,
+            )
+            generation.generation_note = "latency_budget_fallback"
+        else:
+            logger.error(
+                "Widget fallback exhausted; returning minimal payload | widget=%s model=%s",
                 canonical_name,
                 model_cls.__name__,
             )
-            return self._sanitize_widget_output(canonical_name, recovered)
-
-        logger.error(
-            "Widget fallback exhausted; returning minimal payload | widget=%s model=%s",
-            canonical_name,
-            model_cls.__name__,
-        )
-        self.last_generation_note = "malformed_widget_payload_fallback"
+            generation.generation_note = "malformed_widget_payload_fallback"
         fallback = self._build_minimal_widget_output(canonical_name, model_cls)
-        return self._sanitize_widget_output(canonical_name, fallback)
+        generation.output = self._sanitize_widget_output(canonical_name, fallback)
+        return generation
 
     def _is_finite_number(self, value: Any) -> bool:
         return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
@@ -309,7 +413,17 @@ class UIWidgetStructuredAgent(BaseAgent):
 
 
 class UIParallelWidgetSlotNode:
-    """Graph node that generates one widget slot and emits one fragment."""
+    """Graph node that generates one widget slot and emits one fragment.
+
+    Table/BarGraph/LineGraph/KpiCard slots are built directly from tabular
+    tool results when they fit; the structured LLM agent is the fallback.
+    """
+
+    RULE_BASED_WIDGETS_ENABLED = os.getenv("DYNAMIC_RULE_BASED_WIDGETS", "true").strip().lower() in {
+        "1",
+        "true",
+        "yes",
+    }
 
     def __init__(self, slot_index: int):
         self.slot_index = slot_index
@@ -317,6 +431,26 @@ class UIParallelWidgetSlotNode:
         self._widget = UIWidgetStructuredAgent()
         self._fragment_builder = UIParallelFragmentMergeAgent()
 
+    def _build_rule_based_widget(self, state: DynamicGraphState, task: dict[str, Any]) -> Any:
+        widget_name = str(task.get("widget_name", ""))
+        if not self.RULE_BASED_WIDGETS_ENABLED or not supports_rule_based_widget(widget_name):
+            return None
+        tables = get_turn_tables(state)
+        widget_output = build_rule_based_widget(
+            widget_name,
+            tables,
+            slot_label=str(task.get("slot_label") or ""),
+        )
+        if widget_output is None:
+            return None
+        logger.info(
+            "Widget built without LLM | slot=%s widget=%s tables=%s",
+            self.slot_index,
+            widget_name,
+            len(tables),
+        )
+        return self._widget._sanitize_widget_output(widget_name, widget_output)
+
     async def __call__(self, state: DynamicGraphState) -> DynamicGraphState:
         tasks = list(state.get("parallel_execution_tasks") or [])
         plan_data = state.get("parallel_widget_plan") or {}
@@ -330,29 +464,33 @@ class UIParallelWidgetSlotNode:
         if task is None:
             return {state_key: {"slot_index": self.slot_index, "skipped": True}}
 
+        slot_started_at = time.perf_counter()
         try:
-            widget_output = await self._widget.generate_widget(
-                str(task.get("widget_name", "")),
-                data_context,
-                slot_label=str(task.get("slot_label") or ""),
-                planner_summary=planner_summary,
-            )
-            generation_note = self._widget.last_generation_note
+            widget_output = self._build_rule_based_widget(state, task)
+            attempts: list[dict[str, Any]] = []
+            if widget_output is not None:
+                generation_note = None
+            else:
+                generation = await self._widget.generate_widget(
+                    str(task.get("widget_name", "")),
+                    data_context,
+                    slot_label=str(task.get("slot_label") or ""),
+                    planner_summary=planner_summary,
+                )
+                widget_output = generation.output
+                generation_note = generation.generation_note
+                attempts = generation.attempts
             widget_components, widget_contents = self._fragment_builder._build_widget_payload(
                 task, widget_output
             )
-            if generation_note == "malformed_widget_payload_fallback":
+            fallback_notice = FALLBACK_NOTICES.get(generation_note or "")
+            if fallback_notice is not None:
                 widget_components = [
                     {
                         "id": str(task.get("widget_id")),
                         "component": {
                             "Text": {
-                                "text": {
-                                    "literalString": (
-                                        "This section is using a fallback view because the widget "
-                                        "agent returned malformed data. The request completed normally."
-                                    )
-                                },
+                                "text": {"literalString": fallback_notice[0]},
                                 "usageHint": "body",
                             }
                         },
@@ -366,19 +504,20 @@ class UIParallelWidgetSlotNode:
                 len(widget_components),
                 len(widget_contents),
             )
+            rendered_label = task.get("slot_label") or task.get("widget_name")
             return {
                 state_key: {
                     "slot_index": self.slot_index,
                     "task": task,
                     "components": widget_components,
                     "data_contents": widget_contents,
+                    "generation_note": generation_note,
+                    "attempts": attempts,
+                    "latency_ms": round((time.perf_counter() - slot_started_at) * 1000.0, 1),
                     "status_text": (
-                        f"Rendered {task.get('slot_label') or task.get('widget_name')}"
-                        if generation_note is None
-                        else (
-                            f"Rendered {task.get('slot_label') or task.get('widget_name')} "
-                            "(fallback due to malformed widget payload)"
-                        )
+                        f"Rendered {rendered_label}"
+                        if fallback_notice is None
+                        else f"Rendered {rendered_label} ({fallback_notice[1]})"
                     ),
                 }
             }
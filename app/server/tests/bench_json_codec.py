@@ -0,0 +1,52 @@
+"""Microbenchmark: stdlib ``json.dumps`` vs the active codec on the traditional dashboard payloads.
+
+Run from app/server with ``python -m tests.bench_json_codec`` (set ``JSON_CODEC``
+to compare backends).
+"""
+
+import asyncio
+import json
+import timeit
+
+from core import json_codec
+from traditional_app.data_provider import (
+    get_traditional_energy_messages,
+    get_traditional_energy_trends_messages,
+    get_traditional_industry_messages,
+    get_traditional_outage_messages,
+    get_traditional_timeline_messages,
+)
+
+ITERATIONS = 500
+
+PAYLOADS = {
+    "outage": get_traditional_outage_messages,
+    "industry": get_traditional_industry_messages,
+    "energy_trends": get_traditional_energy_trends_messages,
+    "timeline": get_traditional_timeline_messages,
+    "energy": get_traditional_energy_messages,
+}
+
+
+def _stdlib_dumps(value) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def main() -> None:
+    print(f"codec: {json_codec.CODEC.name}")
+    for label, build in PAYLOADS.items():
+        messages = asyncio.run(build())
+        # Pre-encoded fragments are codec-specific; the stdlib side gets the plain equivalent.
+        plain = json_codec.loads(json_codec.dumps(messages))
+        assert json.loads(_stdlib_dumps(plain)) == plain
+        stdlib_us = min(timeit.repeat(lambda: _stdlib_dumps(plain), number=ITERATIONS, repeat=3)) / ITERATIONS * 1e6
+        codec_us = min(timeit.repeat(lambda: json_codec.dumps(messages), number=ITERATIONS, repeat=3)) / ITERATIONS * 1e6
+        size_kb = len(json_codec.dumps(messages)) / 1024
+        print(
+            f"{label:>14}: {size_kb:6.1f} KB  stdlib {stdlib_us:8.1f} us  "
+            f"{json_codec.CODEC.name} {codec_us:7.1f} us  ({stdlib_us / codec_us:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
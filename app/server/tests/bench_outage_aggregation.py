@@ -0,0 +1,69 @@
+"""Benchmark: per-status rescans vs single-pass outage aggregation on synthetic feeds.
+
+Run from app/server with ``python -m tests.bench_outage_aggregation``.
+"""
+
+import random
+import time
+
+from traditional_app.outage_aggregation import OUTAGE_STATUSES, SEVERITIES, aggregate_outages
+
+SIZES = (10_000, 100_000, 1_000_000)
+LOCATIONS = ("Downtown Seattle, WA", "Portland Suburb, OR", "San Francisco Bay Area, CA", "Los Angeles Downtown, CA")
+CAUSES = ("Storm damage", "Tree on lines", "Equipment malfunction", "Planned maintenance", "Vehicle collision")
+
+
+def _synthetic_outages(count: int) -> list[dict]:
+    rng = random.Random(count)
+    return [
+        {
+            "location": rng.choice(LOCATIONS),
+            "affected_customers": rng.randint(10, 5000),
+            "cause": rng.choice(CAUSES),
+            "status": rng.choice(OUTAGE_STATUSES),
+            "severity": rng.choice(SEVERITIES),
+        }
+        for _ in range(count)
+    ]
+
+
+def _rescanning_aggregate(outages: list[dict]) -> dict:
+    """The previous dashboard code: filtered lists per status, then helpers rescanning each list."""
+    result = {"status_counts": {status: 0 for status in OUTAGE_STATUSES}}
+    for outage in outages:
+        status = outage.get("status", "Active")
+        if status in result["status_counts"]:
+            result["status_counts"][status] += 1
+    for status in OUTAGE_STATUSES:
+        group = [o for o in outages if o.get("status") == status]
+        result[status] = (
+            sum(o["affected_customers"] for o in group),
+            [len([o for o in group if o.get("severity") == severity]) for severity in SEVERITIES],
+            [o["location"].split(",")[0] for o in group[:3]],
+            list(set([o["cause"] for o in group]))[:2],
+        )
+    result["severity"] = [len([o for o in outages if o.get("severity") == severity]) for severity in SEVERITIES]
+    result["customers"] = sum(o["affected_customers"] for o in outages)
+    return result
+
+
+def _best_of(function, outages, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(outages)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main() -> None:
+    for size in SIZES:
+        outages = _synthetic_outages(size)
+        repeat = 3 if size < 1_000_000 else 1
+        rescans = _best_of(_rescanning_aggregate, outages, repeat)
+        single = _best_of(aggregate_outages, outages, repeat)
+        print(f"{size:>9,} outages: rescans {rescans:8.1f} ms  single pass {single:8.1f} ms  ({rescans / single:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Microbenchmark: compiled vs reflective widget repair over malformed payloads.
+
+Run from app/server with ``python -m tests.bench_widget_coercion``.
+"""
+
+import copy
+import timeit
+
+from core.dynamic_app.parallel_ui_shared import (
+    coerce_payload_generic,
+    default_from_json_schema,
+    get_compiled_model,
+    get_widget_model_registry,
+)
+from tests.widget_coercion_payloads import MALFORMED_PAYLOADS, coerce_payload_reflective
+
+ITERATIONS = 2000
+
+
+def _reflective_repair(registry):
+    for widget_name, payload in MALFORMED_PAYLOADS.items():
+        model_cls = registry[widget_name]
+        default_from_json_schema(model_cls.model_json_schema())
+        coerce_payload_reflective(model_cls, payload)
+
+
+def _compiled_repair(registry):
+    for widget_name, payload in MALFORMED_PAYLOADS.items():
+        model_cls = registry[widget_name]
+        get_compiled_model(model_cls).seed_payload()
+        coerce_payload_generic(model_cls, payload)
+
+
+def main() -> None:
+    registry = get_widget_model_registry()
+    payloads = copy.deepcopy(MALFORMED_PAYLOADS)
+    assert all(
+        coerce_payload_generic(registry[name], payload) == coerce_payload_reflective(registry[name], payload)
+        for name, payload in payloads.items()
+    )
+    results = {}
+    for label, repair in (("reflective", _reflective_repair), ("compiled", _compiled_repair)):
+        seconds = min(timeit.repeat(lambda: repair(registry), number=ITERATIONS, repeat=3))
+        results[label] = seconds / (ITERATIONS * len(MALFORMED_PAYLOADS)) * 1e6
+        print(f"{label:>10}: {results[label]:8.2f} us per payload (schema seed + coercion)")
+    print(f"   speedup: {results['reflective'] / results['compiled']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+from core.a2ui_parts import A2UIPartDeduper, canonical_a2ui_bytes
+
+
+def _surface_update(text: str) -> dict:
+    return {
+        "surfaceUpdate": {
+            "surfaceId": "dashboard",
+            "components": [{"id": "title", "component": {"Text": {"text": {"literalString": text}}}}],
+        }
+    }
+
+
+def test_equal_messages_with_different_key_order_are_deduped():
+    message = _surface_update("Outages")
+    reordered = {
+        "surfaceUpdate": {
+            "components": [{"component": {"Text": {"text": {"literalString": "Outages"}}}, "id": "title"}],
+            "surfaceId": "dashboard",
+        }
+    }
+    assert canonical_a2ui_bytes(message) == canonical_a2ui_bytes(reordered)
+
+    deduper = A2UIPartDeduper()
+    parts = []
+    deduper.extend_parts(parts, [message, reordered])
+
+    assert len(parts) == 1 and len(deduper) == 1
+    assert deduper.build_part(_surface_update("Outages")) is None
+
+
+def test_different_messages_are_not_deduped():
+    deduper = A2UIPartDeduper()
+    parts = []
+    deduper.extend_parts(
+        parts,
+        [
+            _surface_update("Outages"),
+            _surface_update("Energy"),
+            {"beginRendering": {"surfaceId": "dashboard", "root": "root-layout"}},
+        ],
+    )
+
+    assert len(parts) == 3 and len(deduper) == 3
+    # Parts carry the message unchanged.
+    assert parts[1].root.data == _surface_update("Energy")
@@ -0,0 +1,220 @@
+import asyncio
+import json
+
+import pytest
+
+from core.admission import (
+    AdmissionController,
+    AdmissionMiddleware,
+    AdmissionRejected,
+    StageLimiter,
+    StageLimitTimeout,
+)
+
+
+async def _hold(controller: AdmissionController, route: str, release: asyncio.Event) -> None:
+    async with controller.admit(route):
+        await release.wait()
+
+
+@pytest.mark.asyncio
+async def test_queued_request_runs_once_a_slot_frees_up():
+    controller = AdmissionController(max_concurrent=1, max_queue=2, queue_timeout_s=2)
+    controller.add_route("agent")
+    release = asyncio.Event()
+    holder = asyncio.create_task(_hold(controller, "agent", release))
+    await asyncio.sleep(0.01)
+
+    async def queued() -> float:
+        async with controller.admit("agent") as queue_ms:
+            return queue_ms
+
+    waiter = asyncio.create_task(queued())
+    await asyncio.sleep(0.01)
+    assert controller.snapshot()["queued"] == 1
+
+    release.set()
+    assert await waiter > 0
+    await holder
+    snapshot = controller.snapshot()
+    assert snapshot["admitted"] == 2
+    assert snapshot["queued"] == 0
+    assert snapshot["active"] == 0
+
+
+@pytest.mark.asyncio
+async def test_full_queue_rejects_immediately_and_timeout_rejects_after_waiting():
+    controller = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout_s=0.05)
+    controller.add_route("agent")
+    release = asyncio.Event()
+    holder = asyncio.create_task(_hold(controller, "agent", release))
+    await asyncio.sleep(0.01)
+
+    async def attempt() -> None:
+        async with controller.admit("agent"):
+            pass
+
+    waiter = asyncio.create_task(attempt())
+    await asyncio.sleep(0.01)
+    with pytest.raises(AdmissionRejected) as full:
+        await attempt()
+    assert full.value.reason == "queue_full"
+
+    with pytest.raises(AdmissionRejected) as timed_out:
+        await waiter
+    assert timed_out.value.reason == "queue_timeout"
+
+    release.set()
+    await holder
+    snapshot = controller.snapshot()
+    assert snapshot["rejected_queue_full"] == 1
+    assert snapshot["rejected_timeout"] == 1
+    assert snapshot["queued"] == 0
+
+
+@pytest.mark.asyncio
+async def test_route_limit_applies_below_the_global_limit():
+    controller = AdmissionController(max_concurrent=4, max_queue=0, queue_timeout_s=1)
+    controller.add_route("llm", limit=1)
+    controller.add_route("agent", limit=2)
+    release = asyncio.Event()
+    holder = asyncio.create_task(_hold(controller, "llm", release))
+    await asyncio.sleep(0.01)
+
+    with pytest.raises(AdmissionRejected):
+        async with controller.admit("llm"):
+            pass
+    async with controller.admit("agent"):
+        assert controller.snapshot()["routes"]["agent"]["active"] == 1
+
+    release.set()
+    await holder
+
+
+@pytest.mark.asyncio
+async def test_stage_limiter_is_reentrant_and_times_out_when_saturated():
+    limiter = StageLimiter("llm", limit=1, timeout_s=0.05)
+
+    async with limiter():
+        async with limiter():
+            assert limiter.active == 1
+
+        async def other_task() -> None:
+            async with limiter():
+                pass
+
+        with pytest.raises(StageLimitTimeout):
+            await asyncio.create_task(other_task())
+
+    snapshot = limiter.snapshot()
+    assert snapshot["active"] == 0
+    assert snapshot["waiting"] == 0
+    assert snapshot["timeouts"] == 1
+
+
+async def _call(app, body: dict) -> tuple[int, dict[bytes, bytes], bytes]:
+    raw = json.dumps(body).encode()
+    received = [{"type": "http.request", "body": raw[:5], "more_body": True},
+                {"type": "http.request", "body": raw[5:], "more_body": False}]
+    sent: list[dict] = []
+
+    async def receive():
+        return received.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    await app({"type": "http", "method": "POST", "path": "/"}, receive, send)
+    start = sent[0]
+    return start["status"], dict(start["headers"]), b"".join(m.get("body", b"") for m in sent[1:])
+
+
+@pytest.mark.asyncio
+async def test_middleware_replays_body_and_returns_429_when_busy():
+    release = asyncio.Event()
+    seen_bodies: list[bytes] = []
+
+    async def inner_app(scope, receive, send):
+        seen_bodies.append((await receive())["body"])
+        await release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    controller = AdmissionController(max_concurrent=1, max_queue=0, queue_timeout_s=1)
+    app = AdmissionMiddleware(inner_app, controller, "agent")
+    request = {"jsonrpc": "2.0", "id": "r1", "method": "message/stream", "params": {}}
+
+    first = asyncio.create_task(_call(app, request))
+    await asyncio.sleep(0.01)
+    status, headers, body = await _call(app, {**request, "id": "r2"})
+    assert status == 429
+    assert headers[b"retry-after"]
+    error = json.loads(body)
+    assert error["id"] == "r2"
+    assert error["error"]["data"]["reason"] == "queue_full"
+
+    release.set()
+    status, headers, body = await first
+    assert status == 200
+    assert b"x-admission-queue-ms" in headers
+    assert json.loads(seen_bodies[0]) == request
+
+    # Task lookups bypass admission even while the route is saturated.
+    release.clear()
+    busy = asyncio.create_task(_call(app, request))
+    await asyncio.sleep(0.01)
+    lookup = asyncio.create_task(_call(app, {"jsonrpc": "2.0", "id": "r3", "method": "tasks/get", "params": {}}))
+    await asyncio.sleep(0.01)
+    release.set()
+    status, headers, _ = await lookup
+    assert status == 200
+    assert b"x-admission-queue-ms" not in headers
+    await busy
+
+
+@pytest.mark.asyncio
+async def test_queued_request_leaves_the_queue_when_the_client_disconnects():
+    release = asyncio.Event()
+
+    async def inner_app(scope, receive, send):
+        await receive()
+        await release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    controller = AdmissionController(max_concurrent=1, max_queue=2, queue_timeout_s=5)
+    app = AdmissionMiddleware(inner_app, controller, "agent")
+    request = {"jsonrpc": "2.0", "id": "r1", "method": "message/stream", "params": {}}
+    first = asyncio.create_task(_call(app, request))
+    await asyncio.sleep(0.01)
+
+    client_gone = asyncio.Event()
+    messages = [{"type": "http.request", "body": json.dumps(request).encode(), "more_body": False}]
+    sent: list[dict] = []
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        await client_gone.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    queued = asyncio.create_task(app({"type": "http", "method": "POST", "path": "/"}, receive, send))
+    await asyncio.sleep(0.01)
+    assert controller.snapshot()["queued"] == 1
+
+    client_gone.set()
+    await asyncio.wait_for(queued, timeout=1)
+    snapshot = controller.snapshot()
+    assert sent == []
+    assert snapshot["queued"] == 0 and snapshot["abandoned"] == 1
+
+    release.set()
+    status, _, _ = await first
+    assert status == 200
+    # The abandoned request did not keep a slot.
+    assert controller.snapshot()["active"] == 0
+    status, _, _ = await _call(app, {**request, "id": "r2"})
+    assert status == 200
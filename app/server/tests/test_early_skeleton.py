@@ -0,0 +1,161 @@
+import asyncio
+
+import pytest
+
+from core.dynamic_app.schemas.structured_outputs import A2UIShellOutput
+from dynamic_app.dynamic_agents_graph import DynamicGraph
+from dynamic_app.ui_agents_graph.ui_parallel_skeleton_agent import (
+    UIEarlySkeletonNode,
+    build_skeleton_fragment,
+)
+
+
+class _StubShell:
+    def __init__(self, output=None, error=None):
+        self.output = output
+        self.error = error
+        self.queries = []
+
+    async def generate_shell(self, query):
+        self.queries.append(query)
+        if self.error is not None:
+            raise self.error
+        return self.output
+
+
+def test_build_skeleton_fragment_wraps_components():
+    components = [{"id": "surface-title", "component": {"Text": {}}}, {"id": "section-1", "component": {"Column": {}}}]
+    fragment = build_skeleton_fragment(
+        A2UIShellOutput(surface_id="", root_id="", style_primary_color="#112233"), components, "Summary"
+    )
+
+    assert fragment["surface_id"] == "dashboard" and fragment["root_id"] == "root-layout"
+    assert fragment["ordered_component_ids"] == ["surface-title", "section-1"]
+    assert fragment["assistant_text"] == "Summary"
+    assert fragment["begin_rendering"]["beginRendering"] == {
+        "surfaceId": "dashboard",
+        "root": "root-layout",
+        "styles": {"font": "Arial", "primaryColor": "#112233"},
+    }
+    assert fragment["initial_surface_update"]["surfaceUpdate"] == {"surfaceId": "dashboard", "components": components}
+
+
+@pytest.mark.asyncio
+async def test_early_skeleton_pins_ids_and_caps_sections():
+    shell = _StubShell(
+        A2UIShellOutput(surface_id="other", root_id="other-root", section_titles=["A", "", "B", "C", "D"])
+    )
+    fragment = await UIEarlySkeletonNode(shell=shell)("outages in Texas")
+
+    assert shell.queries == ["outages in Texas"]
+    assert (fragment["surface_id"], fragment["root_id"]) == ("dashboard", "root-layout")
+    component_ids = fragment["ordered_component_ids"]
+    assert [f"early-section-{index}" in component_ids for index in (1, 2, 3, 4)] == [True, True, True, False]
+
+
+@pytest.mark.asyncio
+async def test_early_skeleton_falls_back_to_default_shell():
+    fragment = await UIEarlySkeletonNode(shell=_StubShell(error=RuntimeError("model down")))("q")
+
+    texts = [
+        component["component"]["Text"]["text"]["literalString"]
+        for component in fragment["components"]
+        if "Text" in component["component"]
+    ]
+    assert "Gathering data for your request..." in texts
+    assert "early-section-1" in fragment["ordered_component_ids"]
+
+
+def _graph_with_early_skeleton(early_skeleton):
+    graph = DynamicGraph.__new__(DynamicGraph)
+    graph._parallel_ui_early_skeleton = early_skeleton
+    return graph
+
+
+@pytest.mark.asyncio
+async def test_graph_chunks_do_not_wait_for_the_early_skeleton():
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def slow_early_skeleton(query):
+        started.set()
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def graph_stream():
+        await started.wait()
+        yield (("backend_orchestrator",), {"messages": []})
+        yield (("parallel_ui_skeleton",), {"parallel_skeleton_fragment": {"surface_id": "dashboard"}})
+
+    graph = _graph_with_early_skeleton(slow_early_skeleton)
+    chunks = [chunk async for chunk in graph._merge_early_skeleton(graph_stream(), "q")]
+
+    assert [chunk[0] for chunk in chunks] == [("backend_orchestrator",), ("parallel_ui_skeleton",)]
+    # Dropped once the data-backed skeleton went out.
+    assert cancelled.is_set()
+
+
+@pytest.mark.asyncio
+async def test_early_skeleton_chunk_is_merged_into_the_stream():
+    graph_may_finish = asyncio.Event()
+
+    async def early_skeleton(query):
+        return {"surface_id": "dashboard", "query": query}
+
+    async def graph_stream():
+        yield (("backend_orchestrator",), {"messages": []})
+        await graph_may_finish.wait()
+        yield (("parallel_ui_skeleton",), {"parallel_skeleton_fragment": {}})
+
+    graph = _graph_with_early_skeleton(early_skeleton)
+    merged = graph._merge_early_skeleton(graph_stream(), "outages")
+    first = await anext(merged)
+    second = await anext(merged)
+    graph_may_finish.set()
+    rest = [chunk async for chunk in merged]
+
+    states = [graph._extract_chunk_state(chunk) for chunk in (first, second, *rest)]
+    assert {"surface_id": "dashboard", "query": "outages"} in [
+        state.get("parallel_early_skeleton_fragment") for state in states
+    ]
+    assert "parallel_skeleton_fragment" in states[-1]
+
+
+@pytest.mark.asyncio
+async def test_graph_errors_propagate_through_the_merge():
+    async def early_skeleton(query):
+        await asyncio.sleep(5)
+
+    async def graph_stream():
+        raise RuntimeError("graph failed")
+        yield
+
+    graph = _graph_with_early_skeleton(early_skeleton)
+    with pytest.raises(RuntimeError, match="graph failed"):
+        async for _ in graph._merge_early_skeleton(graph_stream(), "q"):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_begin_rendering_is_resent_when_the_real_shell_changes_styles():
+    early_shell = A2UIShellOutput(surface_id="", root_id="", style_font="Arial", style_primary_color="#112233")
+    early = await UIEarlySkeletonNode(shell=_StubShell(early_shell))("q")
+    graph = _graph_with_early_skeleton(None)
+
+    same_styles = build_skeleton_fragment(early_shell, [], "")
+    assert graph._skeleton_begin_message(same_styles, early["begin_rendering"]) is None
+
+    restyled = build_skeleton_fragment(
+        A2UIShellOutput(surface_id="", root_id="", style_font="Georgia", style_primary_color="#445566"), [], ""
+    )
+    begin_message = graph._skeleton_begin_message(restyled, early["begin_rendering"])
+    assert begin_message["beginRendering"] == {
+        "surfaceId": early["surface_id"],
+        "root": early["root_id"],
+        "styles": {"font": "Georgia", "primaryColor": "#445566"},
+    }
+    # Without an early skeleton the data-backed one always begins rendering.
+    assert graph._skeleton_begin_message(same_styles, None) == same_styles["begin_rendering"]
@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+from core import json_codec
+from core.json_codec import JSONBytesResponse, _StdlibCodec
+from traditional_app.data_provider import (
+    get_traditional_energy_trends_messages,
+    get_traditional_outage_messages,
+)
+
+
+def test_dumps_is_compact_utf8_and_round_trips():
+    value = {"name": "Zürich", "values": [1, 2.5, None, True], "nested": {"b": 1, "a": 2}}
+
+    encoded = json_codec.dumps(value)
+
+    assert isinstance(encoded, bytes)
+    assert b" " not in encoded.replace("Zürich".encode(), b"")
+    assert "Zürich".encode() in encoded
+    assert json_codec.loads(encoded) == value
+    assert json_codec.dumps_text(value) == encoded.decode("utf-8")
+
+
+def test_sort_keys_matches_stdlib_canonical_form():
+    value = {"b": {"d": 1, "c": 2}, "a": [3, {"z": 0, "y": 1}]}
+
+    expected = json.dumps(value, sort_keys=True, separators=(",", ":")).encode()
+    assert json_codec.dumps(value, sort_keys=True) == expected
+
+
+def test_loads_raises_stdlib_decode_error():
+    with pytest.raises(json.JSONDecodeError):
+        json_codec.loads(b'{"unterminated": ')
+
+
+def test_stdlib_codec_embeds_pre_encoded_fragments():
+    codec = _StdlibCodec()
+    labels = [{"key": "0", "valueString": "Active"}]
+    fragment = codec.fragment(codec.dumps(labels), labels)
+
+    assert codec.loads(codec.dumps({"labels": fragment})) == {"labels": labels}
+
+
+def test_orjson_codec_splices_pre_encoded_bytes():
+    pytest.importorskip("orjson")
+    codec = json_codec._OrjsonCodec()
+    labels = [{"key": "0", "valueString": "Active"}]
+    fragment = codec.fragment(codec.dumps(labels), labels)
+
+    assert codec.dumps({"labels": fragment}) == b'{"labels":[{"key":"0","valueString":"Active"}]}'
+
+
+def test_json_bytes_response_renders_with_the_active_codec():
+    response = JSONBytesResponse({"status": "ok", "items": [1, 2]})
+
+    assert response.media_type == "application/json"
+    assert response.body == json_codec.dumps({"status": "ok", "items": [1, 2]})
+
+
+@pytest.mark.asyncio
+async def test_traditional_payloads_with_fragments_decode_to_plain_json():
+    for build in (get_traditional_outage_messages, get_traditional_energy_trends_messages):
+        messages = await build()
+        decoded = json_codec.loads(json_codec.dumps(messages))
+        assert isinstance(decoded, list) and decoded
+        # Fragments decode to the same structure the stdlib encoder would produce.
+        assert json.loads(json.dumps(decoded)) == decoded
@@ -0,0 +1,54 @@
+import threading
+
+import pytest
+
+from core import langfuse_tracing
+from core.langfuse_tracing import (
+    LangfuseTracingProvider,
+    get_langfuse_client,
+    register_langfuse_client,
+    shutdown_langfuse_clients,
+)
+
+
+class FakeLangfuse:
+    def __init__(self, **kwargs):
+        self.calls = []
+
+    def flush(self):
+        self.calls.append("flush")
+
+    def shutdown(self):
+        self.calls.append("shutdown")
+
+
+@pytest.fixture(autouse=True)
+def isolated_registry(monkeypatch):
+    monkeypatch.setattr(langfuse_tracing, "_SHARED_CLIENT", None)
+    monkeypatch.setattr(langfuse_tracing, "Langfuse", FakeLangfuse)
+
+
+def test_providers_and_tool_calls_share_one_client():
+    providers = [LangfuseTracingProvider() for _ in range(20)]
+
+    shared = get_langfuse_client()
+    assert isinstance(shared, FakeLangfuse)
+    assert all(provider.get_current_client() is shared for provider in providers)
+
+
+def test_registered_client_is_used_and_thread_count_stays_flat():
+    registered = register_langfuse_client(FakeLangfuse())
+    threads_before = threading.active_count()
+
+    for _ in range(50):
+        assert LangfuseTracingProvider().langfuse_instance is registered
+    assert threading.active_count() == threads_before
+
+
+def test_shutdown_flushes_then_clears_the_shared_client():
+    registered = register_langfuse_client(FakeLangfuse())
+
+    shutdown_langfuse_clients(timeout_s=0.1)
+
+    assert registered.calls == ["flush", "shutdown"]
+    assert get_langfuse_client() is not registered
@@ -0,0 +1,160 @@
+import asyncio
+
+import pytest
+
+from core.llm_rate_limit import AdaptiveConcurrency, ModelRateLimiter, TokenBucket, estimate_tokens
+
+
+class Throttled(Exception):
+    status_code = 429
+
+
+class FakeResult:
+    def __init__(self, total_tokens: int):
+        message = type("Message", (), {"usage_metadata": {"total_tokens": total_tokens}})()
+        self.generations = [type("Generation", (), {"message": message})()]
+
+
+def _limiter(**overrides) -> ModelRateLimiter:
+    settings = {
+        "requests_per_min": 6000,
+        "tokens_per_min": 1_000_000,
+        "max_concurrency": 8,
+        "max_retries": 3,
+        "backoff_s": 0.01,
+    }
+    settings.update(overrides)
+    return ModelRateLimiter("test-model", **settings)
+
+
+def test_token_bucket_reservations_queue_up_behind_an_empty_bucket():
+    bucket = TokenBucket(per_minute=60)
+    bucket.available = 1
+
+    assert bucket.reserve(1) == 0
+    assert bucket.reserve(1) == pytest.approx(1.0, abs=0.05)
+    assert bucket.reserve(1) == pytest.approx(2.0, abs=0.05)
+
+    bucket.adjust(-2)
+    assert bucket.reserve(1) == pytest.approx(1.0, abs=0.05)
+
+
+def test_aimd_halves_once_per_cooldown_and_recovers_additively():
+    concurrency = AdaptiveConcurrency(max_limit=8, cooldown_s=60)
+
+    assert concurrency.on_throttle()
+    assert not concurrency.on_throttle()
+    assert concurrency.limit == 4
+
+    for _ in range(4):
+        concurrency.on_success()
+    assert 4.9 < concurrency.limit < 5.0
+
+
+@pytest.mark.asyncio
+async def test_throttled_call_is_retried_and_lowers_concurrency():
+    limiter = _limiter()
+    attempts = 0
+
+    async def call():
+        nonlocal attempts
+        attempts += 1
+        if attempts < 3:
+            raise Throttled("429 Too Many Requests")
+        return FakeResult(total_tokens=120)
+
+    result = await limiter.call(call, estimated_tokens=50)
+
+    assert isinstance(result, FakeResult)
+    snapshot = limiter.snapshot()
+    assert snapshot["throttled"] == 2
+    assert snapshot["retries"] == 2
+    assert snapshot["calls"] == 1
+    assert snapshot["tokens_used"] == 120
+    assert snapshot["concurrency_limit"] < 8
+    assert snapshot["active"] == 0
+
+
+@pytest.mark.asyncio
+async def test_non_retryable_errors_and_exhausted_retries_propagate():
+    limiter = _limiter(max_retries=1)
+
+    async def broken():
+        raise ValueError("bad request")
+
+    async def always_throttled():
+        raise Throttled("429")
+
+    with pytest.raises(ValueError):
+        await limiter.call(broken, estimated_tokens=1)
+    with pytest.raises(Throttled):
+        await limiter.call(always_throttled, estimated_tokens=1)
+    assert limiter.snapshot()["active"] == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_caps_in_flight_calls():
+    limiter = _limiter(max_concurrency=2)
+    in_flight = 0
+    peak = 0
+
+    async def call():
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return FakeResult(total_tokens=10)
+
+    await asyncio.gather(*(limiter.call(call, estimated_tokens=10) for _ in range(6)))
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_nested_call_on_the_same_model_does_not_take_a_second_slot():
+    limiter = _limiter(max_concurrency=1)
+
+    async def inner():
+        return FakeResult(total_tokens=5)
+
+    async def outer():
+        return await limiter.call(inner, estimated_tokens=5)
+
+    assert isinstance(await asyncio.wait_for(limiter.call(outer, estimated_tokens=5), timeout=1), FakeResult)
+    assert limiter.snapshot()["calls"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stream_retries_only_before_the_first_chunk():
+    limiter = _limiter()
+    attempts = 0
+
+    def stream_factory(fail_after_first: bool):
+        async def stream():
+            nonlocal attempts
+            attempts += 1
+            if attempts == 1:
+                raise Throttled("429")
+            yield "chunk-1"
+            if fail_after_first:
+                raise Throttled("429")
+            yield "chunk-2"
+
+        return stream
+
+    chunks = [chunk async for chunk in limiter.stream(stream_factory(False), estimated_tokens=5)]
+    assert chunks == ["chunk-1", "chunk-2"]
+    assert attempts == 2
+
+    attempts = 1
+    received = []
+    with pytest.raises(Throttled):
+        async for chunk in limiter.stream(stream_factory(True), estimated_tokens=5):
+            received.append(chunk)
+    assert received == ["chunk-1"]
+    assert limiter.snapshot()["active"] == 0
+
+
+def test_estimate_tokens_counts_message_content():
+    message = type("Message", (), {"content": "x" * 400})()
+    assert estimate_tokens([message, "y" * 40]) == 111
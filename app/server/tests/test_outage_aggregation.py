@@ -0,0 +1,43 @@
+from traditional_app.outage_aggregation import aggregate_outages
+
+
+def _outage(status, severity, customers, location="Downtown Seattle, WA", cause="Storm"):
+    outage = {"location": location, "affected_customers": customers, "cause": cause, "severity": severity}
+    if status is not None:
+        outage["status"] = status
+    return outage
+
+
+def test_single_pass_matches_per_status_totals():
+    outages = [
+        _outage("Active", "High", 100, "Downtown Seattle, WA", "Storm"),
+        _outage("Active", "Medium", 50, "Portland Suburb, OR", "Tree"),
+        _outage("Active", "High", 25, "Tacoma, WA", "Storm"),
+        _outage("Active", "Low", 10, "Olympia, WA", "Vehicle"),
+        _outage("Resolved", "Low", 7, "Boise, ID", "Equipment"),
+    ]
+
+    summary = aggregate_outages(outages)
+
+    assert summary.total == 5
+    assert summary.affected_customers == 192
+    assert summary.status_counts == {"Active": 4, "Investigating": 0, "Resolved": 1, "Scheduled": 0, "Monitoring": 0}
+    assert summary.severity_breakdown() == "High: 2, Medium: 1, Low: 2"
+
+    active = summary.by_status["Active"]
+    assert active.affected_customers == 185
+    assert active.severity_breakdown() == "High: 2, Medium: 1, Low: 1"
+    assert active.top_areas() == "Downtown Seattle, Portland Suburb, Tacoma"
+    assert active.main_causes() == "Storm, Tree"
+
+    empty = summary.by_status["Scheduled"]
+    assert (empty.severity_breakdown(), empty.top_areas(), empty.main_causes()) == ("N/A", "None", "None")
+
+
+def test_missing_status_counts_as_active_but_is_not_grouped():
+    summary = aggregate_outages([_outage(None, "High", 10), _outage("Unknown", "Critical", 5)])
+
+    assert summary.status_counts["Active"] == 1
+    assert summary.by_status["Active"].count == 0
+    assert summary.affected_customers == 15
+    assert summary.severity_counts == {"High": 1, "Medium": 0, "Low": 0}
@@ -0,0 +1,94 @@
+import oracledb
+import pytest
+
+from database import query_guard
+from database.query_guard import QueryGuard, QueryGuardRejection, has_row_limit, static_query_issues
+
+
+def test_static_checks_reject_unsafe_queries():
+    assert static_query_issues("DELETE FROM outages")
+    assert static_query_issues("SELECT 1 FROM dual; DROP TABLE outages")
+    assert static_query_issues("SELECT * FROM outages o, circuits c")
+    assert static_query_issues("SELECT * FROM outages CROSS JOIN circuits")
+
+
+def test_static_checks_allow_joined_and_graph_queries():
+    assert static_query_issues("SELECT * FROM outages o, circuits c WHERE o.circuit_id = c.id") == []
+    assert static_query_issues(
+        "SELECT * FROM GRAPH_TABLE (outage_network MATCH (o IS outage) COLUMNS (o.id AS id, o.cause_category AS cause))"
+    ) == []
+    assert static_query_issues("SELECT 'a;b, c' AS txt FROM dual") == []
+
+
+def test_row_limit_detection_ignores_subqueries():
+    assert has_row_limit("SELECT * FROM outages FETCH FIRST 10 ROWS ONLY")
+    assert not has_row_limit("SELECT * FROM (SELECT * FROM outages FETCH FIRST 10 ROWS ONLY) t")
+
+
+def test_static_mode_rewrites_unbounded_query(monkeypatch):
+    monkeypatch.setenv("DB_QUERY_GUARD_MODE", "static")
+    guard = QueryGuard()
+    assert guard.check(None, "SELECT * FROM outages;", max_rows=500).endswith("FETCH FIRST 501 ROWS ONLY")
+    with pytest.raises(QueryGuardRejection, match="cartesian"):
+        guard.check(None, "SELECT * FROM outages, circuits", max_rows=500)
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, statement, **params):
+        self.conn.statements.append(statement)
+        if self.conn.explain_error is not None:
+            raise self.conn.explain_error
+
+    def fetchall(self):
+        return self.conn.plan_rows
+
+
+class FakeConnection:
+    def __init__(self, plan_rows=(), explain_error=None):
+        self.plan_rows = list(plan_rows)
+        self.explain_error = explain_error
+        self.statements = []
+        self.rollbacks = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+@pytest.fixture
+def explain_guard(monkeypatch):
+    monkeypatch.setenv("DB_QUERY_GUARD_MODE", "explain")
+    monkeypatch.setenv("DB_QUERY_MAX_COST", "1000")
+    monkeypatch.setattr(query_guard, "_explain_available", True)
+    return QueryGuard
+
+
+def test_explain_rejects_costly_plans_and_closes_the_transaction(explain_guard):
+    conn = FakeConnection(plan_rows=[(0, "SELECT STATEMENT", None, 5000, 10)])
+
+    with pytest.raises(QueryGuardRejection, match="estimated cost"):
+        explain_guard().check(conn, "SELECT * FROM outages", max_rows=500)
+    assert conn.statements[0].startswith("EXPLAIN PLAN")
+    assert conn.rollbacks == 1
+
+
+def test_unavailable_explain_is_remembered_across_guards(explain_guard):
+    conn = FakeConnection(explain_error=oracledb.DatabaseError("ORA-02402: PLAN_TABLE not found"))
+
+    explain_guard().check(conn, "SELECT * FROM outages", max_rows=500)
+    assert conn.rollbacks == 1
+
+    # A new guard (as built per tool call) skips EXPLAIN PLAN from now on.
+    explain_guard().check(conn, "SELECT * FROM outages", max_rows=500)
+    assert len(conn.statements) == 1
@@ -0,0 +1,165 @@
+from datetime import datetime
+from decimal import Decimal
+
+from database.query_results import (
+    NO_RESULTS_MESSAGE,
+    QueryResultFormatter,
+    QueryRowStream,
+    estimate_tokens,
+)
+
+
+class FakeCursor:
+    def __init__(self, rows, columns=("ID", "NAME"), arraysize=2):
+        self.description = [(column,) for column in columns]
+        self.arraysize = arraysize
+        self.fetch_calls = 0
+        self._rows = list(rows)
+
+    def fetchmany(self):
+        self.fetch_calls += 1
+        batch, self._rows = self._rows[: self.arraysize], self._rows[self.arraysize:]
+        return batch
+
+
+OUTAGE_COLUMNS = (
+    "INCIDENT_CODE", "CAUSE_CATEGORY", "WEATHER_CONDITION", "CUSTOMERS_AFFECTED",
+    "DURATION_MINUTES", "SAIDI_MINUTES", "START_TIME", "NEIGHBORHOOD",
+)
+
+
+def _outage_rows(count):
+    return [
+        (
+            f"INC-{1000 + i}", "Equipment Failure", "Storm", 120 + i * 7,
+            Decimal("95.5") + i, 0.0123456 * i, datetime(2026, 3, 18, 9, i % 60), "Capitol Hill",
+        )
+        for i in range(count)
+    ]
+
+
+def _formatter(monkeypatch, **env):
+    for key, value in env.items():
+        monkeypatch.setenv(key, str(value))
+    return QueryResultFormatter()
+
+
+def test_row_limit_stops_fetching_and_adds_marker(monkeypatch):
+    cursor = FakeCursor([(i, f"name-{i}") for i in range(100)])
+    row_stream = QueryRowStream(cursor, max_rows=3)
+
+    output = _formatter(monkeypatch, DB_QUERY_RESULT_FORMAT="rows").format("Query Results:", row_stream)
+
+    assert output.splitlines()[:4] == [
+        "Query Results:",
+        "ID: 0, NAME: name-0",
+        "ID: 1, NAME: name-1",
+        "ID: 2, NAME: name-2",
+    ]
+    assert "truncated after 3 rows" in output
+    assert row_stream.truncated_reason == "row_limit"
+    assert cursor.fetch_calls == 2
+
+
+def test_byte_budget_truncates_output(monkeypatch):
+    row_stream = QueryRowStream(FakeCursor([(i, "x" * 50) for i in range(20)]), max_rows=500)
+
+    formatter = _formatter(monkeypatch, DB_QUERY_RESULT_FORMAT="rows", DB_QUERY_MAX_BYTES=200)
+    output = formatter.format("Query Results:", row_stream)
+
+    assert row_stream.truncated_reason == "output_budget"
+    assert row_stream.rows_read == output.count("NAME: ")
+    assert len(output.rsplit("\n", 1)[0].encode("utf-8")) <= 200
+
+
+def test_single_oversized_row_is_cut_to_the_budget(monkeypatch):
+    row_stream = QueryRowStream(FakeCursor([(1, "x" * 100_000), (2, "y")]), max_rows=500)
+    rows_sink = []
+
+    formatter = _formatter(monkeypatch, DB_QUERY_RESULT_FORMAT="rows", DB_QUERY_MAX_BYTES=2000)
+    output = formatter.format("Query Results:", row_stream, rows_sink=rows_sink)
+
+    text, marker = output.rsplit("\n", 1)
+    assert len(text.encode("utf-8")) <= 2000
+    assert text.endswith("[row cut to fit the output budget]")
+    assert "truncated after 1 rows" in marker
+    assert row_stream.truncated_reason == "output_budget"
+    assert row_stream.rows_read == len(rows_sink) == 1
+
+    row_stream = QueryRowStream(FakeCursor([(1, "x" * 100_000)]), max_rows=500)
+    output = _formatter(monkeypatch, DB_QUERY_RESULT_FORMAT="compact", DB_QUERY_MAX_TOKENS=300).format(
+        "Query Results:", row_stream
+    )
+    assert estimate_tokens(output) < 400
+    assert "[row cut to fit the output budget]" in output
+
+
+def test_empty_result_message(monkeypatch):
+    row_stream = QueryRowStream(FakeCursor([]), max_rows=10)
+    assert _formatter(monkeypatch).format("Query Results:", row_stream) == NO_RESULTS_MESSAGE
+
+
+def test_compact_format_writes_header_once_with_rounding_and_stats(monkeypatch):
+    rows = [(1, 2.34567, None), (2, 10.0, datetime(2026, 3, 18)), (3, None, datetime(2026, 3, 18, 9, 30))]
+    row_stream = QueryRowStream(FakeCursor(rows, columns=("ID", "LOAD_MW", "START")), max_rows=10)
+
+    output = _formatter(monkeypatch).format("Query Results:", row_stream)
+
+    assert output.splitlines() == [
+        "Query Results (3 rows, tab-separated):",
+        "ID\tLOAD_MW\tSTART",
+        "1\t2.35\t",
+        "2\t10\t2026-03-18",
+        "3\t\t2026-03-18 09:30:00",
+        "Column stats: ID min=1 max=3 mean=2; LOAD_MW min=2.35 max=10 mean=6.17 nulls=1",
+    ]
+
+
+def test_token_budget_truncates_compact_output(monkeypatch):
+    row_stream = QueryRowStream(FakeCursor(_outage_rows(200), columns=OUTAGE_COLUMNS), max_rows=500)
+
+    output = _formatter(monkeypatch, DB_QUERY_MAX_TOKENS=500).format("Query Results:", row_stream)
+
+    assert row_stream.truncated_reason == "output_budget"
+    assert estimate_tokens(output) < 600
+    assert output.endswith("Aggregate or filter the query to see the rest.]")
+
+
+def test_compact_format_reduces_tokens_on_wide_results(monkeypatch):
+    rows = _outage_rows(50)
+    legacy = _formatter(monkeypatch, DB_QUERY_RESULT_FORMAT="rows", DB_QUERY_MAX_TOKENS=100_000).format(
+        "Query Results:", QueryRowStream(FakeCursor(rows, columns=OUTAGE_COLUMNS), max_rows=500)
+    )
+    compact = _formatter(monkeypatch, DB_QUERY_RESULT_FORMAT="compact", DB_QUERY_MAX_TOKENS=100_000).format(
+        "Query Results:", QueryRowStream(FakeCursor(rows, columns=OUTAGE_COLUMNS), max_rows=500)
+    )
+
+    legacy_tokens, compact_tokens = estimate_tokens(legacy), estimate_tokens(compact)
+    assert 1 - compact_tokens / legacy_tokens >= 0.5
+
+
+def test_rows_sink_matches_rows_in_text(monkeypatch):
+    row_stream = QueryRowStream(FakeCursor(_outage_rows(30), columns=OUTAGE_COLUMNS), max_rows=500)
+    rows_sink = []
+
+    output = _formatter(monkeypatch, DB_QUERY_MAX_TOKENS=400).format("Query Results:", row_stream, rows_sink=rows_sink)
+
+    assert len(rows_sink) == row_stream.rows_read == output.count("INC-")
+    assert rows_sink[1][:5] == ["INC-1001", "Equipment Failure", "Storm", 127, 96.5]
+    assert rows_sink[1][6] == "2026-03-18 09:01:00"
+
+
+def test_column_stats_cover_only_printed_rows(monkeypatch):
+    rows = [(i, 1000 * i) for i in range(1, 30)]
+    row_stream = QueryRowStream(FakeCursor(rows, columns=("ID", "AMT")), max_rows=500)
+    rows_sink = []
+
+    output = _formatter(monkeypatch, DB_QUERY_MAX_BYTES=120).format("Query Results:", row_stream, rows_sink=rows_sink)
+
+    lines = output.splitlines()
+    printed = [int(line.split("\t")[1]) for line in lines[2:] if line[:1].isdigit()]
+    assert row_stream.truncated_reason == "output_budget"
+    assert len(printed) == len(rows_sink) == row_stream.rows_read < len(rows)
+    mean = sum(printed) / len(printed)
+    assert f"AMT min={min(printed)} max={max(printed)} mean={mean:g}" in output
+    assert [row[1] for row in rows_sink] == printed
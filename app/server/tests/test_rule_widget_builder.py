@@ -0,0 +1,97 @@
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from core.dynamic_app.rule_widget_builder import build_rule_based_widget
+from core.dynamic_app.tool_results import collect_turn_tool_results, extract_turn_tables, get_turn_tables
+from core.dynamic_app.schemas.structured_outputs import (
+    BarGraphWidgetOutput,
+    KpiWidgetOutput,
+    LineGraphWidgetOutput,
+    TableWidgetOutput,
+)
+
+CAUSE_RESULT = (
+    "Query Results (3 rows, tab-separated):\n"
+    "CAUSE_CATEGORY\tOUTAGES\tCUSTOMERS_AFFECTED\n"
+    "Storm\t12\t5400\n"
+    "Equipment Failure\t7\t2100.5\n"
+    "Vegetation\t3\t\n"
+    "Column stats: OUTAGES min=3 max=12 mean=7.33"
+)
+TREND_RESULT = (
+    "Graph Query Results (3 rows, tab-separated):\n"
+    "START_DATE\tSAIDI_MINUTES\n"
+    "2026-03-02\t14.5\n"
+    "2026-03-01\t10\n"
+    "2026-03-03\t9.25\n"
+)
+
+
+def _messages():
+    return [
+        HumanMessage(content="previous question"),
+        ToolMessage(content=CAUSE_RESULT.replace("Storm", "Old"), tool_call_id="old", name="call_SQL_DB"),
+        HumanMessage(content="outages by cause and trend"),
+        ToolMessage(content=CAUSE_RESULT, tool_call_id="1", name="call_SQL_DB"),
+        ToolMessage(content=TREND_RESULT, tool_call_id="2", name="call_graphDB"),
+        AIMessage(content="Here is the summary."),
+    ]
+
+
+def test_extract_turn_tables_reads_only_current_turn():
+    tables = extract_turn_tables(_messages())
+    assert [table["tool"] for table in tables] == ["call_SQL_DB", "call_graphDB"]
+    assert tables[0]["rows"][0] == ["Storm", 12, 5400]
+    assert tables[0]["rows"][2] == ["Vegetation", 3, None]
+
+
+def test_builds_table_bar_and_line_widgets_without_llm():
+    tables = extract_turn_tables(_messages())
+
+    table = build_rule_based_widget("Table", tables, slot_label="Outage details")
+    assert isinstance(table, TableWidgetOutput)
+    assert [column.field for column in table.columns] == ["CAUSE_CATEGORY", "OUTAGES", "CUSTOMERS_AFFECTED"]
+
+    bar = build_rule_based_widget("BarGraph", tables, slot_label="Outages by cause")
+    assert isinstance(bar, BarGraphWidgetOutput)
+    assert [(point.label, point.value) for point in bar.data] == [
+        ("Storm", 12),
+        ("Equipment Failure", 7),
+        ("Vegetation", 3),
+    ]
+
+    line = build_rule_based_widget("LineGraph", tables, slot_label="SAIDI trend")
+    assert isinstance(line, LineGraphWidgetOutput)
+    assert line.labels == ["2026-03-01", "2026-03-02", "2026-03-03"]
+    assert line.series[0].values == [10.0, 14.5, 9.25]
+
+
+def test_kpi_from_single_row_and_llm_fallback_for_prose():
+    single_row = [{"source": "call_SQL_DB", "columns": ["TOTAL_OUTAGES", "AVG_DURATION"], "rows": [[22, 95.5]]}]
+    kpi = build_rule_based_widget("KpiCard", single_row, slot_label="Highlights")
+    assert isinstance(kpi, KpiWidgetOutput)
+    assert [(item.label, item.value) for item in kpi.data] == [("Total Outages", 22), ("Avg Duration", 95.5)]
+
+    prose = extract_turn_tables([HumanMessage(content="q"), ToolMessage(content="[1] Some manual text", tool_call_id="3")])
+    assert build_rule_based_widget("BarGraph", prose) is None
+    assert build_rule_based_widget("TimelineComponent", single_row) is None
+
+
+def test_published_tool_artifacts_take_precedence_over_text():
+    artifact = {
+        "tool": "call_SQL_DB",
+        "kind": "table",
+        "columns": ["REGION", "OUTAGES"],
+        "rows": [["North", 4], ["South", 9]],
+        "row_count": 2,
+    }
+    messages = [
+        HumanMessage(content="outages by region"),
+        ToolMessage(content="Query Results: ...", tool_call_id="1", name="call_SQL_DB", artifact=artifact),
+        ToolMessage(content="[1] manual", tool_call_id="2", name="semantic_search", artifact=None),
+    ]
+    tool_results = collect_turn_tool_results(messages)
+    assert tool_results == [artifact]
+
+    tables = get_turn_tables({"messages": messages, "tool_results": tool_results})
+    bar = build_rule_based_widget("BarGraph", tables, slot_label="Outages by region")
+    assert [(point.label, point.value) for point in bar.data] == [("North", 4), ("South", 9)]
@@ -0,0 +1,32 @@
+from database.speculative_cache import SpeculativeCachePolicy
+
+
+def test_adaptive_mode_stops_speculating_when_hit_rate_is_high(monkeypatch):
+    monkeypatch.setenv("TESTSQL_SPECULATIVE_MODE", "adaptive")
+    policy = SpeculativeCachePolicy("testsql")
+    assert policy.should_speculate()
+
+    for _ in range(policy.ADAPTIVE_MIN_SAMPLES):
+        policy.record_lookup(hit=True, speculated=True)
+        policy.record_outcome("loss")
+    assert policy.recent_hit_rate() == 1.0
+    assert not policy.should_speculate()
+
+    snapshot = policy.snapshot()
+    assert snapshot["hits"] == policy.ADAPTIVE_MIN_SAMPLES
+    assert snapshot["losses"] == policy.ADAPTIVE_MIN_SAMPLES
+
+
+def test_win_records_saved_lookup_time(monkeypatch):
+    monkeypatch.setenv("TESTSQL_SPECULATIVE_MODE", "always")
+    policy = SpeculativeCachePolicy("testsql")
+    policy.record_lookup(hit=False, speculated=True)
+    policy.record_outcome("win", lookup_ms=42.0)
+    assert policy.should_speculate()
+    assert policy.is_confident_hit(0.1) and not policy.is_confident_hit(0.3)
+    assert policy.snapshot()["saved_ms"] == 42.0
+
+
+def test_unknown_mode_disables_speculation(monkeypatch):
+    monkeypatch.setenv("TESTSQL_SPECULATIVE_MODE", "sometimes")
+    assert not SpeculativeCachePolicy("testsql").should_speculate()
@@ -0,0 +1,134 @@
+import asyncio
+
+import pytest
+from a2a.types import DataPart, Part, TaskState, TextPart
+
+from core.status_batching import StatusUpdateBatcher
+
+
+class RecordingUpdater:
+    def __init__(self):
+        self.updates = []
+
+    async def update_status(self, state, message=None, final=False):
+        self.updates.append((state, message))
+
+
+def _text(*texts: str) -> list[Part]:
+    return [Part(root=TextPart(text=text)) for text in texts]
+
+
+def _ui() -> list[Part]:
+    return [Part(root=DataPart(data={"beginRendering": {"surfaceId": "s1"}}))]
+
+
+@pytest.mark.asyncio
+async def test_text_updates_within_the_window_become_one_event():
+    updater = RecordingUpdater()
+    batcher = StatusUpdateBatcher(updater, "ctx", "task", flush_window_ms=20)
+
+    await batcher.add(_text("Planning", "planner detail"))
+    await batcher.add(_text("Retrieving", "retrieval detail"))
+    await batcher.add(_text("Analyzing", "analysis detail"))
+    assert updater.updates == []
+
+    await asyncio.sleep(0.05)
+    assert len(updater.updates) == 1
+    state, message = updater.updates[0]
+    assert state == TaskState.working
+    assert [part.root.text for part in message.parts] == ["Analyzing", "analysis detail"]
+    assert message.metadata == {"coalesced_updates": ["Planning", "Retrieving"]}
+    assert batcher.snapshot() == {"items": 3, "events": 1}
+
+
+@pytest.mark.asyncio
+async def test_ui_parts_flush_immediately_with_pending_text():
+    updater = RecordingUpdater()
+    batcher = StatusUpdateBatcher(updater, "ctx", "task", flush_window_ms=1000)
+
+    await batcher.add(_text("Planning", ""))
+    await batcher.add(_text("Skeleton ready", ""), _ui())
+
+    assert len(updater.updates) == 1
+    _, message = updater.updates[0]
+    assert message.parts[0].root.text == "Skeleton ready"
+    assert isinstance(message.parts[-1].root, DataPart)
+    assert message.metadata == {"coalesced_updates": ["Planning"]}
+
+    # The pending timer from the first item finds nothing left to send.
+    await batcher.aclose()
+    assert len(updater.updates) == 1
+
+
+@pytest.mark.asyncio
+async def test_flush_sends_pending_updates_and_aclose_drops_them():
+    updater = RecordingUpdater()
+    batcher = StatusUpdateBatcher(updater, "ctx", "task", flush_window_ms=1000)
+
+    await batcher.add(_text("Working"))
+    await batcher.flush()
+    assert len(updater.updates) == 1
+    assert updater.updates[0][1].metadata is None
+
+    await batcher.add(_text("Cancelled before flush"))
+    await batcher.aclose()
+    await asyncio.sleep(0)
+    assert len(updater.updates) == 1
+
+
+@pytest.mark.asyncio
+async def test_zero_window_sends_every_item():
+    updater = RecordingUpdater()
+    batcher = StatusUpdateBatcher(updater, "ctx", "task", flush_window_ms=0)
+
+    await batcher.add(_text("one"))
+    await batcher.add(_text("two"))
+    assert len(updater.updates) == 2
+
+
+def _client_status_texts(message) -> list[str]:
+    """Status entries the client shows for one event (see stream-event-normalizer.ts)."""
+    coalesced = list((message.metadata or {}).get("coalesced_updates") or [])
+    texts = [part.root.text for part in message.parts if isinstance(part.root, TextPart)]
+    return coalesced + texts[:1]
+
+
+@pytest.mark.asyncio
+async def test_no_status_text_is_lost_for_the_client():
+    updater = RecordingUpdater()
+    batcher = StatusUpdateBatcher(updater, "ctx", "task", flush_window_ms=1000)
+    sent = ["Planning", "Retrieving", "Skeleton ready", "Widget 1 ready", "Widget 2 ready"]
+
+    await batcher.add(_text(sent[0], "detail"))
+    await batcher.add(_text(sent[1], "detail"))
+    await batcher.add(_text(sent[2], ""), _ui())
+    await batcher.add(_text(sent[3], "detail"))
+    await batcher.add(_text(sent[4], "detail"))
+    await batcher.flush()
+
+    assert len(updater.updates) == 2
+    assert [text for _, message in updater.updates for text in _client_status_texts(message)] == sent
+
+
+class SlowUpdater(RecordingUpdater):
+    async def update_status(self, state, message=None, final=False):
+        if state == TaskState.working:
+            await asyncio.sleep(0.05)
+        await super().update_status(state, message, final)
+
+
+@pytest.mark.asyncio
+async def test_no_working_update_follows_aclose():
+    updater = SlowUpdater()
+    batcher = StatusUpdateBatcher(updater, "ctx", "task", flush_window_ms=10)
+
+    await batcher.add(_text("Querying"))
+    # The timed flush is now sending.
+    await asyncio.sleep(0.03)
+    await batcher.aclose()
+    await updater.update_status(TaskState.canceled)
+    await batcher.add(_text("Late update"))
+    await batcher.flush()
+    await asyncio.sleep(0.1)
+
+    assert [state for state, _ in updater.updates] == [TaskState.working, TaskState.canceled]
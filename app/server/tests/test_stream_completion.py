@@ -0,0 +1,26 @@
+from core.dynamic_app.stream_completion import StreamCompletionTracker
+
+
+def test_complete_once_planned_slots_skeleton_and_suggestions_are_out():
+    tracker = StreamCompletionTracker()
+    tracker.mark_suggestions_ready()
+    tracker.mark_skeleton_emitted()
+    assert not tracker.is_complete  # nothing planned yet
+
+    tracker.plan([{"index": 1, "widget_name": "Table"}, {"index": 2, "widget_name": "BarGraph"}])
+    tracker.mark_slot_emitted(1)
+    assert not tracker.is_complete
+
+    tracker.mark_slot_emitted(2)
+    assert tracker.is_complete
+
+
+def test_waits_for_suggestions_even_when_widgets_are_done():
+    tracker = StreamCompletionTracker()
+    tracker.plan([{"index": 1}])
+    tracker.mark_skeleton_emitted()
+    tracker.mark_slot_emitted(1)
+    assert not tracker.is_complete
+
+    tracker.mark_suggestions_ready()
+    assert tracker.is_complete
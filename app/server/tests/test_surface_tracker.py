@@ -0,0 +1,46 @@
+from core.dynamic_app.surface_tracker import SurfaceUpdateTracker
+
+
+SKELETON = [
+    {"id": "root-layout", "component": {"Column": {"children": {"explicitList": ["widget-table-1"]}}}},
+    {"id": "widget-table-1", "component": {"Text": {"text": {"literalString": "Loading..."}}}},
+]
+
+
+def _fragment(index: int, value: str) -> dict:
+    return {
+        "components": [
+            {"id": f"widget-table-{index}", "component": {"Table": {"dataPath": f"/table-{index}"}}}
+        ],
+        "data_contents": [{"key": f"table-{index}", "valueString": value}],
+    }
+
+
+def test_delta_mode_sends_only_changed_components_and_keys():
+    tracker = SurfaceUpdateTracker(delta_mode=True)
+    tracker.load_skeleton("dashboard", SKELETON)
+
+    first = tracker.apply_widget_fragment(_fragment(1, "a"))
+    assert [c["id"] for c in first[0]["surfaceUpdate"]["components"]] == ["widget-table-1"]
+    assert first[1]["dataModelUpdate"]["path"] == "/table-1"
+    assert first[1]["dataModelUpdate"]["contents"] == [{"key": ".", "valueString": "a"}]
+
+    second = tracker.apply_widget_fragment(_fragment(2, "b"))
+    assert [c["id"] for c in second[0]["surfaceUpdate"]["components"]] == ["widget-table-2"]
+    assert [m["dataModelUpdate"]["path"] for m in second[1:]] == ["/table-2"]
+
+    assert tracker.apply_widget_fragment(_fragment(2, "b")) == []
+    assert tracker.ordered_component_ids == ["root-layout", "widget-table-1", "widget-table-2"]
+    assert tracker.bytes_saved > 0
+
+
+def test_full_mode_resends_whole_surface_and_data_model():
+    tracker = SurfaceUpdateTracker(delta_mode=False)
+    tracker.load_skeleton("dashboard", SKELETON)
+    tracker.apply_widget_fragment(_fragment(1, "a"))
+
+    messages = tracker.apply_widget_fragment(_fragment(2, "b"))
+    assert len(messages[0]["surfaceUpdate"]["components"]) == 3
+    assert messages[1]["dataModelUpdate"]["path"] == "/"
+    assert [entry["key"] for entry in messages[1]["dataModelUpdate"]["contents"]] == ["table-1", "table-2"]
+    assert tracker.bytes_saved == 0
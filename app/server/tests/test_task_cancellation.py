@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from core.task_cancellation import RunningTaskRegistry
+
+
+@pytest.mark.asyncio
+async def test_cancel_stops_the_running_stream_and_its_subtasks():
+    registry = RunningTaskRegistry("test")
+    subtask_cancelled = asyncio.Event()
+
+    async def llm_call():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            subtask_cancelled.set()
+            raise
+
+    async def stream():
+        await asyncio.gather(llm_call(), llm_call())
+
+    run = asyncio.create_task(registry.run("task-1", stream()))
+    await asyncio.sleep(0.01)
+    assert registry.is_running("task-1")
+
+    assert await registry.cancel("task-1")
+    assert await run is False
+    assert subtask_cancelled.is_set()
+    assert not registry.is_running("task-1")
+    assert registry.snapshot()["cancelled"] == 1
+
+
+@pytest.mark.asyncio
+async def test_completed_runs_feed_the_saved_work_estimate():
+    registry = RunningTaskRegistry("test")
+
+    async def quick():
+        await asyncio.sleep(0.05)
+
+    assert await registry.run("task-1", quick()) is True
+    assert registry.average_duration_ms() >= 50
+
+    run = asyncio.create_task(registry.run("task-2", asyncio.sleep(10)))
+    await asyncio.sleep(0)
+    await registry.cancel("task-2")
+    await run
+
+    snapshot = registry.snapshot()
+    assert snapshot["completed"] == 1
+    assert snapshot["saved_ms_estimate"] > 0
+    assert not await registry.cancel("unknown")
+    assert registry.snapshot()["cancel_not_running"] == 1
+
+
+@pytest.mark.asyncio
+async def test_outer_cancellation_still_propagates():
+    registry = RunningTaskRegistry("test")
+    run = asyncio.create_task(registry.run("task-1", asyncio.sleep(10)))
+    await asyncio.sleep(0)
+    run.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await run
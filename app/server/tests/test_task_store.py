@@ -0,0 +1,138 @@
+import logging
+
+import pytest
+from a2a.server.tasks import InMemoryPushNotificationConfigStore
+from a2a.types import DataPart, Message, Part, PushNotificationConfig, Role, Task, TaskState, TaskStatus, TextPart
+
+from core.task_store import BoundedTaskStore, SQLiteTaskStore, push_config_evictor, trim_task_history
+
+
+def _message(role: Role, index: int, data: bool = False) -> Message:
+    part = Part(root=DataPart(data={"index": index})) if data else Part(root=TextPart(text=f"update {index}"))
+    return Message(role=role, message_id=f"m{index}", parts=[part])
+
+
+def _task(task_id: str, state: TaskState, agent_updates: int = 0) -> Task:
+    history = [_message(Role.user, 0)] + [_message(Role.agent, i, data=True) for i in range(1, agent_updates + 1)]
+    return Task(
+        id=task_id,
+        context_id="ctx",
+        status=TaskStatus(state=state, message=_message(Role.agent, 999)),
+        history=history,
+    )
+
+
+def test_finished_task_keeps_user_messages_final_message_and_a_summary():
+    task = _task("t1", TaskState.completed, agent_updates=5)
+
+    trimmed = trim_task_history(task, running_limit=20)
+
+    assert [m.role for m in trimmed.history] == [Role.user, Role.agent]
+    summary = trimmed.history[1]
+    assert summary.metadata["trimmed_messages"] == 5
+    assert summary.metadata["trimmed_data_parts"] == 5
+    assert trimmed.status.message.message_id == "m999"
+    assert len(task.history) == 6
+
+
+def test_running_task_keeps_newest_updates_and_accumulates_the_summary():
+    task = _task("t1", TaskState.working, agent_updates=4)
+
+    first = trim_task_history(task, running_limit=2)
+    assert [m.message_id for m in first.history] == ["m0", "t1-history-summary", "m3", "m4"]
+
+    first.history.append(_message(Role.agent, 5))
+    second = trim_task_history(first, running_limit=2)
+    assert [m.message_id for m in second.history] == ["m0", "t1-history-summary", "m4", "m5"]
+    assert second.history[1].metadata["trimmed_messages"] == 3
+
+    untouched = _task("t2", TaskState.working, agent_updates=2)
+    assert trim_task_history(untouched, running_limit=2) is untouched
+
+
+@pytest.mark.asyncio
+async def test_capacity_evicts_finished_tasks_before_running_ones():
+    evicted: list[str] = []
+
+    async def on_evict(task_id: str) -> None:
+        evicted.append(task_id)
+
+    store = BoundedTaskStore("test", ttl_s=3600, max_tasks=2, on_evict=on_evict)
+    await store.save(_task("running", TaskState.working))
+    await store.save(_task("done", TaskState.completed))
+    await store.save(_task("new", TaskState.working))
+
+    assert evicted == ["done"]
+    assert await store.get("running") is not None
+    assert await store.get("done") is None
+    snapshot = await store.snapshot()
+    assert snapshot["tasks"] == 2
+    assert snapshot["evicted_capacity"] == 1
+
+
+@pytest.mark.asyncio
+async def test_finished_tasks_expire_after_ttl_and_stale_tasks_after_stale_window():
+    store = BoundedTaskStore("test", ttl_s=0, stale_s=3600, max_tasks=10)
+    await store.save(_task("done", TaskState.completed))
+    store._last_sweep = 0.0
+    await store.save(_task("running", TaskState.working))
+
+    assert await store.get("done") is None
+    assert await store.get("running") is not None
+    assert (await store.snapshot())["evicted_ttl"] == 1
+
+
+@pytest.mark.asyncio
+async def test_sqlite_store_round_trips_trimmed_tasks_and_enforces_limits(tmp_path):
+    path = str(tmp_path / "tasks.sqlite3")
+    store = SQLiteTaskStore("agent", path, ttl_s=3600, max_tasks=2)
+    other = SQLiteTaskStore("llm", path, ttl_s=3600, max_tasks=2)
+
+    await store.save(_task("t1", TaskState.completed, agent_updates=3))
+    await other.save(_task("t1", TaskState.working))
+    loaded = await store.get("t1")
+    assert loaded.status.state == TaskState.completed
+    assert [m.role for m in loaded.history] == [Role.user, Role.agent]
+    assert (await other.get("t1")).status.state == TaskState.working
+
+    await store.save(_task("t2", TaskState.working))
+    await store.save(_task("t3", TaskState.working))
+    assert await store.get("t1") is None
+    assert (await store.snapshot())["tasks"] == 2
+
+    await store.delete("t2")
+    assert await store.get("t2") is None
+    assert (await other.snapshot())["tasks"] == 1
+
+
+@pytest.mark.asyncio
+async def test_eviction_drops_every_push_config_of_the_task():
+    config_store = InMemoryPushNotificationConfigStore()
+    for config_id in ("a", "b"):
+        await config_store.set_info("done", PushNotificationConfig(id=config_id, url=f"https://hooks/{config_id}"))
+    await config_store.set_info("running", PushNotificationConfig(id="c", url="https://hooks/c"))
+
+    store = BoundedTaskStore("test", max_tasks=2, on_evict=push_config_evictor(config_store))
+    await store.save(_task("done", TaskState.completed))
+    await store.save(_task("running", TaskState.working))
+    await store.save(_task("new", TaskState.working))
+
+    assert await config_store.get_info("done") == []
+    assert [config.id for config in await config_store.get_info("running")] == ["c"]
+
+
+@pytest.mark.asyncio
+async def test_both_backends_warn_when_evicting_running_tasks(tmp_path, caplog):
+    stores = [
+        BoundedTaskStore("memory", max_tasks=1),
+        SQLiteTaskStore("sqlite", str(tmp_path / "tasks.sqlite3"), max_tasks=1),
+    ]
+    for store in stores:
+        caplog.clear()
+        with caplog.at_level(logging.WARNING, logger="core.task_store"):
+            await store.save(_task("done", TaskState.completed))
+            await store.save(_task("first", TaskState.working))
+            assert "full of running tasks" not in caplog.text
+            await store.save(_task("second", TaskState.working))
+        assert "full of running tasks" in caplog.text, store.BACKEND
+        assert await store.get("first") is None
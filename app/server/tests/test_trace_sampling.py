@@ -0,0 +1,114 @@
+import threading
+import uuid
+from contextlib import contextmanager
+
+import pytest
+
+from core.langfuse_tracing import NOOP_OBSERVATION, LangfuseTracingProvider, SafeLangfuseCallbackHandler
+from core.trace_sampling import (
+    TRACE_SAMPLER,
+    TraceExportQueue,
+    TraceSampler,
+    is_trace_sampled,
+    record_tracing_overhead,
+)
+
+
+class RecordingClient:
+    def __init__(self):
+        self.observations = []
+
+    @contextmanager
+    def start_as_current_observation(self, **kwargs):
+        observation = RecordingObservation(kwargs)
+        self.observations.append(observation)
+        yield observation
+
+
+class RecordingObservation:
+    def __init__(self, kwargs):
+        self.kwargs = kwargs
+        self.updates = []
+
+    def update(self, **kwargs):
+        self.updates.append(kwargs)
+        return self
+
+
+def test_head_sampling_decision_is_shared_by_nested_scopes():
+    sampler = TraceSampler(sample_rate=0.5, rng=lambda: 0.9)
+
+    assert is_trace_sampled()
+    with sampler.request("outer") as outer:
+        assert not outer.sampled and not is_trace_sampled()
+        assert sampler.begin("inner") is None
+        record_tracing_overhead(0.002)
+    assert is_trace_sampled()
+
+    snapshot = sampler.snapshot()
+    assert snapshot["requests"] == 1 and snapshot["not_traced"] == 1
+    assert snapshot["overhead"]["unsampled"] == {"requests": 1, "avg_ms": 2.0, "max_ms": 2.0}
+
+
+def test_unsampled_errors_and_slow_requests_are_tail_sampled():
+    client = RecordingClient()
+    sampler = TraceSampler(sample_rate=0.0, slow_ms=60_000, tail_errors=True, queue_size=4)
+
+    with pytest.raises(RuntimeError):
+        with sampler.request("failing", client, {"session_id": "s1"}):
+            raise RuntimeError("boom")
+    sampler.slow_ms = 0
+    with sampler.request("slow", client):
+        pass
+    sampler.export_queue.join()
+
+    failing, slow = client.observations
+    assert failing.kwargs["name"] == "failing"
+    assert failing.kwargs["metadata"]["tail_sampled"] == "error"
+    assert failing.kwargs["metadata"]["session_id"] == "s1"
+    assert failing.updates == [{"level": "ERROR", "status_message": "RuntimeError: boom"}]
+    assert slow.kwargs["metadata"]["tail_sampled"] == "slow"
+    snapshot = sampler.snapshot()
+    assert (snapshot["tail_error"], snapshot["tail_slow"], snapshot["export_queue"]["exported"]) == (1, 1, 2)
+
+
+def test_export_queue_drops_instead_of_blocking():
+    release = threading.Event()
+    started = threading.Event()
+    export_queue = TraceExportQueue(max_size=1)
+
+    def blocked_export():
+        started.set()
+        release.wait(5)
+
+    assert export_queue.submit(blocked_export)
+    started.wait(5)
+    assert export_queue.submit(lambda: None)
+    assert not export_queue.submit(lambda: None)
+    release.set()
+    export_queue.join()
+    assert export_queue.snapshot()["dropped"] == 1
+
+
+def test_unsampled_requests_skip_handlers_and_observations(monkeypatch):
+    monkeypatch.setattr(TRACE_SAMPLER, "sample_rate", 0.0)
+    client = RecordingClient()
+    provider = LangfuseTracingProvider(langfuse_client=client)
+
+    with provider.request_observation(client, as_type="span", name="root") as root:
+        config = provider.build_runnable_config(run_id="r1", session_id="s1")
+        with provider.observation(client, as_type="span", name="child") as child:
+            pass
+
+    assert root is NOOP_OBSERVATION and child is NOOP_OBSERVATION
+    assert config["callbacks"] == []
+    assert client.observations == []
+
+
+def test_handler_callbacks_count_towards_tracing_overhead():
+    handler = SafeLangfuseCallbackHandler()
+    sampler = TraceSampler(sample_rate=1.0)
+
+    with sampler.request("handler") as trace_request:
+        handler.on_chain_start({}, {"input": "q"}, run_id=uuid.uuid4())
+    assert trace_request.overhead_s > 0
@@ -0,0 +1,59 @@
+import pytest
+from starlette.applications import Starlette
+from starlette.testclient import TestClient
+
+from core import json_codec
+from core.traditional_data_provider import OUTAGE_DATA, replace_traditional_data
+from traditional_app.data_provider import get_traditional_outage_messages
+from traditional_app.response_cache import TraditionalResponseCache
+
+
+def _client(cache: TraditionalResponseCache) -> TestClient:
+    app = Starlette()
+
+    async def outage(request):
+        return await cache.respond(request, "outage")
+
+    app.add_route("/traditional", outage, methods=["GET"])
+    return TestClient(app)
+
+
+def test_response_is_built_once_and_revalidates_with_304():
+    cache = TraditionalResponseCache({"outage": get_traditional_outage_messages}, max_age_s=30)
+    client = _client(cache)
+
+    first = client.get("/traditional")
+    assert first.status_code == 200
+    assert first.headers["content-type"] == "application/json"
+    assert first.headers["cache-control"] == "public, max-age=30, must-revalidate"
+    etag = first.headers["etag"]
+    assert etag.startswith('"') and etag.endswith('"')
+
+    assert client.get("/traditional").content == first.content
+    not_modified = client.get("/traditional", headers={"If-None-Match": f'"other", W/{etag}'})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+
+    snapshot = cache.snapshot()
+    assert (snapshot["builds"], snapshot["served"], snapshot["not_modified"]) == (1, 2, 1)
+
+
+@pytest.mark.asyncio
+async def test_replacing_source_data_rebuilds_with_a_new_etag():
+    cache = TraditionalResponseCache({"outage": get_traditional_outage_messages})
+    before = await cache.get("outage")
+
+    changed = json_codec.loads(json_codec.dumps(OUTAGE_DATA))
+    changed["outages"][0]["affected_customers"] += 1
+    try:
+        replace_traditional_data("outage", changed)
+        after = await cache.get("outage")
+        assert after.etag != before.etag
+        assert after.version == before.version + 1
+        assert await cache.get("outage") is after
+    finally:
+        replace_traditional_data("outage", OUTAGE_DATA)
+
+    with pytest.raises(ValueError):
+        replace_traditional_data("weather", {})
@@ -0,0 +1,90 @@
+import pytest
+from starlette.applications import Starlette
+from starlette.testclient import TestClient
+
+from core import json_codec
+from core.traditional_data_provider import OUTAGE_DATA, replace_traditional_data
+from traditional_app.paging import OUTAGE_ROWS, TIMELINE_ROWS, TraditionalPaging
+
+
+@pytest.fixture
+def outage_feed():
+    base = OUTAGE_DATA["outages"]
+    outages = [dict(base[i % len(base)]) for i in range(25)]
+    replace_traditional_data("outage", {"outages": outages, "total_outages": len(outages)})
+    yield outages
+    replace_traditional_data("outage", OUTAGE_DATA)
+
+
+@pytest.fixture
+def client():
+    app = Starlette()
+    paging = TraditionalPaging(default_limit=10, max_limit=10)
+
+    async def outage(request):
+        return await paging.respond(request, OUTAGE_ROWS)
+
+    async def timeline(request):
+        return await paging.respond(request, TIMELINE_ROWS)
+
+    app.add_route("/traditional", outage, methods=["GET"])
+    app.add_route("/traditional/timeline", timeline, methods=["GET"])
+    return TestClient(app)
+
+
+def _contents(response) -> dict:
+    [message] = response.json()
+    return {entry["key"]: entry["valueMap"] for entry in message["dataModelUpdate"]["contents"]}
+
+
+def test_cursor_pages_cover_every_row_once(outage_feed, client):
+    first = client.get("/traditional", params={"limit": 50})
+    assert first.headers["x-total-count"] == "25"
+    first_page = _contents(first)
+    assert "outageSummary" in first_page and "energyKPIs" in first_page
+    keys = [row["key"] for row in first_page["outageTable"]]
+
+    cursor = first.headers["x-next-cursor"]
+    while cursor:
+        page = client.get("/traditional", params={"cursor": cursor})
+        contents = _contents(page)
+        assert "outageSummary" not in contents
+        assert len(contents["mapMarkers"]) == len(contents["outageTable"])
+        keys += [row["key"] for row in contents["outageTable"]]
+        cursor = page.headers.get("x-next-cursor")
+
+    assert keys == [str(i) for i in range(25)]
+
+
+def test_cursor_from_an_older_data_version_is_rejected(outage_feed, client):
+    cursor = client.get("/traditional/timeline", params={"limit": 5}).headers["x-next-cursor"]
+    replace_traditional_data("outage", {"outages": outage_feed[:3], "total_outages": 3})
+
+    expired = client.get("/traditional/timeline", params={"cursor": cursor})
+    assert expired.status_code == 400
+    assert "expired" in expired.json()["error"]
+    assert client.get("/traditional", params={"cursor": "not-a-cursor"}).status_code == 400
+    assert client.get("/traditional", params={"limit": "many"}).status_code == 400
+
+
+def test_ndjson_stream_sends_the_header_then_row_chunks(outage_feed, client):
+    response = client.get("/traditional", params={"stream": "ndjson", "limit": 10})
+
+    assert response.headers["content-type"] == "application/x-ndjson"
+    messages = [json_codec.loads(line) for line in response.text.splitlines()]
+    header, *chunks = [message["dataModelUpdate"]["contents"] for message in messages]
+    assert [entry["key"] for entry in header] == [
+        "outageSummary", "outageSummaryLabels", "outageSummaryDetails", "energyKPIs"
+    ]
+    assert [len(chunk[0]["valueMap"]) for chunk in chunks] == [10, 10, 5]
+
+
+def test_sse_stream_frames_each_message_and_ends_with_an_end_event(outage_feed, client):
+    response = client.get("/traditional/timeline", params={"stream": "sse"})
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = response.text.strip().split("\n\n")
+    assert len(events) == 4
+    assert all(event.startswith("data: {") for event in events[:-1])
+    assert events[-1] == "event: end\ndata: {}"
+    assert client.get("/traditional", params={"stream": "xml"}).status_code == 400
@@ -0,0 +1,75 @@
+import time
+
+from core.dynamic_app.schemas.structured_outputs import BarGraphWidgetOutput, TableWidgetOutput
+from core.dynamic_app.widget_cache import WidgetOutputCache, build_widget_cache_key
+
+
+def _bar_graph(title="Outages by cause"):
+    return BarGraphWidgetOutput.model_validate(
+        {"title": title, "data": [{"label": "Storm", "value": 12}, {"label": "Vegetation", "value": 3}]}
+    )
+
+
+def test_cache_key_depends_on_every_component():
+    base = build_widget_cache_key("BarGraph", "Causes", "ctx", "v1")
+    assert base == build_widget_cache_key("BarGraph", "Causes", "ctx", "v1")
+    assert base != build_widget_cache_key("Table", "Causes", "ctx", "v1")
+    assert base != build_widget_cache_key("BarGraph", "Trends", "ctx", "v1")
+    assert base != build_widget_cache_key("BarGraph", "Causes", "ctx2", "v1")
+    assert base != build_widget_cache_key("BarGraph", "Causes", "ctx", "v2")
+    assert base != build_widget_cache_key("BarGraph", "Causes", "ctx", "v1", planner_summary="summary")
+
+
+def test_memory_hit_returns_independent_copy():
+    cache = WidgetOutputCache(max_entries=4, ttl_seconds=60)
+    cache.put("key", _bar_graph())
+
+    first = cache.get("key", BarGraphWidgetOutput)
+    first.data[0].value = 999
+    second = cache.get("key", BarGraphWidgetOutput)
+
+    assert second.data[0].value == 12
+    assert cache.get("key", TableWidgetOutput) is None
+    assert cache.snapshot()["hits"] == 2
+
+
+def test_lru_eviction_and_ttl_expiry():
+    cache = WidgetOutputCache(max_entries=2, ttl_seconds=60)
+    cache.put("a", _bar_graph("a"))
+    cache.put("b", _bar_graph("b"))
+    cache.get("a", BarGraphWidgetOutput)
+    cache.put("c", _bar_graph("c"))
+
+    assert cache.get("b", BarGraphWidgetOutput) is None
+    assert cache.get("a", BarGraphWidgetOutput).title == "a"
+    assert cache.snapshot()["evictions"] == 1
+
+    cache.ttl_seconds = 0.01
+    time.sleep(0.02)
+    assert cache.get("a", BarGraphWidgetOutput) is None
+
+
+def test_disk_tier_survives_a_new_process_cache(tmp_path):
+    WidgetOutputCache(disk_dir=str(tmp_path)).put("key", _bar_graph())
+
+    restarted = WidgetOutputCache(disk_dir=str(tmp_path))
+    restored = restarted.get("key", BarGraphWidgetOutput)
+
+    assert restored == _bar_graph()
+    assert restarted.snapshot()["disk_hits"] == 1
+    assert restarted.get("key", TableWidgetOutput) is None
+    assert not list(tmp_path.glob("*.json"))
+
+
+def test_schema_digest_changes_with_the_output_schema():
+    from pydantic import create_model
+
+    from core.dynamic_app.parallel_ui_shared import CompiledWidgetModel
+
+    # Same model name, one extra field.
+    ExtendedBarGraph = create_model("BarGraphWidgetOutput", __base__=BarGraphWidgetOutput, subtitle=(str, ""))
+
+    digest = CompiledWidgetModel(BarGraphWidgetOutput).schema_digest
+    assert digest == CompiledWidgetModel(BarGraphWidgetOutput).schema_digest
+    assert digest != CompiledWidgetModel(TableWidgetOutput).schema_digest
+    assert digest != CompiledWidgetModel(ExtendedBarGraph).schema_digest
@@ -0,0 +1,31 @@
+import copy
+
+from core.dynamic_app.parallel_ui_shared import (
+    coerce_payload_generic,
+    default_from_json_schema,
+    get_compiled_model,
+    get_widget_model_registry,
+)
+from tests.widget_coercion_payloads import MALFORMED_PAYLOADS, coerce_payload_reflective
+
+
+def test_compiled_coercion_matches_reflective_coercion():
+    registry = get_widget_model_registry()
+    for widget_name, payload in MALFORMED_PAYLOADS.items():
+        model_cls = registry[widget_name]
+        expected = coerce_payload_reflective(model_cls, copy.deepcopy(payload))
+        assert coerce_payload_generic(model_cls, copy.deepcopy(payload)) == expected, widget_name
+
+
+def test_compiled_model_caches_schema_and_returns_fresh_seed():
+    for model_cls in get_widget_model_registry().values():
+        compiled = get_compiled_model(model_cls)
+        assert compiled is get_compiled_model(model_cls)
+        assert compiled.json_schema == model_cls.model_json_schema()
+        assert list(compiled.schema_keys) == list(compiled.json_schema.get("properties", {}))
+
+        seed = compiled.seed_payload()
+        assert seed == default_from_json_schema(compiled.json_schema)
+        if isinstance(seed, dict):
+            seed["mutated"] = True
+            assert "mutated" not in compiled.seed_payload()
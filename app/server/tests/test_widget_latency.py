@@ -0,0 +1,146 @@
+import asyncio
+import time
+
+import pytest
+
+from core.dynamic_app.parallel_ui_shared import normalize_widget_name
+from core.dynamic_app.widget_latency import WIDGET_LATENCY, WidgetLatencyBudget, run_hedged_attempt
+from dynamic_app.ui_agents_graph.ui_parallel_widget_worker_agent import UIWidgetStructuredAgent
+
+
+def _deadline(seconds: float) -> float:
+    return time.perf_counter() + seconds
+
+
+@pytest.mark.asyncio
+async def test_slow_attempt_is_hedged_and_first_valid_result_wins():
+    calls = []
+
+    async def attempt():
+        calls.append(len(calls))
+        # The first call stalls; the hedge answers quickly.
+        await asyncio.sleep(5 if len(calls) == 1 else 0.01)
+        return {"title": "ok"}, "", ""
+
+    log: list[dict] = []
+    result = await run_hedged_attempt(attempt, "structured_1", _deadline(2), 50, log)
+
+    assert result[0] == {"title": "ok"}
+    assert [entry["kind"] for entry in log] == ["structured_1", "structured_1_hedge"]
+    assert [entry["outcome"] for entry in log] == ["cancelled", "valid"]
+    assert all(entry["latency_ms"] is not None for entry in log)
+
+
+@pytest.mark.asyncio
+async def test_budget_exhaustion_cancels_attempts():
+    async def attempt():
+        await asyncio.sleep(5)
+        return {"title": "late"}, "", ""
+
+    log: list[dict] = []
+    started_at = time.perf_counter()
+    result = await run_hedged_attempt(attempt, "structured_1", _deadline(0.1), None, log)
+
+    assert result[0] is None and "budget" in result[2]
+    assert time.perf_counter() - started_at < 1
+    assert [entry["outcome"] for entry in log] == ["cancelled"]
+
+
+@pytest.mark.asyncio
+async def test_errors_become_invalid_results_without_hedging():
+    async def attempt():
+        raise RuntimeError("model unavailable")
+
+    log: list[dict] = []
+    result = await run_hedged_attempt(attempt, "freeform", _deadline(1), 50, log)
+
+    assert result == (None, "<unavailable due to structured generation exception>", "model unavailable")
+    assert [entry["outcome"] for entry in log] == ["error"]
+
+
+def test_hedge_delay_uses_p95_once_enough_samples(monkeypatch):
+    monkeypatch.setenv("DYNAMIC_WIDGET_HEDGE_DELAY_MS", "8000")
+    budget = WidgetLatencyBudget()
+    assert budget.hedge_delay_ms("Table") == 8000
+
+    for latency_ms in range(1000, 1000 + budget.MIN_SAMPLES * 100, 100):
+        budget.record("Table", float(latency_ms))
+    assert budget.p95_ms("Table") == 2800.0
+    assert budget.hedge_delay_ms("Table") == 2800.0
+
+    monkeypatch.setenv("DYNAMIC_WIDGET_HEDGING", "false")
+    assert WidgetLatencyBudget().hedge_delay_ms("Table") is None
+
+
+@pytest.mark.asyncio
+async def test_hedged_slot_latency_includes_the_hedge_delay():
+    budget = WidgetLatencyBudget()
+    hedge_delay_ms = 100.0
+
+    async def run_slot():
+        calls = 0
+
+        async def attempt():
+            nonlocal calls
+            calls += 1
+            # The primary stalls and is cancelled; the hedge answers quickly.
+            await asyncio.sleep(5 if calls == 1 else 0.01)
+            return {"title": "ok"}, "", ""
+
+        return await run_hedged_attempt(
+            attempt,
+            "structured_1",
+            _deadline(2),
+            hedge_delay_ms,
+            [],
+            on_latency=lambda latency_ms: budget.record("Table", latency_ms),
+        )
+
+    await asyncio.gather(*(run_slot() for _ in range(budget.MIN_SAMPLES)))
+
+    # One sample per slot, never just the hedge's own short runtime.
+    assert len(budget._latencies["Table"]) == budget.MIN_SAMPLES
+    assert budget.p95_ms("Table") >= hedge_delay_ms
+
+
+@pytest.mark.asyncio
+async def test_cancelled_slot_records_elapsed_time_as_lower_bound():
+    samples: list[float] = []
+
+    async def attempt():
+        await asyncio.sleep(5)
+        return {"title": "late"}, "", ""
+
+    slot = asyncio.create_task(run_hedged_attempt(attempt, "structured_1", _deadline(2), None, [], samples.append))
+    await asyncio.sleep(0.1)
+    slot.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await slot
+
+    assert len(samples) == 1 and samples[0] >= 100.0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_generations_keep_their_own_attempts(monkeypatch):
+    monkeypatch.setattr(WIDGET_LATENCY, "hedging_enabled", False)
+    widget = UIWidgetStructuredAgent.__new__(UIWidgetStructuredAgent)
+    widget._model_registry = {normalize_widget_name("KpiCard"): object}
+    widget._agent_registry = {normalize_widget_name("KpiCard"): object()}
+    widget._output_cache = None
+    widget._sanitize_widget_output = lambda name, output: output
+
+    async def structured_attempt(agent, model_cls, prompt):
+        # The "slow" request is still running when the "fast" one starts and finishes.
+        await asyncio.sleep(0.2 if "slow" in prompt else 0.01)
+        return {"prompt": "slow" if "slow" in prompt else "fast"}, "", ""
+
+    widget._structured_attempt = structured_attempt
+    slow, fast = await asyncio.gather(
+        widget.generate_widget("KpiCard", "slow data"),
+        widget.generate_widget("KpiCard", "fast data"),
+    )
+
+    assert (slow.output, fast.output) == ({"prompt": "slow"}, {"prompt": "fast"})
+    assert len(slow.attempts) == len(fast.attempts) == 1
+    assert slow.attempts[0]["latency_ms"] > fast.attempts[0]["latency_ms"]
+    assert slow.generation_note is fast.generation_note is None
@@ -0,0 +1,119 @@
+"""Malformed widget payloads shared by the coercion tests and benchmark.
+
+Also holds the reflective reference coercion the compiled path is checked against.
+"""
+
+from typing import Any, get_args, get_origin
+
+from core.dynamic_app.parallel_ui_shared import _NUMBER_PATTERN
+
+MALFORMED_PAYLOADS = {
+    "BarGraph": {
+        "title": 42,
+        "orientation": None,
+        "data": {"label": "Storm", "value": "12 outages"},
+    },
+    "KpiCard": {
+        "title": None,
+        "data": [
+            {"key": "saidi", "label": "SAIDI", "value": "14.5 min", "change": "n/a"},
+            {"key": "outages", "label": 7, "value": None, "details": "none"},
+        ],
+    },
+    "LineGraph": {
+        "title": ["Trend"],
+        "labels": ("2026-03-01", "2026-03-02"),
+        "series": [{"name": "SAIDI", "values": ["10", "14.5"]}],
+        "details": None,
+    },
+    "Table": {
+        "title": "Outages",
+        "columns": {"header": "Cause", "field": "cause"},
+        "rows": [{"id": 1, "values": ["Storm"], "details": None}],
+    },
+    "Text": {"title": None, "body": 3, "usage_hint": "paragraph"},
+    "Card": {"title": 5, "body": None, "suggestions": "Show crews"},
+    "TimelineComponent": {"title": None, "data": {"date": "2026-03-01", "title": "Dispatch"}},
+    "MapComponent": {
+        "title": "Map",
+        "center_lat": "30.2 N",
+        "center_lng": None,
+        "zoom": "6x",
+        "markers": [{"name": "Substation", "latitude": "30.2", "longitude": "-97.7"}],
+    },
+}
+
+
+def _coerce_for_annotation(value: Any, annotation: Any) -> Any:
+    """Reflective coercion; the uncompiled reference for ``compile_coercer``."""
+    origin = get_origin(annotation)
+    args = get_args(annotation)
+    if origin in (list, list[Any]):
+        if value is None:
+            return []
+        if isinstance(value, list):
+            return value
+        if isinstance(value, tuple):
+            return list(value)
+        return [value]
+    if origin in (dict, dict[Any, Any]):
+        return value if isinstance(value, dict) else {}
+    if origin is None and annotation in (list, dict):
+        if annotation is list:
+            return value if isinstance(value, list) else []
+        return value if isinstance(value, dict) else {}
+    if origin is None and annotation is str:
+        return "" if value is None else str(value)
+    if origin is None and annotation in (int, float):
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return value
+        if isinstance(value, str):
+            match = _NUMBER_PATTERN.search(value)
+            if match:
+                try:
+                    parsed = float(match.group(0))
+                    return parsed if annotation is float else int(parsed)
+                except Exception:
+                    return 0
+        return 0
+    if origin is None and annotation is bool:
+        return bool(value)
+    if origin is None and annotation is Any:
+        return value
+    if origin is None and hasattr(annotation, "model_fields"):
+        if isinstance(value, dict):
+            return coerce_payload_reflective(annotation, value)
+        return {}
+    if origin is not None and type(None) in args:
+        inner_types = [arg for arg in args if arg is not type(None)]
+        if value is None:
+            return None
+        for inner in inner_types:
+            coerced = _coerce_for_annotation(value, inner)
+            if coerced is not None:
+                return coerced
+        return value
+    return value
+
+
+def coerce_payload_reflective(model_cls: Any, payload: dict[str, Any]) -> dict[str, Any]:
+    """Same result as ``coerce_payload_generic`` without the compiled plan."""
+    if not isinstance(payload, dict):
+        payload = {}
+    normalized: dict[str, Any] = {}
+    for field_name, field_info in model_cls.model_fields.items():
+        if field_name in payload:
+            normalized[field_name] = _coerce_for_annotation(
+                payload.get(field_name), field_info.annotation
+            )
+            continue
+        if field_info.default_factory is not None:
+            try:
+                normalized[field_name] = field_info.default_factory()
+            except Exception:
+                normalized[field_name] = None
+            continue
+        if field_info.default is not None:
+            normalized[field_name] = field_info.default
+            continue
+    return normalized
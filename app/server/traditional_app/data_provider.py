@@ -1,9 +1,13 @@
 """Data providers that map traditional outage/energy data into A2A message payloads."""
+from datetime import datetime
+
+from core import json_codec
 from core.traditional_data_provider import (
     get_traditional_outage_data,
     get_traditional_energy_data,
     get_traditional_industry_data
 )
+from traditional_app.outage_aggregation import aggregate_outages
 
 #region Constants
 LOCATION_COORDINATES = {
@@ -12,23 +16,113 @@ LOCATION_COORDINATES = {
     "San Francisco Bay Area, CA": (37.7749, -122.4194),
     "Los Angeles Downtown, CA": (34.0522, -118.2437)
 }
-#endregion
 
+# Dashboard fragments that never change are encoded once and spliced into every response.
+OUTAGE_SUMMARY_LABELS = json_codec.pre_encode(
+    [
+        {"key": "0", "valueString": "Active"},
+        {"key": "1", "valueString": "Investigating"},
+        {"key": "2", "valueString": "Resolved"},
+        {"key": "3", "valueString": "Scheduled"},
+        {"key": "4", "valueString": "Monitoring"}
+    ]
+)
 
-#region Outage Dashboard
-async def get_traditional_outage_messages():
-    """Get formatted initial outage data as A2A ServerToClientMessage array"""
+ENERGY_TREND_LABELS = json_codec.pre_encode(
+    [{"key": str(i), "valueString": month} for i, month in enumerate(
+        ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+    )]
+)
 
-    data = await get_traditional_outage_data()
+ENERGY_TREND_DETAILS = json_codec.pre_encode(
+    [
+        {"key": "0", "valueMap": [
+            {"key": "period", "valueString": "January"},
+            {"key": "trend", "valueString": "Lower winter generation baseline"},
+            {"key": "forecast", "valueString": "Expected gradual increase"},
+            {"key": "mainDriver", "valueString": "Seasonal irradiation and wind stability"}
+        ]},
+        {"key": "1", "valueMap": [
+            {"key": "period", "valueString": "February"},
+            {"key": "trend", "valueString": "Early seasonal ramp-up"},
+            {"key": "forecast", "valueString": "Continued growth expected"},
+            {"key": "mainDriver", "valueString": "Improving weather conditions"}
+        ]},
+        {"key": "2", "valueMap": [
+            {"key": "period", "valueString": "March"},
+            {"key": "trend", "valueString": "Strong spring momentum"},
+            {"key": "forecast", "valueString": "Above-average production likely"},
+            {"key": "mainDriver", "valueString": "Higher daylight hours"}
+        ]},
+        {"key": "3", "valueMap": [
+            {"key": "period", "valueString": "April"},
+            {"key": "trend", "valueString": "Peak spring acceleration"},
+            {"key": "forecast", "valueString": "Near-summer levels expected"},
+            {"key": "mainDriver", "valueString": "High renewable utilization"}
+        ]},
+        {"key": "4", "valueMap": [
+            {"key": "period", "valueString": "May"},
+            {"key": "trend", "valueString": "High output period"},
+            {"key": "forecast", "valueString": "Stable high generation"},
+            {"key": "mainDriver", "valueString": "Consistent solar and wind performance"}
+        ]},
+        {"key": "5", "valueMap": [
+            {"key": "period", "valueString": "June"},
+            {"key": "trend", "valueString": "Summer peak onset"},
+            {"key": "forecast", "valueString": "Potential short-term maximum"},
+            {"key": "mainDriver", "valueString": "Maximum solar contribution"}
+        ]},
+        {"key": "6", "valueMap": [
+            {"key": "period", "valueString": "July"},
+            {"key": "trend", "valueString": "Sustained summer peak"},
+            {"key": "forecast", "valueString": "Slight taper expected in August"},
+            {"key": "mainDriver", "valueString": "High demand and strong generation"}
+        ]},
+        {"key": "7", "valueMap": [
+            {"key": "period", "valueString": "August"},
+            {"key": "trend", "valueString": "Post-peak normalization"},
+            {"key": "forecast", "valueString": "Gradual decline expected"},
+            {"key": "mainDriver", "valueString": "Seasonal normalization"}
+        ]},
+        {"key": "8", "valueMap": [
+            {"key": "period", "valueString": "September"},
+            {"key": "trend", "valueString": "Early autumn decline"},
+            {"key": "forecast", "valueString": "Further reduction likely"},
+            {"key": "mainDriver", "valueString": "Reduced daylight and milder wind"}
+        ]},
+        {"key": "9", "valueMap": [
+            {"key": "period", "valueString": "October"},
+            {"key": "trend", "valueString": "Autumn stabilization"},
+            {"key": "forecast", "valueString": "Low-volatility period expected"},
+            {"key": "mainDriver", "valueString": "Balanced mixed-source output"}
+        ]},
+        {"key": "10", "valueMap": [
+            {"key": "period", "valueString": "November"},
+            {"key": "trend", "valueString": "Pre-winter lower output"},
+            {"key": "forecast", "valueString": "Seasonal low likely in December"},
+            {"key": "mainDriver", "valueString": "Shorter daylight window"}
+        ]},
+        {"key": "11", "valueMap": [
+            {"key": "period", "valueString": "December"},
+            {"key": "trend", "valueString": "Winter trough"},
+            {"key": "forecast", "valueString": "Recovery expected in Q1"},
+            {"key": "mainDriver", "valueString": "Seasonal generation constraints"}
+        ]}
+    ]
+)
+#endregion
 
-    outages = data["outages"]
-    total_outages = data["total_outages"]
 
-    status_counts = {"Active": 0, "Investigating": 0, "Resolved": 0, "Scheduled": 0, "Monitoring": 0}
-    for outage in outages:
-        status = outage.get("status", "Active")
-        if status in status_counts:
-            status_counts[status] += 1
+#region Outage Dashboard
+async def get_outage_header_values(outages):
+    """Summary, label and KPI values of the outage dashboard, i.e. everything except per-outage rows"""
+    summary = aggregate_outages(outages)
+    status_counts = summary.status_counts
+    active = summary.by_status["Active"]
+    investigating = summary.by_status["Investigating"]
+    resolved = summary.by_status["Resolved"]
+    scheduled = summary.by_status["Scheduled"]
+    monitoring = summary.by_status["Monitoring"]
 
     outage_summary = [
         {"key": "0", "valueNumber": status_counts["Active"]},
@@ -38,138 +132,53 @@ async def get_traditional_outage_messages():
         {"key": "4", "valueNumber": status_counts["Monitoring"]}
     ]
 
-    outage_summary_labels = [
-        {"key": "0", "valueString": "Active"},
-        {"key": "1", "valueString": "Investigating"},
-        {"key": "2", "valueString": "Resolved"},
-        {"key": "3", "valueString": "Scheduled"},
-        {"key": "4", "valueString": "Monitoring"}
-    ]
-
-    active_outages_list = [o for o in outages if o.get("status") == "Active"]
-    investigating_outages_list = [o for o in outages if o.get("status") == "Investigating"]
-    resolved_outages_list = [o for o in outages if o.get("status") == "Resolved"]
-    scheduled_outages_list = [o for o in outages if o.get("status") == "Scheduled"]
-    monitoring_outages_list = [o for o in outages if o.get("status") == "Monitoring"]
-
-    def get_top_locations(outage_list, limit=3):
-        if not outage_list:
-            return "None"
-        locations = [o["location"].split(",")[0] for o in outage_list[:limit]]
-        return ", ".join(locations)
-
-    def get_total_affected(outage_list):
-        return sum(o["affected_customers"] for o in outage_list)
-
-    def get_severity_breakdown(outage_list):
-        if not outage_list:
-            return "N/A"
-        high = len([o for o in outage_list if o.get("severity") == "High"])
-        medium = len([o for o in outage_list if o.get("severity") == "Medium"])
-        low = len([o for o in outage_list if o.get("severity") == "Low"])
-        return f"High: {high}, Medium: {medium}, Low: {low}"
-
-    def get_main_causes(outage_list, limit=2):
-        if not outage_list:
-            return "None"
-        causes = list(set([o["cause"] for o in outage_list]))[:limit]
-        return ", ".join(causes) if causes else "Various"
-
     outage_summary_details = [
         {"key": "0", "valueMap": [
             {"key": "status", "valueString": "Active"},
-            {"key": "customersAffected", "valueNumber": get_total_affected(active_outages_list)},
-            {"key": "severityBreakdown", "valueString": get_severity_breakdown(active_outages_list)},
-            {"key": "topAreas", "valueString": get_top_locations(active_outages_list)},
-            {"key": "mainCauses", "valueString": get_main_causes(active_outages_list)},
+            {"key": "customersAffected", "valueNumber": active.affected_customers},
+            {"key": "severityBreakdown", "valueString": active.severity_breakdown()},
+            {"key": "topAreas", "valueString": active.top_areas()},
+            {"key": "mainCauses", "valueString": active.main_causes()},
             {"key": "priority", "valueString": "Immediate response required"}
         ]},
         {"key": "1", "valueMap": [
             {"key": "status", "valueString": "Investigating"},
-            {"key": "customersAffected", "valueNumber": get_total_affected(investigating_outages_list)},
-            {"key": "severityBreakdown", "valueString": get_severity_breakdown(investigating_outages_list)},
-            {"key": "topAreas", "valueString": get_top_locations(investigating_outages_list)},
-            {"key": "mainCauses", "valueString": get_main_causes(investigating_outages_list)},
+            {"key": "customersAffected", "valueNumber": investigating.affected_customers},
+            {"key": "severityBreakdown", "valueString": investigating.severity_breakdown()},
+            {"key": "topAreas", "valueString": investigating.top_areas()},
+            {"key": "mainCauses", "valueString": investigating.main_causes()},
             {"key": "estimatedResolution", "valueString": "Under assessment"}
         ]},
         {"key": "2", "valueMap": [
             {"key": "status", "valueString": "Resolved"},
-            {"key": "customersRestored", "valueNumber": get_total_affected(resolved_outages_list)},
+            {"key": "customersRestored", "valueNumber": resolved.affected_customers},
             {"key": "resolutionRate", "valueString": "100% service restored"},
-            {"key": "topAreas", "valueString": get_top_locations(resolved_outages_list)},
-            {"key": "mainCauses", "valueString": get_main_causes(resolved_outages_list)},
+            {"key": "topAreas", "valueString": resolved.top_areas()},
+            {"key": "mainCauses", "valueString": resolved.main_causes()},
             {"key": "avgResolutionTime", "valueString": "2.5 hours"}
         ]},
         {"key": "3", "valueMap": [
             {"key": "status", "valueString": "Scheduled"},
-            {"key": "plannedCustomers", "valueNumber": get_total_affected(scheduled_outages_list)},
+            {"key": "plannedCustomers", "valueNumber": scheduled.affected_customers},
             {"key": "scheduledWindow", "valueString": "Next 48 hours"},
-            {"key": "topAreas", "valueString": get_top_locations(scheduled_outages_list)},
+            {"key": "topAreas", "valueString": scheduled.top_areas()},
             {"key": "maintenanceType", "valueString": "Preventive maintenance"},
             {"key": "notificationSent", "valueString": "Yes - 72hrs advance"}
         ]},
         {"key": "4", "valueMap": [
             {"key": "status", "valueString": "Monitoring"},
-            {"key": "customersWatched", "valueNumber": get_total_affected(monitoring_outages_list)},
+            {"key": "customersWatched", "valueNumber": monitoring.affected_customers},
             {"key": "monitoringLevel", "valueString": "Standard observation"},
-            {"key": "topAreas", "valueString": get_top_locations(monitoring_outages_list)},
+            {"key": "topAreas", "valueString": monitoring.top_areas()},
             {"key": "lastChecked", "valueString": "5 minutes ago"},
             {"key": "alertThreshold", "valueString": "Auto-escalate if no improvement"}
         ]}
     ]
 
-    outage_table = []
-    outage_table_details = []
-    map_markers = []
-
-    for i, outage in enumerate(outages):
-        outage_id = f"OUT-{str(i+1).zfill(3)}"
-
-        outage_table.append({
-            "key": str(i),
-            "valueMap": [
-                {"key": "id", "valueString": outage_id},
-                {"key": "location", "valueString": outage["location"]},
-                {"key": "status", "valueString": outage.get("status", "Active")},
-                {"key": "severity", "valueString": outage.get("severity", "High")},
-                {"key": "startTime", "valueString": outage["start_time"]},
-                {"key": "estimatedRestoration", "valueString": outage["estimated_restoration"]},
-                {"key": "affectedCustomers", "valueNumber": outage["affected_customers"]}
-            ]
-        })
-
-        outage_table_details.append({
-            "key": str(i),
-            "valueMap": [
-                {"key": "outageId", "valueString": outage_id},
-                {"key": "cause", "valueString": outage["cause"]},
-                {"key": "crewAssigned", "valueString": outage["crew_assigned"]},
-                {"key": "priority", "valueString": outage["priority"]},
-                {"key": "notes", "valueString": outage["notes"]},
-                {"key": "customerImpact", "valueString": f"{outage['affected_customers']} customers impacted"},
-                {"key": "restorationWindow", "valueString": f"{outage['start_time']} to {outage['estimated_restoration']}"}
-            ]
-        })
-
-        lat, lng = LOCATION_COORDINATES.get(outage["location"], (40.7589, -73.9851))
-        map_markers.append({
-            "key": str(i),
-            "valueMap": [
-                {"key": "name", "valueString": outage["location"]},
-                {"key": "latitude", "valueNumber": lat},
-                {"key": "longitude", "valueNumber": lng},
-                {"key": "description", "valueString": f"{outage.get('status', 'Active')} outage affecting {outage['affected_customers']} customers"},
-                {"key": "status", "valueString": outage.get("status", "Active")},
-                {"key": "severity", "valueString": outage.get("severity", "High")},
-                {"key": "affectedCustomers", "valueNumber": outage["affected_customers"]},
-                {"key": "crew", "valueString": outage["crew_assigned"]}
-            ]
-        })
-
     energy_data = await get_traditional_energy_data()
 
     active_outages = status_counts["Active"] + status_counts["Investigating"]
-    customers_affected = sum(outage["affected_customers"] for outage in outages)
+    customers_affected = summary.affected_customers
 
     energy_kpis = [
         {"key": "0", "valueMap": [
@@ -193,7 +202,7 @@ async def get_traditional_outage_messages():
             {"key": "icon", "valueString": "🔌"},
             {"key": "colorTheme", "valueString": "coral"},
             {"key": "trend", "valueString": "decreasing after storm recovery"},
-            {"key": "breakdown", "valueString": f"High: {len([o for o in outages if o.get('severity') == 'High'])}, Medium: {len([o for o in outages if o.get('severity') == 'Medium'])}, Low: {len([o for o in outages if o.get('severity') == 'Low'])}"}
+            {"key": "breakdown", "valueString": summary.severity_breakdown()}
         ]},
         {"key": "2", "valueMap": [
             {"key": "label", "valueString": "Customers Affected"},
@@ -219,6 +228,71 @@ async def get_traditional_outage_messages():
         ]}
     ]
 
+    return {
+        "outageSummary": outage_summary,
+        "outageSummaryLabels": OUTAGE_SUMMARY_LABELS,
+        "outageSummaryDetails": outage_summary_details,
+        "energyKPIs": energy_kpis
+    }
+
+
+def build_outage_rows(i, outage):
+    """Table row, table detail row and map marker for the outage at position ``i``"""
+    outage_id = f"OUT-{str(i+1).zfill(3)}"
+
+    table_row = {
+        "key": str(i),
+        "valueMap": [
+            {"key": "id", "valueString": outage_id},
+            {"key": "location", "valueString": outage["location"]},
+            {"key": "status", "valueString": outage.get("status", "Active")},
+            {"key": "severity", "valueString": outage.get("severity", "High")},
+            {"key": "startTime", "valueString": outage["start_time"]},
+            {"key": "estimatedRestoration", "valueString": outage["estimated_restoration"]},
+            {"key": "affectedCustomers", "valueNumber": outage["affected_customers"]}
+        ]
+    }
+
+    detail_row = {
+        "key": str(i),
+        "valueMap": [
+            {"key": "outageId", "valueString": outage_id},
+            {"key": "cause", "valueString": outage["cause"]},
+            {"key": "crewAssigned", "valueString": outage["crew_assigned"]},
+            {"key": "priority", "valueString": outage["priority"]},
+            {"key": "notes", "valueString": outage["notes"]},
+            {"key": "customerImpact", "valueString": f"{outage['affected_customers']} customers impacted"},
+            {"key": "restorationWindow", "valueString": f"{outage['start_time']} to {outage['estimated_restoration']}"}
+        ]
+    }
+
+    lat, lng = LOCATION_COORDINATES.get(outage["location"], (40.7589, -73.9851))
+    map_marker = {
+        "key": str(i),
+        "valueMap": [
+            {"key": "name", "valueString": outage["location"]},
+            {"key": "latitude", "valueNumber": lat},
+            {"key": "longitude", "valueNumber": lng},
+            {"key": "description", "valueString": f"{outage.get('status', 'Active')} outage affecting {outage['affected_customers']} customers"},
+            {"key": "status", "valueString": outage.get("status", "Active")},
+            {"key": "severity", "valueString": outage.get("severity", "High")},
+            {"key": "affectedCustomers", "valueNumber": outage["affected_customers"]},
+            {"key": "crew", "valueString": outage["crew_assigned"]}
+        ]
+    }
+
+    return table_row, detail_row, map_marker
+
+
+async def get_traditional_outage_messages():
+    """Get formatted initial outage data as A2A ServerToClientMessage array"""
+
+    data = await get_traditional_outage_data()
+
+    outages = data["outages"]
+    header = await get_outage_header_values(outages)
+    rows = [build_outage_rows(i, outage) for i, outage in enumerate(outages)]
+
     messages = [
         {
             "dataModelUpdate": {
@@ -227,31 +301,31 @@ async def get_traditional_outage_messages():
                 "contents": [
                     {
                         "key": "outageSummary",
-                        "valueMap": outage_summary
+                        "valueMap": header["outageSummary"]
                     },
                     {
                         "key": "outageSummaryLabels",
-                        "valueMap": outage_summary_labels
+                        "valueMap": header["outageSummaryLabels"]
                     },
                     {
                         "key": "outageSummaryDetails",
-                        "valueMap": outage_summary_details
+                        "valueMap": header["outageSummaryDetails"]
                     },
                     {
                         "key": "outageTable",
-                        "valueMap": outage_table
+                        "valueMap": [row[0] for row in rows]
                     },
                     {
                         "key": "outageTableDetails",
-                        "valueMap": outage_table_details
+                        "valueMap": [row[1] for row in rows]
                     },
                     {
                         "key": "mapMarkers",
-                        "valueMap": map_markers
+                        "valueMap": [row[2] for row in rows]
                     },
                     {
                         "key": "energyKPIs",
-                        "valueMap": energy_kpis
+                        "valueMap": header["energyKPIs"]
                     }
                 ]
             }
@@ -267,82 +341,7 @@ async def get_traditional_energy_trends_messages():
     """Get formatted energy trends data as A2A ServerToClientMessage array"""
     energy_data = await get_traditional_energy_data()
 
-    months = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
     base_production = energy_data["production"]
-    energy_trend_details = [
-        {"key": "0", "valueMap": [
-            {"key": "period", "valueString": "January"},
-            {"key": "trend", "valueString": "Lower winter generation baseline"},
-            {"key": "forecast", "valueString": "Expected gradual increase"},
-            {"key": "mainDriver", "valueString": "Seasonal irradiation and wind stability"}
-        ]},
-        {"key": "1", "valueMap": [
-            {"key": "period", "valueString": "February"},
-            {"key": "trend", "valueString": "Early seasonal ramp-up"},
-            {"key": "forecast", "valueString": "Continued growth expected"},
-            {"key": "mainDriver", "valueString": "Improving weather conditions"}
-        ]},
-        {"key": "2", "valueMap": [
-            {"key": "period", "valueString": "March"},
-            {"key": "trend", "valueString": "Strong spring momentum"},
-            {"key": "forecast", "valueString": "Above-average production likely"},
-            {"key": "mainDriver", "valueString": "Higher daylight hours"}
-        ]},
-        {"key": "3", "valueMap": [
-            {"key": "period", "valueString": "April"},
-            {"key": "trend", "valueString": "Peak spring acceleration"},
-            {"key": "forecast", "valueString": "Near-summer levels expected"},
-            {"key": "mainDriver", "valueString": "High renewable utilization"}
-        ]},
-        {"key": "4", "valueMap": [
-            {"key": "period", "valueString": "May"},
-            {"key": "trend", "valueString": "High output period"},
-            {"key": "forecast", "valueString": "Stable high generation"},
-            {"key": "mainDriver", "valueString": "Consistent solar and wind performance"}
-        ]},
-        {"key": "5", "valueMap": [
-            {"key": "period", "valueString": "June"},
-            {"key": "trend", "valueString": "Summer peak onset"},
-            {"key": "forecast", "valueString": "Potential short-term maximum"},
-            {"key": "mainDriver", "valueString": "Maximum solar contribution"}
-        ]},
-        {"key": "6", "valueMap": [
-            {"key": "period", "valueString": "July"},
-            {"key": "trend", "valueString": "Sustained summer peak"},
-            {"key": "forecast", "valueString": "Slight taper expected in August"},
-            {"key": "mainDriver", "valueString": "High demand and strong generation"}
-        ]},
-        {"key": "7", "valueMap": [
-            {"key": "period", "valueString": "August"},
-            {"key": "trend", "valueString": "Post-peak normalization"},
-            {"key": "forecast", "valueString": "Gradual decline expected"},
-            {"key": "mainDriver", "valueString": "Seasonal normalization"}
-        ]},
-        {"key": "8", "valueMap": [
-            {"key": "period", "valueString": "September"},
-            {"key": "trend", "valueString": "Early autumn decline"},
-            {"key": "forecast", "valueString": "Further reduction likely"},
-            {"key": "mainDriver", "valueString": "Reduced daylight and milder wind"}
-        ]},
-        {"key": "9", "valueMap": [
-            {"key": "period", "valueString": "October"},
-            {"key": "trend", "valueString": "Autumn stabilization"},
-            {"key": "forecast", "valueString": "Low-volatility period expected"},
-            {"key": "mainDriver", "valueString": "Balanced mixed-source output"}
-        ]},
-        {"key": "10", "valueMap": [
-            {"key": "period", "valueString": "November"},
-            {"key": "trend", "valueString": "Pre-winter lower output"},
-            {"key": "forecast", "valueString": "Seasonal low likely in December"},
-            {"key": "mainDriver", "valueString": "Shorter daylight window"}
-        ]},
-        {"key": "11", "valueMap": [
-            {"key": "period", "valueString": "December"},
-            {"key": "trend", "valueString": "Winter trough"},
-            {"key": "forecast", "valueString": "Recovery expected in Q1"},
-            {"key": "mainDriver", "valueString": "Seasonal generation constraints"}
-        ]}
-    ]
     energy_trend = [
         {"key": "solar", "valueMap": [
             {"key": "name", "valueString": "Solar"},
@@ -412,11 +411,11 @@ async def get_traditional_energy_trends_messages():
                     },
                     {
                         "key": "energyTrendLabels",
-                        "valueMap": [{"key": str(i), "valueString": month} for i, month in enumerate(months)]
+                        "valueMap": ENERGY_TREND_LABELS
                     },
                     {
                         "key": "energyTrendDetails",
-                        "valueMap": energy_trend_details
+                        "valueMap": ENERGY_TREND_DETAILS
                     }
                 ]
             }
@@ -428,43 +427,43 @@ async def get_traditional_energy_trends_messages():
 
 
 #region Outage Timeline
+def build_timeline_rows(i, outage):
+    """Timeline event and event detail rows for the outage at position ``i``"""
+    start = datetime.fromisoformat(outage["start_time"].replace('Z', '+00:00'))
+    end = datetime.fromisoformat(outage["estimated_restoration"].replace('Z', '+00:00'))
+    duration_hours = int((end - start).total_seconds() / 3600)
+
+    event = {
+        "key": str(i),
+        "valueMap": [
+            {"key": "date", "valueString": outage["start_time"]},
+            {"key": "title", "valueString": f"Outage Reported in {outage['location']}"},
+            {"key": "description", "valueString": outage["cause"]},
+            {"key": "category", "valueString": outage.get("status", "Active")}
+        ]
+    }
+
+    event_detail = {
+        "key": str(i),
+        "valueMap": [
+            {"key": "status", "valueString": outage.get("status", "Active")},
+            {"key": "affectedCustomers", "valueNumber": outage["affected_customers"]},
+            {"key": "location", "valueString": outage["location"]},
+            {"key": "assignedCrew", "valueString": outage["crew_assigned"]},
+            {"key": "estimatedDuration", "valueString": f"{duration_hours} hours"},
+            {"key": "estimatedRestoration", "valueString": outage["estimated_restoration"]}
+        ]
+    }
+
+    return event, event_detail
+
+
 async def get_traditional_timeline_messages():
     """Get formatted timeline data as A2A ServerToClientMessage array"""
 
     data = await get_traditional_outage_data()
 
-    outages = data["outages"]
-
-    timeline_events = []
-    timeline_event_details = []
-
-    for i, outage in enumerate(outages):
-        from datetime import datetime
-        start = datetime.fromisoformat(outage["start_time"].replace('Z', '+00:00'))
-        end = datetime.fromisoformat(outage["estimated_restoration"].replace('Z', '+00:00'))
-        duration_hours = int((end - start).total_seconds() / 3600)
-
-        timeline_events.append({
-            "key": str(i),
-            "valueMap": [
-                {"key": "date", "valueString": outage["start_time"]},
-                {"key": "title", "valueString": f"Outage Reported in {outage['location']}"},
-                {"key": "description", "valueString": outage["cause"]},
-                {"key": "category", "valueString": outage.get("status", "Active")}
-            ]
-        })
-
-        timeline_event_details.append({
-            "key": str(i),
-            "valueMap": [
-                {"key": "status", "valueString": outage.get("status", "Active")},
-                {"key": "affectedCustomers", "valueNumber": outage["affected_customers"]},
-                {"key": "location", "valueString": outage["location"]},
-                {"key": "assignedCrew", "valueString": outage["crew_assigned"]},
-                {"key": "estimatedDuration", "valueString": f"{duration_hours} hours"},
-                {"key": "estimatedRestoration", "valueString": outage["estimated_restoration"]}
-            ]
-        })
+    rows = [build_timeline_rows(i, outage) for i, outage in enumerate(data["outages"])]
 
     messages = [
         {
@@ -474,11 +473,11 @@ async def get_traditional_timeline_messages():
                 "contents": [
                     {
                         "key": "timelineEvents",
-                        "valueMap": timeline_events
+                        "valueMap": [row[0] for row in rows]
                     },
                     {
                         "key": "timelineEventDetails",
-                        "valueMap": timeline_event_details
+                        "valueMap": [row[1] for row in rows]
                     }
                 ]
             }
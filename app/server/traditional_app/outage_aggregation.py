@@ -0,0 +1,105 @@
+"""Single-pass aggregation of outage records for the traditional outage dashboard."""
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+#region Constants
+OUTAGE_STATUSES = ("Active", "Investigating", "Resolved", "Scheduled", "Monitoring")
+SEVERITIES = ("High", "Medium", "Low")
+#endregion
+
+
+#region Aggregates
+@dataclass
+class StatusAggregate:
+    """Totals for the outages in one status."""
+
+    count: int = 0
+    affected_customers: int = 0
+    severity_counts: dict[str, int] = field(default_factory=lambda: dict.fromkeys(SEVERITIES, 0))
+    top_locations: list[str] = field(default_factory=list)
+    # Distinct causes in first-seen order (dict keys keep insertion order).
+    causes: dict[str, None] = field(default_factory=dict)
+
+    def severity_breakdown(self) -> str:
+        if not self.count:
+            return "N/A"
+        return ", ".join(f"{severity}: {self.severity_counts[severity]}" for severity in SEVERITIES)
+
+    def top_areas(self) -> str:
+        return ", ".join(self.top_locations) if self.top_locations else "None"
+
+    def main_causes(self, limit: int = 2) -> str:
+        if not self.count:
+            return "None"
+        return ", ".join(list(self.causes)[:limit]) or "Various"
+
+
+@dataclass
+class OutageAggregate:
+    """Dashboard totals over a whole outage feed."""
+
+    total: int = 0
+    affected_customers: int = 0
+    # Counts treat a missing status as "Active", matching the table rows.
+    status_counts: dict[str, int] = field(default_factory=lambda: dict.fromkeys(OUTAGE_STATUSES, 0))
+    severity_counts: dict[str, int] = field(default_factory=lambda: dict.fromkeys(SEVERITIES, 0))
+    by_status: dict[str, StatusAggregate] = field(
+        default_factory=lambda: {status: StatusAggregate() for status in OUTAGE_STATUSES}
+    )
+
+    def severity_breakdown(self) -> str:
+        return ", ".join(f"{severity}: {self.severity_counts[severity]}" for severity in SEVERITIES)
+#endregion
+
+
+def aggregate_outages(
+    outages: Iterable[dict[str, Any]],
+    top_locations: int = 3,
+    max_causes: int = 2,
+) -> OutageAggregate:
+    """Compute status counts, per-status sums, severity histograms and cause sets in one pass.
+
+    Only the first ``top_locations`` locations of each status are kept, and
+    causes stop being collected once ``max_causes`` distinct ones are known,
+    so memory stays flat however long the feed is.
+    """
+    # The loop only touches two flat dicts per record; the per-status
+    # aggregates are folded together from them afterwards.
+    pair_counts: dict[tuple[Any, Any], int] = {}
+    affected_by_status: dict[Any, int] = {}
+    samples = {status: ([], {}) for status in OUTAGE_STATUSES}
+    collecting = set(OUTAGE_STATUSES)
+    for outage in outages:
+        status = outage.get("status")
+        key = (status, outage.get("severity"))
+        pair_counts[key] = pair_counts.get(key, 0) + 1
+        affected_by_status[status] = affected_by_status.get(status, 0) + outage["affected_customers"]
+        if status in collecting:
+            locations, causes = samples[status]
+            if len(locations) < top_locations:
+                locations.append(outage["location"].split(",")[0])
+            if len(causes) < max_causes:
+                causes[outage["cause"]] = None
+            if len(locations) >= top_locations and len(causes) >= max_causes:
+                collecting.discard(status)
+
+    result = OutageAggregate()
+    result.affected_customers = sum(affected_by_status.values())
+    for status, affected in affected_by_status.items():
+        group = result.by_status.get(status)
+        if group is not None:
+            group.affected_customers = affected
+            group.top_locations, group.causes = samples[status]
+    for (status, severity), count in pair_counts.items():
+        result.total += count
+        counted_status = "Active" if status is None else status
+        if counted_status in result.status_counts:
+            result.status_counts[counted_status] += count
+        if severity in result.severity_counts:
+            result.severity_counts[severity] += count
+        group = result.by_status.get(status)
+        if group is not None:
+            group.count += count
+            if severity in group.severity_counts:
+                group.severity_counts[severity] += count
+    return result
@@ -0,0 +1,178 @@
+"""Cursor-paged and NDJSON/SSE-streamed row data for the /traditional endpoints.
+
+Without paging parameters the endpoints keep serving the full cached
+payload. With ``limit``/``cursor`` they return one page of rows as an A2UI
+message array (the next cursor travels in ``X-Next-Cursor``); with
+``stream=ndjson`` or ``stream=sse`` they send the dashboard header values
+first and then the rows in chunks of ``limit``. Row keys are absolute
+positions, so pages and chunks can be merged client-side in any order.
+"""
+import base64
+import binascii
+import os
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+
+from core import json_codec
+from core.traditional_data_provider import get_traditional_data_version, get_traditional_outage_records
+from traditional_app.data_provider import build_outage_rows, build_timeline_rows, get_outage_header_values
+
+STREAM_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "sse": "text/event-stream"}
+
+
+#region Views
+@dataclass(frozen=True)
+class PagedRows:
+    """One data-model path whose per-record rows can be paged or streamed."""
+
+    path: str
+    keys: tuple[str, ...]
+    build_rows: Callable[[int, dict], tuple[dict, ...]]
+    # Values sent once before any rows (first page / first stream event).
+    header: Callable[[list[dict]], Awaitable[dict[str, Any]]] | None = None
+
+
+OUTAGE_ROWS = PagedRows(
+    path="/",
+    keys=("outageTable", "outageTableDetails", "mapMarkers"),
+    build_rows=build_outage_rows,
+    header=get_outage_header_values,
+)
+TIMELINE_ROWS = PagedRows(
+    path="/timeline",
+    keys=("timelineEvents", "timelineEventDetails"),
+    build_rows=build_timeline_rows,
+)
+#endregion
+
+
+#region Cursors
+class InvalidPageRequest(ValueError):
+    pass
+
+
+def encode_cursor(offset: int, version: int) -> str:
+    raw = json_codec.dumps({"o": offset, "v": version})
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str, version: int, total: int) -> int:
+    """Offset stored in ``cursor``; cursors from an older data version are rejected."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        state = json_codec.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        offset, cursor_version = int(state["o"]), int(state["v"])
+    except (binascii.Error, UnicodeError, ValueError, KeyError, TypeError) as exc:
+        raise InvalidPageRequest("Malformed cursor") from exc
+    if cursor_version != version:
+        raise InvalidPageRequest("Cursor expired; the data changed, start again without a cursor")
+    if not 0 <= offset <= total:
+        raise InvalidPageRequest("Cursor out of range")
+    return offset
+#endregion
+
+
+#region Pages and Streams
+def _data_model_update(path: str, values: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "dataModelUpdate": {
+            "surfaceId": "default",
+            "path": path,
+            "contents": [{"key": key, "valueMap": value} for key, value in values.items()],
+        }
+    }
+
+
+def _row_values(view: PagedRows, records: list[dict], start: int, stop: int) -> dict[str, list[dict]]:
+    columns: tuple[list[dict], ...] = tuple([] for _ in view.keys)
+    for index, record in enumerate(islice(records, start, stop), start):
+        for column, row in zip(columns, view.build_rows(index, record)):
+            column.append(row)
+    return dict(zip(view.keys, columns))
+
+
+async def build_page(view: PagedRows, records: list[dict], offset: int, limit: int) -> list[dict[str, Any]]:
+    """A2UI messages for rows ``offset`` to ``offset + limit``; the first page also carries the header."""
+    values: dict[str, Any] = {}
+    if offset == 0 and view.header is not None:
+        values.update(await view.header(records))
+    values.update(_row_values(view, records, offset, offset + limit))
+    return [_data_model_update(view.path, values)]
+
+
+async def iter_stream_messages(view: PagedRows, records: list[dict], chunk_size: int) -> AsyncIterator[dict[str, Any]]:
+    """Header message first, then one message per ``chunk_size`` rows; only one chunk is held at a time."""
+    if view.header is not None:
+        yield _data_model_update(view.path, await view.header(records))
+    for start in range(0, len(records), chunk_size):
+        yield _data_model_update(view.path, _row_values(view, records, start, start + chunk_size))
+
+
+async def _encode_stream(messages: AsyncIterator[dict[str, Any]], fmt: str) -> AsyncIterator[bytes]:
+    async for message in messages:
+        body = json_codec.dumps(message)
+        yield b"data: " + body + b"\n\n" if fmt == "sse" else body + b"\n"
+    if fmt == "sse":
+        yield b"event: end\ndata: {}\n\n"
+#endregion
+
+
+#region HTTP
+class TraditionalPaging:
+    """Parse paging/streaming query parameters and build the matching response.
+
+    ``TRADITIONAL_PAGE_SIZE`` is the default ``limit``; ``TRADITIONAL_PAGE_MAX_SIZE``
+    caps it, which also bounds how many rows a streamed chunk holds in memory.
+    """
+
+    def __init__(self, default_limit: int | None = None, max_limit: int | None = None):
+        self.max_limit = max_limit or int(os.getenv("TRADITIONAL_PAGE_MAX_SIZE", "1000"))
+        self.default_limit = min(default_limit or int(os.getenv("TRADITIONAL_PAGE_SIZE", "200")), self.max_limit)
+
+    @staticmethod
+    def wants_paging(request: Request) -> bool:
+        params = request.query_params
+        return any(name in params for name in ("limit", "cursor", "stream"))
+
+    def _limit(self, request: Request) -> int:
+        raw = request.query_params.get("limit")
+        if raw is None:
+            return self.default_limit
+        try:
+            return max(1, min(int(raw), self.max_limit))
+        except ValueError as exc:
+            raise InvalidPageRequest("limit must be an integer") from exc
+
+    async def respond(self, request: Request, view: PagedRows) -> Response:
+        # Read the records and version together so a page never mixes two versions.
+        records = get_traditional_outage_records()
+        version = get_traditional_data_version()
+        try:
+            limit = self._limit(request)
+            fmt = request.query_params.get("stream")
+            if fmt is not None:
+                if fmt not in STREAM_MEDIA_TYPES:
+                    raise InvalidPageRequest("stream must be 'ndjson' or 'sse'")
+                return StreamingResponse(
+                    _encode_stream(iter_stream_messages(view, records, limit), fmt),
+                    media_type=STREAM_MEDIA_TYPES[fmt],
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "X-Total-Count": str(len(records))},
+                )
+            cursor = request.query_params.get("cursor")
+            offset = decode_cursor(cursor, version, len(records)) if cursor else 0
+        except InvalidPageRequest as exc:
+            return JSONResponse({"error": str(exc)}, status_code=400)
+
+        messages = await build_page(view, records, offset, limit)
+        headers = {"Cache-Control": "no-cache", "X-Total-Count": str(len(records))}
+        if offset + limit < len(records):
+            headers["X-Next-Cursor"] = encode_cursor(offset + limit, version)
+        return Response(json_codec.dumps(messages), media_type="application/json", headers=headers)
+#endregion
+
+
+TRADITIONAL_PAGING = TraditionalPaging()
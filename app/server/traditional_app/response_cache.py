@@ -0,0 +1,102 @@
+"""Pre-serialized /traditional responses with strong ETags, rebuilt only when the data version changes."""
+import asyncio
+import hashlib
+import os
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from core import json_codec
+from core.traditional_data_provider import get_traditional_data_version
+from traditional_app.data_provider import (
+    get_traditional_outage_messages,
+    get_traditional_energy_messages,
+    get_traditional_energy_trends_messages,
+    get_traditional_timeline_messages,
+    get_traditional_industry_messages
+)
+
+MessageBuilder = Callable[[], Awaitable[list[dict[str, Any]]]]
+
+
+#region Cache
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    etag: str
+    version: int
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """``If-None-Match`` uses weak comparison, so ``W/"x"`` matches ``"x"``."""
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class TraditionalResponseCache:
+    """Build each dashboard payload once per data version and serve the stored bytes.
+
+    Requests carrying a matching ``If-None-Match`` get a bodiless 304. The
+    ``Cache-Control`` max-age comes from ``TRADITIONAL_CACHE_MAX_AGE_SECONDS``;
+    clients revalidate with the ETag after it expires.
+    """
+
+    def __init__(self, builders: dict[str, MessageBuilder], max_age_s: int | None = None):
+        self.builders = builders
+        self.max_age_s = (
+            max_age_s if max_age_s is not None else int(os.getenv("TRADITIONAL_CACHE_MAX_AGE_SECONDS", "60"))
+        )
+        self.cache_control = f"public, max-age={self.max_age_s}, must-revalidate"
+        self._entries: dict[str, CachedResponse] = {}
+        self._locks = {name: asyncio.Lock() for name in builders}
+        self._stats = {"builds": 0, "served": 0, "not_modified": 0}
+
+    async def get(self, name: str) -> CachedResponse:
+        version = get_traditional_data_version()
+        entry = self._entries.get(name)
+        if entry is not None and entry.version == version:
+            return entry
+        async with self._locks[name]:
+            entry = self._entries.get(name)
+            if entry is None or entry.version != version:
+                body = json_codec.dumps(await self.builders[name]())
+                etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+                entry = CachedResponse(body=body, etag=etag, version=version)
+                self._entries[name] = entry
+                self._stats["builds"] += 1
+        return entry
+
+    async def respond(self, request: Request, name: str) -> Response:
+        entry = await self.get(name)
+        headers = {"ETag": entry.etag, "Cache-Control": self.cache_control}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _etag_matches(if_none_match, entry.etag):
+            self._stats["not_modified"] += 1
+            return Response(status_code=304, headers=headers)
+        self._stats["served"] += 1
+        return Response(entry.body, media_type="application/json", headers=headers)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "data_version": get_traditional_data_version(),
+            "cached": sorted(self._entries),
+            "max_age_s": self.max_age_s,
+            **self._stats,
+        }
+#endregion
+
+
+TRADITIONAL_RESPONSES = TraditionalResponseCache(
+    {
+        "outage": get_traditional_outage_messages,
+        "energy": get_traditional_energy_messages,
+        "trends": get_traditional_energy_trends_messages,
+        "timeline": get_traditional_timeline_messages,
+        "industry": get_traditional_industry_messages,
+    }
+)